@@ -0,0 +1,217 @@
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from benchmark.synthetic_scene import SyntheticScene
+from pipeline.detection_backend import FakeBackend
+from pipeline.model_registry import ModelRegistry
+from pipeline.supervisor import Supervisor
+from primitives.parser import InputParser
+
+REPORT_VERSION = 1
+SYNTHETIC_CAR_MODEL = "synthetic/car_detector"
+SYNTHETIC_LIGHT_MODEL = "synthetic/traffic_light_detector"
+
+
+def histogram_quantile(histogram, quantile):
+    """
+    Estimates quantile of durations as upper bound of the first bucket containing it.
+
+    :param histogram: snapshot of LatencyHistogram
+    :param quantile: selected quantile (0 - 1)
+    :return: upper bound of bucket in seconds, None if there is no duration or quantile lies in +Inf bucket
+    """
+
+    if histogram["count"] == 0:
+        return None
+
+    for bound, count in histogram["buckets"].items():
+        if count >= quantile * histogram["count"]:
+            return None if bound == "+Inf" else float(bound)
+
+
+def summarize_block(snapshot):
+    """
+    :param snapshot: telemetry snapshot of one PipeBlock
+    :return: latency of steps in milliseconds, blocked time in seconds and dropped envelopes of PipeBlock
+    """
+
+    steps = snapshot["step_seconds"]
+
+    def milliseconds(seconds):
+        return None if seconds is None else round(seconds * 1000, 3)
+
+    return {"steps": steps["count"],
+            "step_mean_ms": milliseconds(steps["sum"] / steps["count"]) if steps["count"] else None,
+            "step_p50_ms": milliseconds(histogram_quantile(steps, 0.5)),
+            "step_p95_ms": milliseconds(histogram_quantile(steps, 0.95)),
+            "step_buckets": steps["buckets"],
+            "receive_blocked_seconds": round(sum(snapshot["receive_blocked_seconds"].values()), 4),
+            "send_blocked_seconds": round(sum(snapshot["send_blocked_seconds"].values()), 4),
+            "dropped_envelopes": sum(snapshot["dropped_envelopes"].values())}
+
+
+class PipelineBenchmark:
+    """
+    End-to-end benchmark of the whole graph of PipeBlocks. For every combination of resolution and car density
+    synthetic intersection video is generated and examined in headless mode with exact calibration and fake car
+    detector, so results do not depend on trained models or on user interaction.
+
+    Every run is computed in own forked process, so peak memory of runs is not affected by previous runs.
+    """
+
+    def __init__(self, work_dir, frames=500, fps=25, lanes=3, seed=0):
+        """
+        :param work_dir: directory for generated videos, calibrations and violations
+        :param frames: number of frames of each video
+        :param fps: frames per second of generated videos
+        :param lanes: number of lanes of synthetic scene
+        :param seed: seed of scene generator, the same seed produces the same videos
+        """
+
+        self._work_dir = work_dir
+        self._frames = frames
+        self._fps = fps
+        self._lanes = lanes
+        self._seed = seed
+
+    def run(self, resolutions, densities):
+        """
+        :param resolutions: list of (width, height) of generated videos
+        :param densities: list of mean numbers of new cars per second
+        :return: report of all runs, see report()
+        """
+
+        runs = [self._run_isolated(width, height, density) for width, height in resolutions for density in densities]
+
+        return self.report(runs)
+
+    def report(self, runs):
+        """
+        :param runs: results of runs
+        :return: machine readable report with environment, parameters and results of runs
+        """
+
+        return {"version": REPORT_VERSION,
+                "environment": {"python": platform.python_version(),
+                                "numpy": np.__version__,
+                                "opencv": cv2.__version__,
+                                "platform": platform.platform(),
+                                "cpus": os.cpu_count()},
+                "parameters": {"frames": self._frames,
+                               "fps": self._fps,
+                               "lanes": self._lanes,
+                               "seed": self._seed},
+                "runs": runs}
+
+    def run_once(self, width, height, density):
+        """
+        Generates synthetic video and examines it in current process.
+
+        :param width: width of video
+        :param height: height of video
+        :param density: mean number of new cars per second
+        :return: result of run: FPS, latency of stages and memory
+        """
+
+        name = f"synthetic_{width}x{height}_{density}"
+        video_path = os.path.join(self._work_dir, f"{name}.avi")
+        calibration_path = os.path.join(self._work_dir, f"{name}.json")
+
+        scene = SyntheticScene(width=width, height=height, density=density, fps=self._fps, lanes=self._lanes,
+                               seed=self._seed)
+
+        video_sha1 = scene.write(video_path, self._frames)
+
+        with open(calibration_path, "w") as file:
+            json.dump(scene.calibration(), file)
+
+        program_arguments = InputParser([f"--input={video_path}",
+                                         f"--output={os.path.join(self._work_dir, 'violations')}",
+                                         f"--calibration={calibration_path}",
+                                         "--headless"])
+
+        backends = []
+
+        def create_backend(path):
+            backend = FakeBackend(path, detect=SyntheticScene.detect)
+            backends.append(backend)
+            return backend
+
+        baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            supervisor = Supervisor(program_arguments=program_arguments,
+                                    car_model=SYNTHETIC_CAR_MODEL,
+                                    light_model=SYNTHETIC_LIGHT_MODEL,
+                                    model_registry=ModelRegistry(backend=create_backend))
+
+            start = time.perf_counter()
+            supervisor.run()
+            seconds = time.perf_counter() - start
+
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        stages = {snapshot["block"]: summarize_block(snapshot) for snapshot in supervisor.telemetry.collect()}
+
+        # frame loader may skip frames of video with higher fps than FRAME_LOADER_MAX_FPS
+        processed_frames = stages["FrameLoader"]["steps"]
+
+        return {"width": width,
+                "height": height,
+                "density": density,
+                "video_sha1": video_sha1,
+                "cars": scene.cars,
+                "frames": self._frames,
+                "processed_frames": processed_frames,
+                "seconds": round(seconds, 4),
+                "fps": round(processed_frames / seconds, 2),
+                "realtime_factor": round(self._frames / self._fps / seconds, 2),
+                "detector_inferences": sum(backend.runs for backend in backends),
+                "stages": stages,
+                "memory": {"baseline_rss_mb": round(baseline_rss / 1024, 1),
+                           "peak_rss_mb": round(peak_rss / 1024, 1)}}
+
+    def _run_isolated(self, width, height, density):
+        """
+        Computes run_once() in forked process.
+
+        :param width: width of video
+        :param height: height of video
+        :param density: mean number of new cars per second
+        :return: result of run, error and exit code of process if run failed
+        """
+
+        context = multiprocessing.get_context("fork")
+        receiver, sender = context.Pipe(duplex=False)
+
+        def target():
+            try:
+                sender.send(self.run_once(width, height, density))
+            except Exception as error:
+                sender.send({"error": repr(error)})
+
+        process = context.Process(target=target)
+        process.start()
+        sender.close()
+
+        try:
+            result = receiver.recv()
+        except EOFError:
+            result = {"error": "process ended without result"}
+
+        process.join()
+
+        if "error" in result:
+            result.update({"width": width, "height": height, "density": density, "exitcode": process.exitcode})
+            print(f"ERROR: benchmark {width}x{height} density {density} failed: {result['error']}", file=sys.stderr)
+
+        return result
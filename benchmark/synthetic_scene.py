@@ -0,0 +1,341 @@
+import hashlib
+
+import cv2
+import numpy as np
+
+from primitives import constants
+from primitives.enums import Color
+from primitives.line import Line
+
+LIGHT_CYCLE = [(Color.GREEN, 8), (Color.ORANGE, 2), (Color.RED, 8), (Color.RED_ORANGE, 1)]  # state, seconds
+LIGHT_BULB_COLORS = {Color.RED: constants.COLOR_RED,
+                     Color.ORANGE: constants.COLOR_ORANGE,
+                     Color.GREEN: constants.COLOR_GREEN}
+
+ROAD_COLOR = 90                 # gray level of road
+ROAD_NOISE = 12                 # amplitude of static gray texture of road
+CAR_SPEED = 12                  # meters per second
+CAR_LENGTH = 6                  # meters including gap to car in front
+CAR_VIOLATORS = 0.1             # fraction of cars ignoring red light
+CAMERA_DISTANCE = 20            # meters from bottom of frame to half way to vanishing point
+CAR_SATURATION = 120            # minimal HSV saturation of car pixels, road and markings are gray
+CAR_MINIMAL_AREA = 0.0005       # minimal relative area of detected car
+CAR_MINIMAL_FILL = 0.85         # minimal fraction of bounding box filled by car, bulbs of light are round
+CAR_CLASS_ID = 3                # COCO class of car
+CAR_SCORE = 0.9                 # score of every detected car
+
+
+class SyntheticCar:
+    """
+    Rectangle driving in one lane towards the vanishing point.
+    """
+
+    def __init__(self, car_id, lane, color, violator):
+        """
+        :param car_id: unique id of car
+        :param lane: index of lane
+        :param color: BGR color of car
+        :param violator: if car ignores red light
+        """
+
+        self.id = car_id
+        self.lane = lane
+        self.color = color
+        self.violator = violator
+        self.distance = 0
+
+
+class SyntheticScene:
+    """
+    Deterministic synthetic intersection: straight lanes heading to vanishing point above the frame, stop line
+    across all lanes and traffic light in the top left corner switching green, orange, red and red-orange.
+
+    Cars are spawned at the bottom of the frame by seeded random generator and they drive away from camera.
+    Cars stop in front of stop line when the light is not green, except of violators. Calibration of the scene
+    is known exactly, so pipeline can start directly in detection mode.
+
+    Cars are the only saturated rectangles in the scene, so detect() can find them on any crop of frame.
+    """
+
+    def __init__(self, width, height, density, fps=25, lanes=3, seed=0):
+        """
+        :param width: width of frames
+        :param height: height of frames
+        :param density: mean number of new cars per second
+        :param fps: frames per second
+        :param lanes: number of lanes
+        :param seed: seed of random generator, the same seed produces the same video
+        """
+
+        self._width = width
+        self._height = height
+        self._density = density
+        self._fps = fps
+        self._lanes = lanes
+        self._random = np.random.RandomState(seed)
+
+        self._vanishing_point = (width // 2, -height // 2)
+        self._lane_points = [int(width * (0.2 + 0.6 * i / lanes)) for i in range(lanes + 1)]
+        self._stop_line_y = int(height * 0.55)
+
+        self._light_top_left = (int(width * 0.04), int(height * 0.05))
+        self._light_bottom_right = (int(width * 0.04) + max(12, width // 25), int(height * 0.05) + max(36, height // 4))
+
+        self._background = self._draw_background()
+
+        self._cars = []
+        self._cars_count = 0
+        self._seq = 0
+
+    @property
+    def size(self):
+        """
+        :return: width, height of frames
+        """
+
+        return self._width, self._height
+
+    @property
+    def fps(self):
+        """
+        :return: frames per second
+        """
+
+        return self._fps
+
+    @property
+    def cars(self):
+        """
+        :return: number of cars spawned so far
+        """
+
+        return self._cars_count
+
+    @property
+    def light_state(self):
+        """
+        :return: state of traffic light on current frame
+        """
+
+        position = (self._seq / self._fps) % sum(seconds for _, seconds in LIGHT_CYCLE)
+
+        for state, seconds in LIGHT_CYCLE:
+            if position < seconds:
+                return state
+
+            position -= seconds
+
+    def calibration(self):
+        """
+        :return: exact calibration of scene in format of Info.get_calibration()
+        """
+
+        stop_line = Line(point1=(0, self._stop_line_y), point2=(self._width - 1, self._stop_line_y))
+
+        corridors = []
+        for left, right in zip(self._lane_points[:-1], self._lane_points[1:]):
+            corridors.append({"left_line": Line(point1=(left, self._height - 1),
+                                                point2=self._vanishing_point).serialize(),
+                              "right_line": Line(point1=(right, self._height - 1),
+                                                 point2=self._vanishing_point).serialize()})
+
+        return {"vanishing points": [{"point": list(self._vanishing_point), "direction": None}],
+                "traffic light": {"top left": list(self._light_top_left),
+                                  "bottom right": list(self._light_bottom_right)},
+                "corridors": corridors,
+                "stopline": stop_line.serialize()}
+
+    def frames(self, count):
+        """
+        :param count: number of generated frames
+        :return: generator of frames
+        """
+
+        for _ in range(count):
+            yield self.next_frame()
+
+    def next_frame(self):
+        """
+        Moves all cars by one frame and draws the scene.
+
+        :return: new frame
+        """
+
+        self._spawn()
+        self._move()
+
+        image = self._background.copy()
+
+        for car in sorted(self._cars, key=lambda c: -c.distance):
+            x_min, y_min, x_max, y_max = self._box(car)
+            cv2.rectangle(image, (x_min, y_min), (x_max, y_max), car.color, constants.FILL)
+
+        self._draw_light(image)
+        self._seq += 1
+
+        return image
+
+    def write(self, path, count):
+        """
+        Writes scene into video file readable by VideoInfo.
+
+        :param path: path of video file (.avi)
+        :param count: number of frames
+        :return: SHA-1 of raw generated frames, identifies the scene regardless of video encoder
+        """
+
+        digest = hashlib.sha1()
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc('M', 'J', 'P', 'G'), self._fps, self.size)
+
+        for frame in self.frames(count):
+            digest.update(frame.tobytes())
+            writer.write(frame)
+
+        writer.release()
+
+        return digest.hexdigest()
+
+    @staticmethod
+    def detect(image):
+        """
+        Fake car detector finding saturated rectangles, it can be used as detect function of FakeBackend.
+
+        :param image: BGR image or any crop of frame
+        :return: list of relative boxes (y_min, x_min, y_max, x_max), scores and classes of found cars
+        """
+
+        height, width = image.shape[:2]
+
+        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+        mask = cv2.inRange(hsv, (0, CAR_SATURATION, 40), (180, 255, 255))
+
+        count, _, stats, _ = cv2.connectedComponentsWithStats(mask)
+
+        detections = []
+        for x, y, w, h, area in stats[1:count]:
+            if area < CAR_MINIMAL_AREA * width * height or area < CAR_MINIMAL_FILL * w * h:
+                continue
+
+            box = y / height, x / width, (y + h) / height, (x + w) / width
+            detections.append((box, CAR_SCORE, CAR_CLASS_ID))
+
+        return detections
+
+    def _draw_background(self):
+        """
+        :return: gray road with static texture, lane markings and stop line
+        """
+
+        noise = self._random.randint(-ROAD_NOISE, ROAD_NOISE + 1, size=(self._height, self._width, 1))
+        image = np.repeat(np.clip(ROAD_COLOR + noise, 0, 255).astype(np.uint8), 3, axis=2)
+
+        for x in self._lane_points:
+            cv2.line(image, (x, self._height - 1), self._vanishing_point, constants.COLOR_WHITE, 2)
+
+        cv2.line(image, (0, self._stop_line_y), (self._width - 1, self._stop_line_y), constants.COLOR_WHITE, 3)
+
+        return image
+
+    def _draw_light(self, image):
+        """
+        :param image: frame to draw traffic light on
+        """
+
+        state = self.light_state
+
+        cv2.rectangle(image, self._light_top_left, self._light_bottom_right, constants.COLOR_BLACK, constants.FILL)
+
+        (x_min, y_min), (x_max, y_max) = self._light_top_left, self._light_bottom_right
+        radius = max(2, min(x_max - x_min, (y_max - y_min) // 3) // 2 - 2)
+        center_x = (x_min + x_max) // 2
+
+        lit = {Color.RED: [Color.RED],
+               Color.ORANGE: [Color.ORANGE],
+               Color.RED_ORANGE: [Color.RED, Color.ORANGE],
+               Color.GREEN: [Color.GREEN]}[state]
+
+        for index, bulb in enumerate([Color.RED, Color.ORANGE, Color.GREEN]):
+            center_y = y_min + (2 * index + 1) * (y_max - y_min) // 6
+            color = LIGHT_BULB_COLORS[bulb] if bulb in lit else constants.COLOR_GRAY
+
+            cv2.circle(image, (center_x, center_y), radius, color, constants.FILL)
+
+    def _spawn(self):
+        """
+        Spawns new cars at the bottom of the frame, cars are not spawned into lane with car at the bottom.
+        """
+
+        for _ in range(self._random.poisson(self._density / self._fps)):
+            lane = self._random.randint(self._lanes)
+            hue = self._random.randint(180)
+            violator = self._random.rand() < CAR_VIOLATORS
+
+            if any(car.lane == lane and car.distance < CAR_LENGTH for car in self._cars):
+                continue
+
+            color = cv2.cvtColor(np.uint8([[[hue, 230, 230]]]), cv2.COLOR_HSV2BGR)[0, 0]
+
+            self._cars_count += 1
+            self._cars.append(SyntheticCar(car_id=self._cars_count,
+                                           lane=lane,
+                                           color=tuple(int(channel) for channel in color),
+                                           violator=violator))
+
+    def _move(self):
+        """
+        Moves cars forward, keeps distance to car in front and stops cars in front of stop line when light
+        is not green. Cars which left the frame are removed.
+        """
+
+        stop = self.light_state != Color.GREEN
+        stop_distance = self._distance(self._stop_line_y)
+        step = CAR_SPEED / self._fps
+
+        for lane in range(self._lanes):
+            ahead = None
+
+            for car in sorted((car for car in self._cars if car.lane == lane), key=lambda c: -c.distance):
+                limit = car.distance + step
+
+                if ahead is not None:
+                    limit = min(limit, ahead.distance - CAR_LENGTH)
+
+                if stop and not car.violator and car.distance <= stop_distance:
+                    limit = min(limit, stop_distance)
+
+                car.distance = max(car.distance, limit)
+                ahead = car
+
+        self._cars = [car for car in self._cars if self._box(car)[3] > 0]
+
+    def _distance(self, y):
+        """
+        :param y: row of frame
+        :return: distance in meters of bottom of car standing on selected row
+        """
+
+        s = (self._height - 1 - y) / (self._height - 1 - self._vanishing_point[1])
+
+        return CAMERA_DISTANCE * s / (1 - s)
+
+    def _box(self, car):
+        """
+        Projects car into frame. Bottom of car lies on the middle of its lane, size decreases with distance.
+
+        :param car: selected car
+        :return: x_min, y_min, x_max, y_max of car in frame
+        """
+
+        s = car.distance / (car.distance + CAMERA_DISTANCE)
+        scale = 1 - s
+
+        left, right = self._lane_points[car.lane], self._lane_points[car.lane + 1]
+        vp_x, vp_y = self._vanishing_point
+
+        x = (left + right) / 2 + ((vp_x - (left + right) / 2) * s)
+        y = self._height - 1 + (vp_y - self._height + 1) * s
+
+        width = (right - left) * 0.6 * scale
+        height = width * 0.8
+
+        return int(x - width / 2), int(y - height), int(x + width / 2), int(y)
@@ -0,0 +1,51 @@
+import json
+import tempfile
+import unittest
+
+from benchmark.pipeline_benchmark import PipelineBenchmark, histogram_quantile
+
+
+class HistogramQuantileTests(unittest.TestCase):
+    def test_quantile(self):
+        histogram = {"buckets": {"0.01": 5, "0.1": 9, "+Inf": 10}, "sum": 1, "count": 10}
+
+        self.assertEqual(histogram_quantile(histogram, 0.5), 0.01)
+        self.assertEqual(histogram_quantile(histogram, 0.9), 0.1)
+        self.assertIsNone(histogram_quantile(histogram, 0.95))
+
+        self.assertIsNone(histogram_quantile({"buckets": {"+Inf": 0}, "sum": 0, "count": 0}, 0.5))
+
+
+class PipelineBenchmarkTests(unittest.TestCase):
+    def test_run(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            benchmark = PipelineBenchmark(work_dir=work_dir, frames=60, fps=10, seed=3)
+            report = benchmark.run(resolutions=[(320, 180)], densities=[2])
+
+        json.dumps(report)
+
+        self.assertEqual(report["parameters"]["frames"], 60)
+        self.assertEqual(len(report["runs"]), 1)
+
+        run = report["runs"][0]
+
+        self.assertNotIn("error", run)
+        self.assertEqual(run["processed_frames"], 60)
+        self.assertGreater(run["fps"], 0)
+        self.assertGreater(run["detector_inferences"], 0)
+        self.assertGreater(run["memory"]["peak_rss_mb"], 0)
+
+        for stage in ["FrameLoader", "Detector", "Tracker", "Observer", "TrafficLightsObserver", "ViolationWriter"]:
+            self.assertIn(stage, run["stages"])
+
+        self.assertEqual(run["stages"]["Tracker"]["steps"], 60)
+
+    def test_deterministic_video(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            benchmark = PipelineBenchmark(work_dir=work_dir, frames=20, fps=10, seed=3)
+
+            first = benchmark.run_once(160, 90, 1)
+            second = benchmark.run_once(160, 90, 1)
+
+        self.assertEqual(first["video_sha1"], second["video_sha1"])
+        self.assertEqual(first["cars"], second["cars"])
@@ -0,0 +1,67 @@
+import unittest
+
+import numpy as np
+
+from benchmark.synthetic_scene import SyntheticScene, LIGHT_CYCLE
+from primitives.coordinates import Coordinates
+from primitives.enums import Color
+from repositories.models.traffic_light import TrafficLight
+
+
+class SyntheticSceneTests(unittest.TestCase):
+    def setUp(self):
+        self.scene = SyntheticScene(width=320, height=180, density=2, fps=10, seed=1)
+
+    def test_deterministic(self):
+        other = SyntheticScene(width=320, height=180, density=2, fps=10, seed=1)
+
+        for frame, other_frame in zip(self.scene.frames(50), other.frames(50)):
+            self.assertTrue(np.array_equal(frame, other_frame))
+
+        self.assertEqual(self.scene.cars, other.cars)
+        self.assertGreater(self.scene.cars, 0)
+
+    def test_traffic_light(self):
+        calibration = self.scene.calibration()
+        light = TrafficLight(top_left=Coordinates(*calibration["traffic light"]["top left"]),
+                             bottom_right=Coordinates(*calibration["traffic light"]["bottom right"]))
+
+        expected = {Color.RED: (1, 0, 0), Color.ORANGE: (0, 1, 0), Color.GREEN: (0, 0, 1)}
+        seen = set()
+
+        for _ in range(sum(seconds for _, seconds in LIGHT_CYCLE) * self.scene.fps):
+            state = self.scene.light_state
+            frame = self.scene.next_frame()
+
+            if state in expected:
+                _, red, orange, green = light.state_counts(frame, frame)
+                self.assertEqual((round(red), round(orange), round(green)), expected[state])
+                seen.add(state)
+
+        self.assertEqual(seen, set(expected))
+
+    def test_detect(self):
+        for frame in self.scene.frames(30):
+            pass
+
+        # drawn rectangles include their bottom right corner and they are clipped by frame
+        cars = [(x_min, max(y_min, 0), x_max + 1, y_max + 1)
+                for x_min, y_min, x_max, y_max in (self.scene._box(car) for car in self.scene._cars)]
+        detections = SyntheticScene.detect(frame)
+
+        self.assertEqual(len(detections), len(cars))
+
+        height, width = frame.shape[:2]
+        for (y_min, x_min, y_max, x_max), score, class_id in detections:
+            box = x_min * width, y_min * height, x_max * width, y_max * height
+
+            self.assertTrue(any(np.allclose(box, car, atol=1) for car in cars))
+
+    def test_detect_crop(self):
+        for frame in self.scene.frames(30):
+            pass
+
+        crop = frame[90:, 60:260]
+
+        for (y_min, x_min, y_max, x_max), _, _ in SyntheticScene.detect(crop):
+            self.assertTrue(0 <= y_min < y_max <= 1 and 0 <= x_min < x_max <= 1)
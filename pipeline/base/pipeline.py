@@ -1,9 +1,12 @@
 import time
+import multiprocessing
 import numpy as np
 
 from queue import Queue, Full, Empty
 from threading import Thread
+from primitives import constants
 from primitives.enums import Mode
+from pipeline.telemetry import BlockTelemetry
 
 DEFAULT_NUMBER_INPUTS = 1
 DEFAULT_QUEUE_SIZE = 20
@@ -24,8 +27,9 @@ class PipeBlock:
     PipeBlock is meant to run in "infinite loop" while he takes on each step some of the objects in any of input queue.
     And puts computed output to any number of output queues. Used queues are capable of multithreading (thread-safe).
     Provides mechanism for communication between PipeBlock instances.
+    Connections are held by instances only, so more independent graphs of PipeBlocks (streams) can run at once.
+    Every PipeBlock measures its steps, blocking and queues, see telemetry property.
     """
-    pipes = []
 
     def __init__(self, info, pipe_id, output=None, queue_size=DEFAULT_QUEUE_SIZE, print_fps=False, work_modes=None):
         """
@@ -53,14 +57,13 @@ class PipeBlock:
         work_modes.append(Mode.SIGNAL)
 
         self._work_modes = work_modes
+        self._telemetry = BlockTelemetry(name=self.__class__.__name__, pipe_id=pipe_id, inputs=self._input)
 
         if output is not None:
             for pipe in output:
                 pipe.connect(self, queue_size)
                 self._output[pipe.id] = pipe
 
-        PipeBlock.pipes.append(self)
-
     @property
     def mode(self):
         """
@@ -69,6 +72,22 @@ class PipeBlock:
 
         return self._mode
 
+    @property
+    def telemetry(self):
+        """
+        :return: measurements of this PipeBlock
+        """
+
+        return self._telemetry
+
+    @property
+    def in_process(self):
+        """
+        :return: if computation of this PipeBlock runs in own process
+        """
+
+        return False
+
     def start(self):
         """
         Starts computing
@@ -95,11 +114,14 @@ class PipeBlock:
                     frame_counter += 1
                     if frame_counter > 100:
                         print(f"{self.__class__.__name__} FPS: ", 1000 / (((time.time() - clock) / frame_counter) * 1000))
-                        print(f"Video input progress: {round((self.seq / self._info.frame_count) * 100, 2)}%")
+                        if self._info.frame_count:
+                            print(f"Video input progress: {round((self.seq / self._info.frame_count) * 100, 2)}%")
                         frame_counter = 0
                         clock = time.time()
 
+                step_start = time.perf_counter()
                 self._step(self.seq)
+                self._telemetry.step(time.perf_counter() - step_start)
 
         except EOFError:
             self._after()
@@ -124,7 +146,7 @@ class PipeBlock:
         Called after computation. Used for cleaning.
         """
 
-        PipeBlock.pipes.remove(self)
+        pass
 
     def _mode_changed(self, new_mode):
         """
@@ -145,6 +167,7 @@ class PipeBlock:
         :param message: any type of message
         :param pipe_id: id of desired receiver
         :param block: if the thread should be blocked until message is delivered
+        :return: if the message was put into input queue of receiver
         """
 
         mode = self._mode
@@ -152,42 +175,57 @@ class PipeBlock:
         envelope = mode, message
 
         try:
-            self._output[pipe_id].deliver(envelope, pipe_id=self.id, block=block)
+            receiver = self._output[pipe_id]
         except KeyError:
-            pass
+            return False
+
+        start = time.perf_counter()
+        delivered = receiver.deliver(envelope, pipe_id=self.id, block=block)
+        self._telemetry.sent(pipe_id, time.perf_counter() - start)
+
+        return delivered
 
     def deliver(self, envelope, pipe_id: int, block):
         """
         Takes envelope and separates message from mode. If this PipeBlock does not support that mode it throws that
         envelope away, otherwise it puts it in input queue corresponding to sender.
+        Envelopes thrown away because of full input queue are counted in telemetry.
 
         :param envelope: received envelope
         :param pipe_id: sender id
         :param block: if thread should be blocked until envelope is being put into input queue.
-        :return:
+        :return: if the envelope was put into input queue
         """
         try:
             mode, _ = envelope
 
             if mode in self._work_modes:
                 self._input[pipe_id].put(envelope, block=block)
+                return True
 
         except Full:
-            return
+            self._telemetry.dropped(pipe_id)
+
+        return False
 
-    def receive(self, pipe_id, block=True):
+    def receive(self, pipe_id, block=True, timeout=None):
         """
         Takes next envelope in selected input queue and updates work mode corresponding to mode inside envelope.
         If EOFError class is obrained in message, the computation is broken by
 
         :param pipe_id: selects input by sender id
         :param block: if thread should be blocked until envelope is being get from input queue.
-        :return: received message
+        :param timeout: maximal number of seconds to be blocked, None means no limit
+        :return: received message, None if no message was obtained
         :raise EOFError: signalization used for closing the computation
         """
 
+        start = time.perf_counter()
+
         try:
-            mode, message = self._input[pipe_id].get(block)
+            mode, message = self._input[pipe_id].get(block, timeout)
+            self._telemetry.received(pipe_id, time.perf_counter() - start)
+
             if message is EOFError:
                 raise EOFError
 
@@ -195,6 +233,7 @@ class PipeBlock:
             return message
 
         except Empty:
+            self._telemetry.received(pipe_id, time.perf_counter() - start)
             return None
 
     def _update_mode(self, mode):
@@ -213,13 +252,17 @@ class PipeBlock:
 
     def connect(self, sender, queue_size):
         """
-        Connects this input queue to sender PipeBlock instance
+        Connects this input queue to sender PipeBlock instance.
+        If sender or this PipeBlock runs in own process, queue capable of multiprocessing is used.
 
         :param sender:
         :param queue_size:
         """
 
-        self._input[sender.id] = Queue(queue_size)
+        if self.in_process or sender.in_process:
+            self._input[sender.id] = multiprocessing.get_context("fork").Queue(queue_size)
+        else:
+            self._input[sender.id] = Queue(queue_size)
 
     def __str__(self):
         return f"{self.__class__.__name__}: {[queue.qsize() for key, queue in self._input.items()]}"
@@ -228,6 +271,8 @@ class PipeBlock:
 class ThreadedPipeBlock(PipeBlock):
     """
     Multithreaded version of PipeBlock, computation is being run in own thread.
+    If id of the PipeBlock is listed in PIPELINE_PROCESS_BLOCKS constant, computation is run in own process instead.
+    PipeBlocks listed in PIPELINE_THREAD_BLOCKS update shared InputInfo, so they are always computed in own thread.
     """
 
     def _mode_changed(self, new_mode):
@@ -242,20 +287,36 @@ class ThreadedPipeBlock(PipeBlock):
         :param max_steps: maximum number of computation steps (unused)
         :param work_modes: specifies work modes of this PipeBlock
         :param deamon: sets if thread should be run as daemon
+        :raise ValueError: if PipeBlock updating shared InputInfo should be computed in own process
         """
 
         super().__init__(info=info, pipe_id=pipe_id, output=output, work_modes=work_modes)
 
-        self._thread = Thread(target=self._run)
-        self._thread.daemon = deamon
+        if self.in_process and self.id in constants.PIPELINE_THREAD_BLOCKS:
+            raise ValueError(f"{self.__class__.__name__} updates shared InputInfo, it can not be computed in own process")
+
+        if self.in_process:
+            self._worker = multiprocessing.get_context("fork").Process(target=self._run)
+        else:
+            self._worker = Thread(target=self._run)
+
+        self._worker.daemon = deamon
         self._max_steps = max_steps
 
+    @property
+    def in_process(self):
+        """
+        :return: if computation of this PipeBlock runs in own process
+        """
+
+        return self.id in constants.PIPELINE_PROCESS_BLOCKS
+
     def start(self):
         """
-        Starts thread execution of run() method
+        Starts thread (or process) execution of run() method
         """
 
-        self._thread.start()
+        self._worker.start()
 
     def _before(self):
         pass
@@ -268,7 +329,32 @@ class ThreadedPipeBlock(PipeBlock):
 
     def join(self):
         """
-        Delegates join() call to thread used by this class.
+        Delegates join() call to thread (or process) used by this class.
+        """
+
+        self._worker.join()
+
+
+class ProcessPipeBlock(ThreadedPipeBlock):
+    """
+    Multiprocess version of PipeBlock, computation is being run in own forked process, so it does not share GIL with
+    the other PipeBlocks. Uses the same envelope API, envelopes are transferred by queues capable of multiprocessing.
+    Frames from FrameLoader are transferred thru shared memory.
+
+    Process is forked in start(), so InputInfo is a copy from that moment. Changes of InputInfo done by this
+    PipeBlock are not visible to others and vice versa. Only PipeBlocks using InputInfo as read-only source
+    can be computed in own process. PipeBlocks listed in PIPELINE_THREAD_BLOCKS (FrameLoader, Tracker, Calibrator,
+    Observer and TrafficLightsObserver) update InputInfo, e.g. Tracker and TrafficLightsObserver report scene
+    activity to DetectionScheduler read by FrameLoader, so they are rejected.
+
+    Car Detector is the only CPU heavy PipeBlock which can be computed in own process. Calibration found after fork
+    (update area and corridors used for region of interest) is sent to it by FrameLoader when detection starts.
+    """
+
+    @property
+    def in_process(self):
+        """
+        :return: always True
         """
 
-        self._thread.join()
+        return True
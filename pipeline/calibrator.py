@@ -1,9 +1,13 @@
 import cv2
 import numpy as np
+from queue import Empty
+from threading import Lock
+
 from primitives import constants
 
 from primitives.coordinates import Coordinates
 from repositories.models.tracked_object import TrackedObject
+from repositories.tracked_object_repository import draw_circles
 from primitives.enums import Color, Mode
 from primitives.line import Line, SamePointError, ransac
 from primitives.pc_space import ParallelCoordinateSpace
@@ -18,7 +22,10 @@ class SyncError(Exception):
 class Calibrator(ThreadedPipeBlock):
     """
     Makes calibration of current scene - searches for dominant Vanishing points. Third one is being computed from the
-    previous ones. Works only in calibration work mode, after then is this Block closed
+    previous ones. Works only in calibration work mode, after then is this Block closed.
+
+    Closed Calibrator does not accept any envelope, so senders release frames which were not delivered and frames
+    left in input queue are released on exit. All senders deliver to Calibrator without blocking.
     """
 
     def __init__(self, output=None, info=None):
@@ -32,40 +39,87 @@ class Calibrator(ThreadedPipeBlock):
         self._pc_lines = ParallelCoordinateSpace(info.width)
         self._detected_lines = []
 
-    def _mode_changed(self, new_mode):
+        self._boxes_mask = np.zeros(shape=(info.height, info.width), dtype=np.uint8)
+        self._boxes_mask_no_border = np.zeros(shape=(info.height, info.width), dtype=np.uint8)
+
+        self._closed = False
+        self._closing_lock = Lock()
+
+    def deliver(self, envelope, pipe_id: int, block):
         """
-        If new mode is detection this thread is closed
+        Envelopes are thrown away after Calibrator is closed.
 
-        :raise EOFError to stop computing
-        :param new_mode: new mode
+        :param envelope: received envelope
+        :param pipe_id: sender id
+        :param block: if thread should be blocked until envelope is being put into input queue
+        :return: if the envelope was put into input queue
+        """
+
+        with self._closing_lock:
+            if self._closed:
+                return False
+
+            return super().deliver(envelope, pipe_id=pipe_id, block=block)
+
+    def _after(self):
+        """
+        Closes Calibrator and releases frames which were delivered but not received.
         """
-        super()._mode_changed(new_mode)
 
-        if new_mode == Mode.DETECTION:
-            raise EOFError
+        with self._closing_lock:
+            self._closed = True
+
+        frames = self._input.get(constants.FRAME_LOADER_ID)
+
+        while frames is not None:
+            try:
+                _, message = frames.get_nowait()
+            except Empty:
+                break
+
+            if message is not EOFError:
+                message[1].release()
 
     def _step(self, seq):
         """
         On each step it tries to compute new vanishing point if it has enough information to do so.
         Detects first two dominant vanishing points in scene. Third is not beeing used in this project but can be
         easily implemented.
+        Received frame is always released, also when the computation ends.
 
         :param seq: current sequnce number
         """
 
         seq_loader, new_frame = self.receive(pipe_id=constants.FRAME_LOADER_ID)
-        seq_lights, light_status = self.receive(pipe_id=constants.TRAFFIC_LIGHT_OBSERVER_ID)
-        seq_tracker, boxes_mask, boxes_mask_no_border, lifelines = self.receive(pipe_id=constants.TRACKER_ID)
 
-        if not self._info.corridors_repository.corridors_found:
-            if len(self._info.vanishing_points) < 1:
-                self._detect_first_vp(lifelines)
+        try:
+            # computation ends with the first envelope of detection mode
+            if self._mode == Mode.DETECTION:
+                raise EOFError
+
+            seq_lights, light_status = self.receive(pipe_id=constants.TRAFFIC_LIGHT_OBSERVER_ID)
+            seq_tracker, centers, radii, radii_no_border, lifelines = self.receive(pipe_id=constants.TRACKER_ID)
+
+            if self._mode == Mode.DETECTION:
+                raise EOFError
+
+            if not self._info.corridors_repository.corridors_found:
+                if len(self._info.vanishing_points) < 1:
+                    self._detect_first_vp(lifelines)
+
+                elif len(self._info.vanishing_points) < 2:
+                    boxes_mask = draw_circles(self._boxes_mask, centers, radii)
+                    boxes_mask_no_border = draw_circles(self._boxes_mask_no_border, centers, radii_no_border)
+
+                    self._detect_second_vanishing_point(new_frame.image, boxes_mask, boxes_mask_no_border,
+                                                        light_status)
 
-            elif len(self._info.vanishing_points) < 2:
-                self._detect_second_vanishing_point(new_frame, boxes_mask, boxes_mask_no_border, light_status)
+                elif len(TrackedObject.filter_lifelines(lifelines, self._info.vp1)) > \
+                        constants.CORRIDORS_MINIMUM_LIFELINES:
+                    self._find_corridors(lifelines)
 
-            elif len(TrackedObject.filter_lifelines(lifelines, self._info.vp1)) > constants.CORRIDORS_MINIMUM_LIFELINES:
-                self._find_corridors(lifelines)
+        finally:
+            new_frame.release()
 
     def _detect_first_vp(self, lifelines):
         """
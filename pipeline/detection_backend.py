@@ -0,0 +1,283 @@
+import os
+from threading import Lock
+
+import cv2
+import numpy as np
+
+BACKEND_TENSORFLOW = "tensorflow"
+BACKEND_OPENCV = "opencv"
+BACKEND_FAKE = "fake"
+
+
+class DetectionBackend:
+    """
+    Engine running trained object detection model. Model is loaded on first inference
+    and it can be released when it is not needed anymore.
+
+    Results of all backends have the same format as results of tensorflow object detection API:
+    relative boxes (y_min, x_min, y_max, x_max), scores and classes for each image,
+    sorted by score in descending order.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: path to trained object detection model
+        """
+
+        self._path = path
+        self._lock = Lock()
+
+    @property
+    def path(self):
+        """
+        :return: path to trained model
+        """
+
+        return self._path
+
+    @property
+    def loaded(self):
+        """
+        :return: if model is loaded in memory
+        """
+
+        raise NotImplementedError
+
+    def run(self, images):
+        """
+        Detects objects on batch of images. Model is loaded if it was not loaded yet.
+
+        :param images: batch of images (N x height x width x 3)
+        :return: relative boxes, scores and classes of detected objects for each image
+        """
+
+        with self._lock:
+            if not self.loaded:
+                self._load()
+
+            return self._run(images)
+
+    def release(self):
+        """
+        Frees loaded model. Model is loaded again on next inference.
+        """
+
+        with self._lock:
+            if self.loaded:
+                self._release()
+
+    def _load(self):
+        raise NotImplementedError
+
+    def _run(self, images):
+        raise NotImplementedError
+
+    def _release(self):
+        raise NotImplementedError
+
+    @staticmethod
+    def _pack(detections):
+        """
+        Pads detections of all images of batch to the same length and sorts them by score.
+
+        :param detections: list of (boxes, scores, classes) for each image
+        :return: boxes (N x M x 4), scores (N x M) and classes (N x M) of batch
+        """
+
+        length = max([len(scores) for _, scores, _ in detections] + [0])
+
+        boxes = np.zeros((len(detections), length, 4), dtype=np.float32)
+        scores = np.zeros((len(detections), length), dtype=np.float32)
+        classes = np.zeros((len(detections), length), dtype=np.float32)
+
+        for index, (image_boxes, image_scores, image_classes) in enumerate(detections):
+            order = np.argsort(-np.asarray(image_scores, dtype=np.float32), kind="stable")
+            count = len(order)
+
+            if count:
+                boxes[index, :count] = np.asarray(image_boxes, dtype=np.float32)[order]
+                scores[index, :count] = np.asarray(image_scores, dtype=np.float32)[order]
+                classes[index, :count] = np.asarray(image_classes, dtype=np.float32)[order]
+
+        return boxes, scores, classes
+
+
+class TensorflowBackend(DetectionBackend):
+    """
+    Runs frozen tensorflow graph in tensorflow session.
+    Code for running tensorflow model inspired by: https://medium.com/@WuStangDan/step-by-step-tensorflow-object-detection-api-tutorial-part-5-saving-and-deploying-a-model-8d51f56dbcf1
+    """
+
+    def __init__(self, path, session_config):
+        """
+        :param path: path to frozen graph of trained object detection model
+        :param session_config: function providing session configuration shared by all tensorflow models
+        """
+
+        super().__init__(path)
+
+        self._session_config = session_config
+        self._session = None
+
+        self.image_tensor = None
+        self.d_boxes = None
+        self.d_scores = None
+        self.d_classes = None
+
+    @property
+    def loaded(self):
+        return self._session is not None
+
+    def _load(self):
+        """
+        Loads frozen graph and creates session using shared configuration.
+        """
+
+        import tensorflow as tf
+
+        detection_graph = tf.Graph()
+
+        with detection_graph.as_default():
+            od_graph_def = tf.GraphDef()
+
+            with tf.gfile.GFile(self._path, 'rb') as fid:
+                serialized_graph = fid.read()
+                od_graph_def.ParseFromString(serialized_graph)
+                tf.import_graph_def(od_graph_def, name='')
+
+            self.image_tensor = detection_graph.get_tensor_by_name('image_tensor:0')
+            self.d_boxes = detection_graph.get_tensor_by_name('detection_boxes:0')
+            self.d_scores = detection_graph.get_tensor_by_name('detection_scores:0')
+            self.d_classes = detection_graph.get_tensor_by_name('detection_classes:0')
+
+        self._session = tf.Session(graph=detection_graph, config=self._session_config())
+
+    def _run(self, images):
+        boxes, scores, classes = self._session.run([self.d_boxes, self.d_scores, self.d_classes],
+                                                   feed_dict={self.image_tensor: images})
+
+        return boxes, scores, classes
+
+    def _release(self):
+        self._session.close()
+
+        self._session = None
+        self.image_tensor = self.d_boxes = self.d_scores = self.d_classes = None
+
+
+class OpenCVBackend(DetectionBackend):
+    """
+    Runs frozen tensorflow graph using DNN module of OpenCV. Text description of graph (.pbtxt) generated by
+    OpenCV scripts tf_text_graph_ssd.py or tf_text_graph_faster_rcnn.py has to be stored next to the frozen graph.
+    """
+
+    def __init__(self, path, input_size=None, threads=0, config_path=None):
+        """
+        :param path: path to frozen graph of trained object detection model
+        :param input_size: (width, height) of network input, None if images are passed in their own size
+        :param threads: number of threads used by OpenCV, 0 means system default
+        :param config_path: path to text description of graph, frozen graph path with .pbtxt suffix if None
+        """
+
+        super().__init__(path)
+
+        self._input_size = input_size
+        self._threads = threads
+        self._config_path = config_path if config_path is not None else f"{os.path.splitext(path)[0]}.pbtxt"
+        self._net = None
+
+    @property
+    def loaded(self):
+        return self._net is not None
+
+    def _load(self):
+        """
+        Loads graph and its text description into OpenCV network running on CPU.
+        """
+
+        if self._threads > 0:
+            cv2.setNumThreads(self._threads)
+
+        self._net = cv2.dnn.readNetFromTensorflow(self._path, self._config_path)
+        self._net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+        self._net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+
+    def _run(self, images):
+        """
+        Output of OpenCV detection network is (1 x 1 x K x 7) array of detections of whole batch, each detection is
+        (image index, class, score, x_min, y_min, x_max, y_max).
+        """
+
+        height, width = images.shape[1:3]
+        size = self._input_size if self._input_size is not None else (width, height)
+
+        blob = cv2.dnn.blobFromImages(list(images), size=size, swapRB=False, crop=False)
+        self._net.setInput(blob)
+
+        output = self._net.forward().reshape(-1, 7)
+        output[:, 3:] = np.clip(output[:, 3:], 0, 1)
+
+        detections = []
+
+        for index in range(len(images)):
+            image_output = output[output[:, 0] == index]
+
+            detections.append((image_output[:, [4, 3, 6, 5]], image_output[:, 2], image_output[:, 1]))
+
+        return self._pack(detections)
+
+    def _release(self):
+        self._net = None
+
+
+class FakeBackend(DetectionBackend):
+    """
+    Deterministic backend without any model, used for testing and benchmarking of pipeline.
+    """
+
+    def __init__(self, path, detect=None):
+        """
+        :param path: path of model, not used
+        :param detect: function returning list of (relative box, score, class) for given image,
+                       nothing is detected if None
+        """
+
+        super().__init__(path)
+
+        self._detect = detect
+        self._loaded = False
+        self._runs = 0
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    @property
+    def runs(self):
+        """
+        :return: number of inferences done by this backend
+        """
+
+        return self._runs
+
+    def _load(self):
+        self._loaded = True
+
+    def _run(self, images):
+        detections = []
+
+        for image in images:
+            image_detections = self._detect(image) if self._detect is not None else []
+
+            boxes = [box for box, _, _ in image_detections]
+            scores = [score for _, score, _ in image_detections]
+            classes = [class_id for _, _, class_id in image_detections]
+
+            detections.append((np.reshape(boxes, (-1, 4)), scores, classes))
+
+        self._runs += 1
+
+        return self._pack(detections)
+
+    def _release(self):
+        self._loaded = False
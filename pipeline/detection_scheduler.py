@@ -0,0 +1,117 @@
+import numpy as np
+
+from primitives import constants
+from primitives.enums import Color, Mode
+from pipeline.base.pipeline import is_frequency
+
+
+class DetectionScheduler:
+    """
+    Decides on which frames car detection is done. In detection mode the interval between detections adapts
+    to activity in scene reported by Tracker and TrafficLightsObserver:
+
+    - shortest interval when light is about to turn red or some car is close in front of stop line,
+    - longest interval when corridors are empty or all tracked cars are standing still,
+    - default interval otherwise.
+
+    In calibration modes detection is done on every default interval frame.
+    """
+
+    def __init__(self, default_interval=constants.DETECTOR_CAR_FREQUENCY,
+                 min_interval=constants.DETECTOR_CAR_MIN_INTERVAL,
+                 max_interval=constants.DETECTOR_CAR_MAX_INTERVAL,
+                 adaptive=constants.DETECTOR_CAR_ADAPTIVE):
+        """
+        :param default_interval: number of frames between detections in calibration and in normal traffic
+        :param min_interval: number of frames between detections when violation may happen soon
+        :param max_interval: number of frames between detections in quiet scene
+        :param adaptive: if interval adapts to scene activity, default interval is used otherwise
+        """
+
+        self._default_interval = default_interval
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._adaptive = adaptive
+
+        self._light_state = None
+        self._tracks = 0
+        self._tracks_near_line = 0
+        self._max_velocity = 0
+
+        self._last_detection = None
+        self._detections = 0
+
+    @property
+    def interval(self):
+        """
+        :return: current number of frames between detections in detection mode
+        """
+
+        if not self._adaptive:
+            return self._default_interval
+
+        if self._light_state == Color.ORANGE or self._tracks_near_line > 0:
+            return self._min_interval
+
+        if self._tracks == 0 or self._max_velocity < constants.DETECTOR_CAR_STILL_VELOCITY:
+            return self._max_interval
+
+        return self._default_interval
+
+    @property
+    def detections(self):
+        """
+        :return: number of frames scheduled for detection
+        """
+
+        return self._detections
+
+    def report_light(self, state):
+        """
+        :param state: current state of traffic light
+        """
+
+        self._light_state = state
+
+    def report_tracks(self, distances_to_line, velocities):
+        """
+        :param distances_to_line: distances of tracked cars in front of stop line (N), nan if stop line is not known
+        :param velocities: velocities of tracked cars measured by optical flow (N)
+        """
+
+        distances_to_line = np.asarray(distances_to_line, dtype=np.float64)
+        velocities = np.asarray(velocities, dtype=np.float64)
+
+        near_line = (distances_to_line >= 0) & (distances_to_line < constants.DETECTOR_CAR_STOP_LINE_DISTANCE)
+
+        self._tracks_near_line = int(np.count_nonzero(near_line))
+        self._max_velocity = velocities.max() if len(velocities) else 0
+        self._tracks = len(velocities)
+
+    def restart(self):
+        """
+        Forgets last scheduled detection, called when sequence numbers start again from zero.
+        """
+
+        self._last_detection = None
+
+    def due(self, seq, mode) -> bool:
+        """
+        Decides if detection should be done on selected frame. Has to be called once for every frame.
+
+        :param seq: sequence number of frame
+        :param mode: current work mode
+        :return: if detection should be done on selected frame
+        """
+
+        if mode != Mode.DETECTION:
+            detect = is_frequency(seq, self._default_interval)
+
+        else:
+            detect = self._last_detection is None or seq - self._last_detection >= self.interval
+
+        if detect:
+            self._last_detection = seq
+            self._detections += 1
+
+        return detect
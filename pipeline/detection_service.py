@@ -0,0 +1,186 @@
+import time
+from queue import Queue, Empty
+from threading import Thread, Event
+
+import cv2
+import numpy as np
+
+from primitives import constants
+
+
+class DetectionRequest:
+    """
+    Batch of images waiting for detection in DetectionService.
+    """
+
+    def __init__(self, images):
+        """
+        :param images: batch of images (N x height x width x 3)
+        """
+
+        self.images = images
+        self.result = None
+        self.error = None
+        self.done = Event()
+
+
+class DetectionService:
+    """
+    Shares one detection model between detectors of more streams. Requests of all streams are collected in one queue
+    and images of several requests are passed to the model in one inference.
+
+    Images are resized to the input size of network before batching, so frames of different cameras (and different
+    regions of interest) can be batched together. Relative boxes are not affected by resizing.
+    Error of any request is passed to its Detector, the service keeps serving other requests.
+    """
+
+    def __init__(self, model, batch_size=constants.DETECTOR_SERVICE_BATCH_SIZE,
+                 batch_timeout=constants.DETECTOR_SERVICE_BATCH_TIMEOUT, input_size=constants.DETECTOR_CAR_INPUT_SIZE):
+        """
+        :param model: shared detection backend
+        :param batch_size: maximal number of images passed to the model in one inference
+        :param batch_timeout: maximal number of seconds to wait for requests of other streams
+        :param input_size: (width, height) all images are resized to, None if only images of the same size are batched
+        """
+
+        self._model = model
+        self._batch_size = batch_size
+        self._batch_timeout = batch_timeout
+        self._input_size = input_size
+
+        self._requests = Queue()
+        self._inferences = 0
+        self._images = 0
+
+        self._thread = Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    @property
+    def inferences(self):
+        """
+        :return: number of inferences done by the model
+        """
+
+        return self._inferences
+
+    @property
+    def images(self):
+        """
+        :return: number of images passed to the model
+        """
+
+        return self._images
+
+    def run(self, images):
+        """
+        Detects objects on batch of images, waits until the batch is processed together with batches of other streams.
+
+        :param images: batch of images (N x height x width x 3)
+        :return: relative boxes, scores and classes of detected objects for each image
+        """
+
+        request = DetectionRequest(images)
+
+        self._requests.put(request)
+        request.done.wait()
+
+        if request.error is not None:
+            raise request.error
+
+        return request.result
+
+    def stop(self):
+        """
+        Stops serving thread after all waiting requests are processed.
+        """
+
+        self._requests.put(None)
+        self._thread.join()
+
+    def _collect(self, first):
+        """
+        Collects next requests until the batch is full or the batch timeout is reached.
+
+        :param first: the first request of batch
+        :return: list of requests of batch, if the service should stop after them
+        """
+
+        requests = [first]
+        size = len(first.images)
+
+        deadline = time.time() + self._batch_timeout
+
+        while size < self._batch_size:
+            remaining = deadline - time.time()
+
+            if remaining <= 0:
+                break
+
+            try:
+                request = self._requests.get(timeout=remaining)
+            except Empty:
+                break
+
+            if request is None:
+                return requests, True
+
+            requests.append(request)
+            size += len(request.images)
+
+        return requests, False
+
+    def _serve(self):
+        """
+        Main loop of serving thread.
+        """
+
+        stop = False
+
+        while not stop:
+            first = self._requests.get()
+
+            if first is None:
+                break
+
+            requests, stop = self._collect(first)
+
+            groups = {}
+            for request in requests:
+                try:
+                    if self._input_size is not None:
+                        request.images = np.stack([cv2.resize(image, self._input_size) for image in request.images])
+
+                    groups.setdefault(request.images.shape[1:], []).append(request)
+
+                except Exception as error:
+                    request.error = error
+                    request.done.set()
+
+            for group in groups.values():
+                self._process(group)
+
+    def _process(self, requests):
+        """
+        Runs one inference on images of all requests and splits the results back to requests.
+
+        :param requests: requests with images of the same size
+        """
+
+        try:
+            boxes, scores, classes = self._model.run(np.concatenate([request.images for request in requests]))
+
+            self._inferences += 1
+            self._images += len(boxes)
+
+            start = 0
+            for request in requests:
+                end = start + len(request.images)
+                request.result = boxes[start:end], scores[start:end], classes[start:end]
+                start = end
+
+        except Exception as error:
+            for request in requests:
+                request.error = error
+
+        for request in requests:
+            request.done.set()
@@ -1,4 +1,5 @@
-import tensorflow as tf
+import time
+
 import numpy as np
 from primitives import constants
 from primitives.coordinates import Coordinates
@@ -11,61 +12,168 @@ class Detector(ThreadedPipeBlock):
     """
     PipeBlock which uses model of neural network for object detection.
     Any type of trained neural network for detection could be passed.
-    Code for running tensorflow model inspired by: https://medium.com/@WuStangDan/step-by-step-tensorflow-object-detection-api-tutorial-part-5-saving-and-deploying-a-model-8d51f56dbcf1
+    Model is taken from model registry of InputInfo, which selects the backend running it.
+    Model is loaded on the first detection. When more streams are examined, detections are requested from shared
+    DetectionService instead.
     """
 
     def _mode_changed(self, new_mode):
         pass
 
-    def __init__(self, info, model, output=None, detector_type_id=constants.DETECTOR_CAR_ID, block=True, max_steps=np.inf):
+    def __init__(self, info, model, output=None, detector_type_id=constants.DETECTOR_CAR_ID, block=True, max_steps=np.inf,
+                 batch_size=constants.DETECTOR_BATCH_SIZE, batch_timeout=constants.DETECTOR_BATCH_TIMEOUT,
+                 input_size=constants.DETECTOR_CAR_INPUT_SIZE, service=None):
         """
         :param info: instance of InputInfo
         :param model: path to trained object detection model
         :param output: list of PipeBlock output instances
         :param detector_type_id: unique ID used for communication between PipeBlocks
         :param max_steps: maximum number of steps
+        :param batch_size: maximal number of frames passed to network in one inference
+        :param batch_timeout: maximal number of seconds to wait for next frames of batch
+        :param input_size: (width, height) of network input used by backends requiring fixed input size
+        :param service: DetectionService shared with detectors of other streams, model is used directly if None
         """
 
         super().__init__(info=info, pipe_id=detector_type_id, output=output, max_steps=max_steps)
-        self.detection_graph = tf.Graph()
-        self._block = block
-
-        with self.detection_graph.as_default():
-            od_graph_def = tf.GraphDef()
 
-            with tf.gfile.GFile(model, 'rb') as fid:
-                serialized_graph = fid.read()
-                od_graph_def.ParseFromString(serialized_graph)
-                tf.import_graph_def(od_graph_def, name='')
-
-            self.image_tensor = self.detection_graph.get_tensor_by_name('image_tensor:0')
-            self.d_boxes = self.detection_graph.get_tensor_by_name('detection_boxes:0')
-            self.d_scores = self.detection_graph.get_tensor_by_name('detection_scores:0')
-            self.d_classes = self.detection_graph.get_tensor_by_name('detection_classes:0')
-            self.num_d = self.detection_graph.get_tensor_by_name('num_detections:0')
-
-        self.sess = tf.Session(graph=self.detection_graph)
+        if service is not None:
+            self._model = service
+        else:
+            self._model = info.model_registry.model(model, input_size=input_size)
+        self._block = block
+        self._batch_size = batch_size
+        self._batch_timeout = batch_timeout
 
     def _step(self, seq):
         """
-        On each steps, if sequence number compare with detector frequency is correct new detection is done.
+        On each step batch of frames is collected and detection is done on all of them at once.
+        Frames are cropped to region of interest before detection and boxes are mapped back to whole frame.
         Detected boxes are converted from relative coordinate to real coordinate using InputInfo.
         If detected box is outside specified area it is thrown away.
+        Boxes are send to output separately for every frame in the order of their sequence numbers.
 
         :param seq:
         :return:
         """
-        seq, image = self.receive(constants.FRAME_LOADER_ID)
-        img_expanded = np.expand_dims(image, axis=0)
 
-        (boxes, scores, classes, _) = self.sess.run(
-            [self.d_boxes, self.d_scores, self.d_classes, self.num_d],
-            feed_dict={self.image_tensor: img_expanded})
+        frames = self._receive_batch()
+
+        x, y, width, height = roi = self.region_of_interest()
+        images = np.stack([frame.image[y:y + height, x:x + width] for frame in frames])
+
+        boxes, scores, classes = self._model.run(images)
+        boxes = self.boxes_to_frame(boxes, roi)
+
+        for frame in frames:
+            frame.release()
+
+        for index, _ in enumerate(frames):
+            packet_boxes = self.parse_boxes(boxes[index], scores[index], classes[index])
+
+            if len(self._output):
+                self.send(packet_boxes, pipe_id=list(self._output.keys())[0], block=self._block)
+
+    def _receive_batch(self):
+        """
+        Waits for the first frame, then collects next frames until the batch is full or the batch timeout
+        is reached. Timeout guarantees that detection is done even when FrameLoader is waiting for the
+        results of this batch.
+
+        :raise EOFError when input ends, frames already collected into the batch are released
+        :return: list of received frames in order of their sequence numbers
+        """
+
+        _, frame = self._receive_frame()
+        frames = [frame]
+
+        deadline = time.time() + self._batch_timeout
+
+        try:
+            while len(frames) < self._batch_size:
+                remaining = deadline - time.time()
+
+                if remaining <= 0:
+                    break
+
+                message = self._receive_frame(timeout=remaining)
+
+                if message is None:
+                    break
+
+                _, frame = message
+                frames.append(frame)
+
+        except EOFError:
+            for frame in frames:
+                frame.release()
+
+            raise
+
+        return frames
+
+    def _receive_frame(self, timeout=None):
+        """
+        Receives next frame from FrameLoader. Calibration received instead of frame is restored into InputInfo,
+        it is sent only when this PipeBlock is computed in own process.
+
+        :param timeout: maximal number of seconds to wait, None means no limit
+        :return: message (sequence number, frame), None if no frame was received
+        """
+
+        while True:
+            message = self.receive(constants.FRAME_LOADER_ID, timeout=timeout)
+
+            if not isinstance(message, dict):
+                return message
+
+            if not self._info.corridors_repository.ready:
+                self._info.restore_calibration(message)
+
+    def region_of_interest(self):
+        """
+        Only detections inside of update area (and inside of corridors after they are found) are used,
+        so the rest of frame does not have to be passed to the network.
+
+        :return: x, y, width, height of bounding rectangle of region of interest extended by margin
+        """
+
+        x, y, width, height = self._info.update_area.bounding_rect
+        x_max, y_max = x + width, y + height
+
+        corridors_rect = self._info.corridors_repository.bounding_rect
+
+        if self._info.corridors_repository.corridors_found and corridors_rect is not None:
+            corridors_x, corridors_y, corridors_width, corridors_height = corridors_rect
+
+            x, y = max(x, corridors_x), max(y, corridors_y)
+            x_max, y_max = min(x_max, corridors_x + corridors_width), min(y_max, corridors_y + corridors_height)
+
+        if x_max <= x or y_max <= y:
+            return 0, 0, self._info.width, self._info.height
+
+        x = max(x - constants.DETECTOR_ROI_MARGIN, 0)
+        y = max(y - constants.DETECTOR_ROI_MARGIN, 0)
+        x_max = min(x_max + constants.DETECTOR_ROI_MARGIN, self._info.width)
+        y_max = min(y_max + constants.DETECTOR_ROI_MARGIN, self._info.height)
+
+        return x, y, x_max - x, y_max - y
+
+    def boxes_to_frame(self, boxes, roi):
+        """
+        Maps boxes relative to cropped region of interest to boxes relative to whole frame.
+
+        :param boxes: relative boxes (y_min, x_min, y_max, x_max) detected in region of interest
+        :param roi: x, y, width, height of region of interest
+        :return: relative boxes in whole frame
+        """
+
+        x, y, width, height = roi
 
-        packet_boxes = self.parse_boxes(boxes[0], scores[0], classes[0])
+        scale = np.array([height / self._info.height, width / self._info.width] * 2, dtype=np.float32)
+        offset = np.array([y / self._info.height, x / self._info.width] * 2, dtype=np.float32)
 
-        if len(self._output):
-            self.send(packet_boxes, pipe_id=list(self._output.keys())[0], block=self._block)
+        return boxes * scale + offset
 
     def parse_boxes(self, boxes, scores, classes) -> [(Coordinates, ObjectSize, float)]:
         """
@@ -0,0 +1,94 @@
+from threading import Lock
+
+from pipeline.detection_backend import DetectionBackend, TensorflowBackend, OpenCVBackend, FakeBackend, \
+    BACKEND_TENSORFLOW, BACKEND_OPENCV, BACKEND_FAKE
+from primitives import constants
+
+
+class ModelRegistry:
+    """
+    Registry of detection models used in project. Each model is created only once and it is loaded lazily
+    by selected detection backend.
+    Tensorflow sessions of all models share one configuration and global thread pools, so detectors do not compete
+    with separate thread pools.
+    """
+
+    def __init__(self, backend=constants.MODEL_BACKEND,
+                 intra_op_threads=constants.MODEL_INTRA_OP_THREADS,
+                 inter_op_threads=constants.MODEL_INTER_OP_THREADS,
+                 opencv_threads=constants.MODEL_OPENCV_THREADS):
+        """
+        :param backend: "tensorflow", "opencv", "fake" or function creating DetectionBackend for model path
+        :param intra_op_threads: number of tensorflow threads used inside of one operation, 0 means system default
+        :param inter_op_threads: number of tensorflow threads used for independent operations, 0 means system default
+        :param opencv_threads: number of threads used by OpenCV backend, 0 means system default
+        """
+
+        if not callable(backend) and backend not in [BACKEND_TENSORFLOW, BACKEND_OPENCV, BACKEND_FAKE]:
+            raise ValueError(f"unknown detection backend: {backend}")
+
+        self._backend = backend
+        self._intra_op_threads = intra_op_threads
+        self._inter_op_threads = inter_op_threads
+        self._opencv_threads = opencv_threads
+        self._config = None
+        self._models = {}
+        self._lock = Lock()
+
+    def model(self, path, input_size=None) -> DetectionBackend:
+        """
+        :param path: path to frozen graph of trained object detection model
+        :param input_size: (width, height) of network input used by OpenCV backend, None for size of image
+        :return: model registered for selected path, it is not loaded until first inference
+        """
+
+        with self._lock:
+            if path not in self._models:
+                self._models[path] = self._create(path, input_size)
+
+            return self._models[path]
+
+    def release(self, path):
+        """
+        Frees selected model.
+
+        :param path: path to frozen graph of model
+        """
+
+        with self._lock:
+            model = self._models.get(path)
+
+        if model is not None:
+            model.release()
+
+    def _create(self, path, input_size):
+        """
+        :param path: path to frozen graph of trained object detection model
+        :param input_size: (width, height) of network input used by OpenCV backend
+        :return: new instance of selected backend
+        """
+
+        if callable(self._backend):
+            return self._backend(path)
+
+        if self._backend == BACKEND_OPENCV:
+            return OpenCVBackend(path, input_size=input_size, threads=self._opencv_threads)
+
+        if self._backend == BACKEND_FAKE:
+            return FakeBackend(path)
+
+        return TensorflowBackend(path, session_config=self._session_config)
+
+    def _session_config(self):
+        """
+        :return: tensorflow session configuration shared by all models
+        """
+
+        import tensorflow as tf
+
+        if self._config is None:
+            self._config = tf.ConfigProto(intra_op_parallelism_threads=self._intra_op_threads,
+                                          inter_op_parallelism_threads=self._inter_op_threads,
+                                          use_per_session_threads=False)
+
+        return self._config
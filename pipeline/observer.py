@@ -2,8 +2,9 @@ import cv2
 from primitives import constants
 import numpy as np
 
-from copy import deepcopy
+from collections import namedtuple
 from enum import IntEnum
+from itertools import islice
 
 from primitives.coordinates import Coordinates
 from primitives.enums import Mode
@@ -19,6 +20,115 @@ class CarBehaviourMode(IntEnum):
     ORANGE_DRIVER = 4
 
 
+BoxState = namedtuple("BoxState", ["car_id", "top_left", "bottom_right", "behaviour"])
+
+
+def draw_box(image, car_id, top_left, bottom_right, behaviour):
+    """
+    Helper function for draw bounding box with color corresponding to behaviour
+
+    :param image: selected image to draw on
+    :param car_id: id of car in bounding box
+    :param top_left: top left anchor of bounding box
+    :param bottom_right: bottom right anchor of bounding box
+    :param behaviour: behaviour classification of car
+    :return: updated image
+    """
+
+    if behaviour == CarBehaviourMode.RED_DRIVER:
+        color = constants.COLOR_RED
+    elif behaviour == CarBehaviourMode.ORANGE_DRIVER:
+        color = constants.COLOR_ORANGE
+    else:
+        color = constants.COLOR_GREEN
+
+    cv2.rectangle(img=image,
+                  pt1=top_left,
+                  pt2=bottom_right,
+                  color=color,
+                  thickness=constants.OBSERVER_BOX_THICKNESS)
+
+    cv2.rectangle(img=image,
+                  pt1=top_left,
+                  pt2=(top_left[0] + 30, top_left[1] - 15),
+                  color=color,
+                  thickness=constants.FILL)
+
+    cv2.circle(img=image,
+               center=Coordinates((bottom_right[0] + top_left[0]) / 2, bottom_right[1]).tuple(),
+               color=constants.COLOR_RED,
+               radius=5,
+               thickness=constants.FILL)
+
+    cv2.putText(img=image,
+                text=car_id,
+                org=top_left,
+                fontFace=1,
+                fontScale=1,
+                color=constants.COLOR_BLACK,
+                thickness=2)
+
+    return image
+
+
+def draw_trajectory(image, history, method="second"):
+    """
+    Helper function for drawing car trajectory (trajectory of center point)
+
+    :param image: selected image
+    :param history: history of center points of car
+    :param method: method of trajectory obtaining to be printed
+    """
+
+    if method == "second":
+        for index, point in enumerate(history):
+            cv2.circle(img=image,
+                       center=point.tuple(),
+                       color=constants.COLOR_BLUE,
+                       radius=5,
+                       thickness=constants.FILL)
+
+            try:
+                cv2.line(img=image,
+                         pt1=point.tuple(),
+                         pt2=history[index + 1].tuple(),
+                         color=constants.COLOR_BLUE,
+                         thickness=2)
+
+            except IndexError:
+                pass
+
+    if method == "first":
+        try:
+            Line(history[0].tuple(), history[-1].tuple()).draw(image, constants.COLOR_RED, 1)
+        except SamePointError:
+            return
+
+        cv2.circle(img=image,
+                   center=history[0].tuple(),
+                   color=constants.COLOR_BLUE,
+                   radius=5,
+                   thickness=constants.FILL)
+
+        cv2.circle(img=image,
+                   center=history[-1].tuple(),
+                   color=constants.COLOR_BLUE,
+                   radius=5,
+                   thickness=constants.FILL)
+
+        cv2.line(img=image,
+                 pt1=history[0].tuple(),
+                 pt2=history[-1].tuple(),
+                 color=constants.COLOR_BLUE,
+                 thickness=2)
+
+    position_history = [coordinates.tuple() for coordinates in history]
+    line, value = ransac(position_history, position_history, 1)
+
+    if line is not None and value > 5:
+        line.draw(image, constants.COLOR_RED, 2)
+
+
 class Box2D:
     """
     Bounding box around car.
@@ -43,6 +153,14 @@ class Box2D:
         """
         return self._behaviour
 
+    @property
+    def history(self):
+        """
+        :return: history of center points, points are only appended so snapshots share it with its length
+        """
+
+        return self._history
+
     @property
     def top_left(self):
         """
@@ -130,7 +248,7 @@ class Box2D:
         """
         self._lifetime -= 1
 
-    def update(self, anchors, lights_state, info, velocity):
+    def update(self, anchors, lights_state, info, velocity, line_crossed=None):
         """
         Updates position, velocity and behavior depending on passed light state.
         On each update history of center points is saved for trajectory printing.
@@ -139,6 +257,7 @@ class Box2D:
         :param lights_state: current light state
         :param info: instance of InputInfo
         :param velocity: velocity of observed car
+        :param line_crossed: if stop line was crossed by this update, computed if not given
         :return: classification of behaviour of car
         """
         previous_coordinates = None
@@ -150,19 +269,22 @@ class Box2D:
         self._lifetime += 1
 
         if previous_coordinates is not None:
+            if line_crossed is None:
+                line_crossed = info.corridors_repository.line_crossed(previous_coordinates, self.tracker_point)
+
             if lights_state == Color.RED or lights_state == Color.RED_ORANGE:
-                if info.corridors_repository.line_crossed(previous_coordinates, self.tracker_point):
+                if line_crossed:
                     self._behaviour = CarBehaviourMode.RED_DRIVER
 
                 if self._behaviour == CarBehaviourMode.LINE_CROSSED:
                     self._red_distance_traveled += velocity
 
             if lights_state == Color.ORANGE:
-                if info.corridors_repository.line_crossed(previous_coordinates, self.tracker_point):
+                if line_crossed:
                     self._behaviour = CarBehaviourMode.ORANGE_DRIVER
 
             if lights_state == Color.GREEN and self._behaviour not in [CarBehaviourMode.ORANGE_DRIVER, CarBehaviourMode.RED_DRIVER]:
-                if info.corridors_repository.line_crossed(previous_coordinates, self.tracker_point):
+                if line_crossed:
                     self._behaviour = CarBehaviourMode.LINE_CROSSED
 
         if not len(self._history) or np.abs(self.center_point.y - self._history[-1].y) > 20:
@@ -178,40 +300,7 @@ class Box2D:
         :return: updated image
         """
 
-        if self._behaviour == CarBehaviourMode.RED_DRIVER:
-            color = constants.COLOR_RED
-        elif self._behaviour == CarBehaviourMode.ORANGE_DRIVER:
-            color = constants.COLOR_ORANGE
-        else:
-            color = constants.COLOR_GREEN
-
-        cv2.rectangle(img=image,
-                      pt1=self._top_left,
-                      pt2=self._bottom_right,
-                      color=color,
-                      thickness=constants.OBSERVER_BOX_THICKNESS)
-
-        cv2.rectangle(img=image,
-                      pt1=self._top_left,
-                      pt2=(self._top_left[0] + 30, self._top_left[1] - 15),
-                      color=color,
-                      thickness=constants.FILL)
-
-        cv2.circle(img=image,
-                   center=self.tracker_point.tuple(),
-                   color=constants.COLOR_RED,
-                   radius=5,
-                   thickness=constants.FILL)
-
-        cv2.putText(img=image,
-                    text=self.car_id,
-                    org=self._top_left,
-                    fontFace=1,
-                    fontScale=1,
-                    color=constants.COLOR_BLACK,
-                    thickness=2)
-
-        return image
+        return draw_box(image, self._car_id, self._top_left, self._bottom_right, self._behaviour)
 
     def draw_trajectories(self, image, method="second"):
         """
@@ -222,69 +311,92 @@ class Box2D:
         :return: updated image
         """
 
-        if method == "second":
-            for index, point in enumerate(self._history):
-                cv2.circle(img=image,
-                           center=point.tuple(),
-                           color=constants.COLOR_BLUE,
-                           radius=5,
-                           thickness=constants.FILL)
+        draw_trajectory(image, self._history, method)
 
-                try:
-                    cv2.line(img=image,
-                             pt1=point.tuple(),
-                             pt2=self._history[index + 1].tuple(),
-                             color=constants.COLOR_BLUE,
-                             thickness=2)
+    def __str__(self):
+        return f"[Box id: {self._car_id}]"
 
-                except IndexError:
-                    pass
 
-        if method == "first":
-            try:
-                Line(self._history[0].tuple(), self._history[-1].tuple()).draw(image, constants.COLOR_RED, 1)
-            except SamePointError:
-                return
+class DriverLog:
+    """
+    Append-only log of drivers in order they were classified. Snapshots hold only current length of the log,
+    so the log is never copied.
+    """
 
-            cv2.circle(img=image,
-                       center=self._history[0].tuple(),
-                       color=constants.COLOR_BLUE,
-                       radius=5,
-                       thickness=constants.FILL)
+    def __init__(self):
+        self._entries = []
+        self._ids = set()
 
-            cv2.circle(img=image,
-                       center=self._history[-1].tuple(),
-                       color=constants.COLOR_BLUE,
-                       radius=5,
-                       thickness=constants.FILL)
+    def __contains__(self, car_id):
+        return car_id in self._ids
 
-            cv2.line(img=image,
-                     pt1=self._history[0].tuple(),
-                     pt2=self._history[-1].tuple(),
-                     color=constants.COLOR_BLUE,
-                     thickness=2)
+    def __len__(self):
+        return len(self._entries)
 
-        position_history = [coordinates.tuple() for coordinates in self._history]
-        line, value = ransac(position_history, position_history, 1)
+    def append(self, car_id, seq):
+        """
+        :param car_id: id of classified car
+        :param seq: sequence number of classification
+        """
 
-        if line is not None and value > 5:
-            line.draw(image, constants.COLOR_RED, 2)
+        self._entries.append((car_id, seq))
+        self._ids.add(car_id)
 
-    def __str__(self):
-        return f"[Box id: {self._car_id}]"
+    def view(self):
+        """
+        :return: immutable view of current entries of the log
+        """
+
+        return DriverLogView(self._entries, len(self._entries))
+
+
+class DriverLogView:
+    """
+    First entries of DriverLog which were present when the view was created.
+    """
+
+    def __init__(self, entries, length):
+        """
+        :param entries: shared list of entries of DriverLog
+        :param length: number of entries belonging to the view
+        """
+
+        self._entries = entries
+        self._length = length
+
+    def __len__(self):
+        return self._length
+
+    def ids(self):
+        """
+        :return: set of ids of cars in view
+        """
+
+        return {car_id for car_id, _ in islice(self._entries, self._length)}
+
+    def to_dict(self, exclude=()):
+        """
+        :param exclude: ids of cars left out
+        :return: dictionary of sequence numbers of classification by car id
+        """
+
+        return {car_id: seq for car_id, seq in islice(self._entries, self._length) if car_id not in exclude}
 
 
 class BBoxRepository:
     """
     Bounding boxes repository.
-    Holds all instances of bounding boxes in separate dictionaries
+    Holds all instances of bounding boxes in dictionary and classified drivers in append-only logs.
+    Car classified as orange driver and later as red driver stays in log of orange drivers, but it is counted
+    only as red driver.
     """
 
     def __init__(self):
         self._boxes = {}
-        self._red_riders = {}
-        self._orange_riders = {}
-        self._all_cars = {}
+        self._red_riders = DriverLog()
+        self._orange_riders = DriverLog()
+        self._orange_count = 0
+        self._all_cars = DriverLog()
 
     @property
     def boxes(self):
@@ -300,7 +412,7 @@ class BBoxRepository:
         :return: all red drivers
         """
 
-        return self._red_riders
+        return self._red_riders.view().to_dict()
 
     @property
     def orange_riders(self):
@@ -308,7 +420,7 @@ class BBoxRepository:
         :return: all orange drivers
         """
 
-        return self._orange_riders
+        return self._orange_riders.view().to_dict(exclude=self._red_riders.view().ids())
 
     @property
     def car_count(self):
@@ -332,7 +444,7 @@ class BBoxRepository:
         :return: orange drivers count
         """
 
-        return len(self._orange_riders)
+        return self._orange_count
 
     def get_boxes_in_corridors(self, info):
         """
@@ -348,7 +460,38 @@ class BBoxRepository:
 
         return {corridor: [box for box in sorted_boxes if box.get_corridor(info) == corridor]for corridor in corridor_ids}
 
-    def insert_or_update(self, anchors, car_id, velocity, lights_state, info, seq):
+    def update_all(self, tracked_objects, lights_state, info, seq):
+        """
+        Updates or creates bounding boxes of all serialized tracked objects.
+        Stop line crossing is tested for all of them at once.
+
+        :param tracked_objects: serialized tracked objects
+        :param lights_state: current light state
+        :param info: instance of InputInfo for behaviour classification
+        :param seq: current sequence number
+        """
+
+        previous_points = []
+        points = []
+
+        for anchors, _, car_id, _ in tracked_objects:
+            box = self._boxes.get(car_id)
+            top_left, bottom_right, _ = anchors
+
+            if box is not None and box.initialized:
+                previous_points.append((box.tracker_point.x, box.tracker_point.y))
+            else:
+                previous_points.append((np.nan, np.nan))
+
+            points.append(((bottom_right[0] + top_left[0]) / 2, bottom_right[1]))
+
+        crossed = info.corridors_repository.line_crossed_many(previous_points, points)
+
+        for tracked_object, line_crossed in zip(tracked_objects, crossed):
+            anchors, _, car_id, velocity = tracked_object
+            self.insert_or_update(anchors, car_id, velocity, lights_state, info, seq, line_crossed=bool(line_crossed))
+
+    def insert_or_update(self, anchors, car_id, velocity, lights_state, info, seq, line_crossed=None):
         """
         Updates or creates new instance of bounding box identified by car ID.
         If red or orange driver is detected, then it instance is being saved into corresponding dictionary
@@ -359,29 +502,31 @@ class BBoxRepository:
         :param lights_state: current light state
         :param info: instance of InputInfo for behaviour classification
         :param seq: current sequence number
+        :param line_crossed: if stop line was crossed by this update, computed if not given
         """
 
         if car_id not in self._boxes:
             self._boxes[car_id] = Box2D(car_id)
 
-        behaviour = self._boxes[car_id].update(anchors, lights_state, info, velocity)
+        behaviour = self._boxes[car_id].update(anchors, lights_state, info, velocity, line_crossed)
+
+        # logs are only appended, they are shared by already sent snapshots
 
         if behaviour in [CarBehaviourMode.ORANGE_DRIVER, CarBehaviourMode.RED_DRIVER, CarBehaviourMode.LINE_CROSSED]:
             if car_id not in self._all_cars:
-                self._all_cars[car_id] = seq
+                self._all_cars.append(car_id, seq)
 
         if behaviour == CarBehaviourMode.RED_DRIVER:
-            try:
-                self._orange_riders.pop(car_id)
-            except KeyError:
-                pass
-
             if car_id not in self._red_riders:
-                self._red_riders[car_id] = seq
+                self._red_riders.append(car_id, seq)
+
+                if car_id in self._orange_riders:
+                    self._orange_count -= 1
 
         if behaviour == CarBehaviourMode.ORANGE_DRIVER:
-            if car_id not in self._orange_riders:
-                self._orange_riders[car_id] = seq
+            if car_id not in self._orange_riders and car_id not in self._red_riders:
+                self._orange_riders.append(car_id, seq)
+                self._orange_count += 1
 
     def check_lifetime(self):
         """
@@ -394,6 +539,155 @@ class BBoxRepository:
             if box.lifetime < 0:
                 self._boxes.pop(key)
 
+    def get_box_by_id(self, car_id):
+        """
+        :param car_id: desired car ID
+        :return: instance of bounding box with desired ID
+        """
+
+        return self._boxes[car_id]
+
+    def snapshot(self):
+        """
+        :return: immutable snapshot of current state of repository
+        """
+
+        boxes = [box for box in self._boxes.values() if box.initialized]
+
+        return BBoxSnapshot(car_ids=[box.car_id for box in boxes],
+                            anchors=[tuple(box.top_left) + tuple(box.bottom_right) for box in boxes],
+                            behaviours=[box.behaviour for box in boxes],
+                            histories=[(box.history, len(box.history)) for box in boxes],
+                            red_riders=self._red_riders.view(),
+                            orange_riders=self._orange_riders.view(),
+                            orange_count=self._orange_count,
+                            all_cars=self._all_cars.view())
+
+    def restart(self):
+        """
+        Clears all dictionaries containing instances of bounding boxes.
+        """
+
+        self._boxes = {}
+        self._red_riders = DriverLog()
+        self._orange_riders = DriverLog()
+        self._orange_count = 0
+        self._all_cars = DriverLog()
+
+
+class BBoxSnapshot:
+    """
+    Immutable snapshot of BBoxRepository sent to output PipeBlocks. Bounding boxes are stored as arrays of anchors,
+    car ids and behaviour codes. Histories and logs of drivers are shared with repository together with their
+    current length, because repository only appends to them. Size of snapshot depends only on number of visible cars.
+    """
+
+    def __init__(self, car_ids, anchors, behaviours, histories, red_riders, orange_riders, orange_count, all_cars):
+        """
+        :param car_ids: ids of visible cars
+        :param anchors: anchors of bounding boxes in form x_min, y_min, x_max, y_max
+        :param behaviours: behaviour classification of each car
+        :param histories: shared history of center points of each car with its length
+        :param red_riders: view of log of red drivers
+        :param orange_riders: view of log of orange drivers, including those who became red drivers later
+        :param orange_count: number of orange drivers
+        :param all_cars: view of log of all cars which crossed the stop line
+        """
+
+        self._car_ids = tuple(car_ids)
+        self._anchors = np.array(anchors, dtype=np.int32).reshape(-1, 4)
+        self._behaviours = np.array(behaviours, dtype=np.int8)
+        self._histories = tuple(histories)
+
+        self._anchors.flags.writeable = False
+        self._behaviours.flags.writeable = False
+
+        self._rows = {car_id: row for row, car_id in enumerate(self._car_ids)}
+
+        self._red_riders = red_riders
+        self._orange_riders = orange_riders
+        self._orange_count = orange_count
+        self._all_cars = all_cars
+
+    @property
+    def car_ids(self):
+        """
+        :return: ids of visible cars
+        """
+
+        return self._car_ids
+
+    @property
+    def anchors(self):
+        """
+        :return: anchors of all bounding boxes (N x 4)
+        """
+
+        return self._anchors
+
+    @property
+    def behaviours(self):
+        """
+        :return: behaviour codes of all bounding boxes (N)
+        """
+
+        return self._behaviours
+
+    @property
+    def red_riders(self):
+        """
+        :return: all red drivers
+        """
+
+        return self._red_riders.to_dict()
+
+    @property
+    def orange_riders(self):
+        """
+        :return: all orange drivers
+        """
+
+        return self._orange_riders.to_dict(exclude=self._red_riders.ids())
+
+    @property
+    def car_count(self):
+        """
+        :return: total car count
+        """
+
+        return len(self._all_cars)
+
+    @property
+    def red_drivers_count(self):
+        """
+        :return: number of red rivers
+        """
+
+        return len(self._red_riders)
+
+    @property
+    def orange_drivers_count(self):
+        """
+        :return: orange drivers count
+        """
+
+        return self._orange_count
+
+    def get_box_by_id(self, car_id):
+        """
+        :param car_id: desired car ID
+        :raise KeyError if car is not visible
+        :return: state of bounding box with desired ID
+        """
+
+        row = self._rows[car_id]
+        x_min, y_min, x_max, y_max = (int(value) for value in self._anchors[row])
+
+        return BoxState(car_id=car_id,
+                        top_left=(x_min, y_min),
+                        bottom_right=(x_max, y_max),
+                        behaviour=CarBehaviourMode(self._behaviours[row]))
+
     def draw_boxes(self, image):
         """
         Helper function for drawing all present boxes on image
@@ -402,8 +696,9 @@ class BBoxRepository:
         :return: updated image
         """
 
-        for key, box in self._boxes.items():
-            box.draw_boxes(image)
+        for car_id in self._car_ids:
+            box = self.get_box_by_id(car_id)
+            draw_box(image, box.car_id, box.top_left, box.bottom_right, box.behaviour)
 
         return image
 
@@ -418,19 +713,11 @@ class BBoxRepository:
         image = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
         image = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
 
-        for key, box in self._boxes.items():
-            box.draw_trajectories(image)
+        for history, length in self._histories:
+            draw_trajectory(image, history[:length])
 
         return image
 
-    def get_box_by_id(self, car_id):
-        """
-        :param car_id: desired car ID
-        :return: instance of bounding box with desired ID
-        """
-
-        return self._boxes[car_id]
-
     def draw_statistics(self, image, info):
         """
         Helper function to draw statistics panel about passed cars on selected image
@@ -483,24 +770,14 @@ class BBoxRepository:
             "orange_drivers_count": self.orange_drivers_count,
             "red_drivers": self.red_riders,
             "orange_drivers": self.orange_riders,
-            "all_drivers": self._all_cars
+            "all_drivers": self._all_cars.to_dict()
         }
 
-    def restart(self):
-        """
-        Clears all dictionaries containing instances of bounding boxes.
-        """
-
-        self._boxes = {}
-        self._red_riders = {}
-        self._orange_riders = {}
-        self._all_cars = {}
-
 
 class Observer(ThreadedPipeBlock):
     """
     Observes the scene and combines obtained information about car and light objects.
-    On every step deepcopy of BBoxRepository is send to output PipeBocks.
+    On every step immutable snapshot of BBoxRepository is send to output PipeBocks.
 
     While working in calibration mode it helps with detecting stop line by examining car behaviour on certain light
     states.
@@ -547,9 +824,7 @@ class Observer(ThreadedPipeBlock):
         tracker_seq, tracked_objects = self.receive(pipe_id=constants.TRACKER_ID)
         lights_seq, current_lights_state = self.receive(pipe_id=constants.TRAFFIC_LIGHT_OBSERVER_ID)
 
-        for tracked_object in tracked_objects:
-            anchors, _, car_info, car_velocity = tracked_object
-            self._bounding_boxes_repository.insert_or_update(anchors, car_info, car_velocity, current_lights_state, self._info, seq)
+        self._bounding_boxes_repository.update_all(tracked_objects, current_lights_state, self._info, seq)
 
         self._bounding_boxes_repository.check_lifetime()
 
@@ -564,12 +839,17 @@ class Observer(ThreadedPipeBlock):
                     except IndexError:
                         continue
 
-        if is_frequency(seq, constants.VIDEO_PLAYER_FREQUENCY):
-            message = seq, deepcopy(self._bounding_boxes_repository), current_lights_state
+        to_player = constants.VIDEO_PLAYER_ID in self._output and is_frequency(seq, constants.VIDEO_PLAYER_FREQUENCY)
+
+        if to_player or is_frequency(seq, constants.VIOLATION_WRITER_FREQUENCY):
+            snapshot = self._bounding_boxes_repository.snapshot()
+
+        if to_player:
+            message = seq, snapshot, current_lights_state
             self.send(message, pipe_id=constants.VIDEO_PLAYER_ID, block=False)
 
         if is_frequency(seq, constants.VIOLATION_WRITER_FREQUENCY):
-            message = seq, deepcopy(self._bounding_boxes_repository), current_lights_state
+            message = seq, snapshot, current_lights_state
             self.send(message, pipe_id=constants.VIOLATION_WRITER_ID)
 
         self._previous_lights_state = current_lights_state
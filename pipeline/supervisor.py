@@ -0,0 +1,243 @@
+from primitives import constants
+
+from pipeline.calibrator import Calibrator
+from pipeline.detection_service import DetectionService
+from pipeline.detector import Detector
+from pipeline.model_registry import ModelRegistry
+from pipeline.observer import Observer
+from pipeline.telemetry import Telemetry, TelemetryExporter
+from pipeline.tracker import Tracker
+from pipeline.traffic_light_observer import TrafficLightsObserver
+from video_stream.frame_loader import FrameLoader
+from video_stream.input_info import Info
+from video_stream.video_player import VideoPlayer
+from video_stream.violation_writer import ViolationWriter
+
+
+class Stream:
+    """
+    Pipeline of one camera. Holds own InputInfo and own graph of PipeBlocks, which is not connected to graphs of
+    other streams. Detection models are taken from registry shared by all streams.
+    """
+
+    def __init__(self, stream_id, program_arguments, car_model, light_model, model_registry, detection_service=None):
+        """
+        :param stream_id: unique id of stream
+        :param program_arguments: program arguments of this stream, see InputParser.stream_arguments()
+        :param car_model: path to car detection model
+        :param light_model: path to traffic light detection model
+        :param model_registry: registry of detection models shared by all streams
+        :param detection_service: DetectionService shared by all streams, car model is used directly if None
+        """
+
+        self._id = stream_id
+
+        self._info = Info(video_path=program_arguments.input_video,
+                          light_detection_model=light_model,
+                          program_arguments=program_arguments,
+                          model_registry=model_registry)
+
+        # video writer
+        self._video_writer = ViolationWriter(info=self._info,
+                                             program_arguments=program_arguments)
+
+        # video playback
+        if program_arguments.headless:
+            self._video_player = None
+            players = []
+        else:
+            self._video_player = VideoPlayer(info=self._info, print_fps=True, output=[self._video_writer])
+            players = [self._video_player]
+
+        # calibrator
+        calibrator = Calibrator(info=self._info,
+                                output=[])
+
+        # observer
+        observer = Observer(info=self._info,
+                            output=players + [self._video_writer])
+
+        # traffic light observer
+        traffic_lights_observer = TrafficLightsObserver(info=self._info,
+                                                        output=[observer, calibrator])
+
+        # car tracker
+        self._tracker = Tracker(info=self._info,
+                                output=[observer, calibrator] + players)
+
+        # car detector
+        self._car_detector = Detector(model=car_model,
+                                      info=self._info,
+                                      output=[self._tracker],
+                                      detector_type_id=constants.DETECTOR_CAR_ID,
+                                      batch_size=program_arguments.detector_batch_size,
+                                      service=detection_service)
+        # frame loader
+        self._frame_loader = FrameLoader(info=self._info,
+                                         output=[self._car_detector,
+                                                 self._tracker,
+                                                 calibrator,
+                                                 traffic_lights_observer,
+                                                 self._video_writer] + players)
+
+        self._blocks = [self._frame_loader,
+                        self._car_detector,
+                        self._tracker,
+                        calibrator,
+                        observer,
+                        self._video_writer,
+                        traffic_lights_observer]
+
+    @property
+    def id(self):
+        """
+        :return: unique id of stream
+        """
+
+        return self._id
+
+    @property
+    def info(self):
+        """
+        :return: InputInfo of stream
+        """
+
+        return self._info
+
+    @property
+    def blocks(self):
+        """
+        :return: PipeBlocks of stream computed in own threads
+        """
+
+        return self._blocks
+
+    @property
+    def all_blocks(self):
+        """
+        :return: all PipeBlocks of stream including video player
+        """
+
+        return self._blocks + ([self._video_player] if self._video_player is not None else [])
+
+    def start(self):
+        """
+        Starts computation of all threaded PipeBlocks of stream.
+        """
+
+        for block in self._blocks:
+            block.start()
+
+    def play(self):
+        """
+        Runs video player of stream in current thread, nothing is done in headless mode.
+        """
+
+        if self._video_player is None:
+            return
+
+        self._video_player._loader = self._frame_loader
+        self._video_player._detector = self._car_detector
+        self._video_player._tracker = self._tracker
+
+        self._video_player.start()
+
+    def join(self):
+        """
+        Waits until violations of stream are written.
+        """
+
+        self._video_writer.join()
+
+
+class Supervisor:
+    """
+    Runs pipelines of all input videos at once. Each stream has isolated graph of PipeBlocks, but detection models
+    are loaded only once for all of them. Car detections of all streams are batched together by shared DetectionService.
+    Telemetry of all PipeBlocks is available thru telemetry property and it is exported if requested by arguments.
+    """
+
+    def __init__(self, program_arguments, car_model, light_model, model_registry=None):
+        """
+        :param program_arguments: instance of InputParser
+        :param car_model: path to car detection model
+        :param light_model: path to traffic light detection model
+        :param model_registry: registry of detection models, new one with backend selected by arguments if None
+        """
+
+        if model_registry is None:
+            model_registry = ModelRegistry(backend=program_arguments.backend)
+
+        self._model_registry = model_registry
+        self._detection_service = None
+
+        inputs = program_arguments.input_videos
+
+        if len(inputs) > 1:
+            model = self._model_registry.model(car_model, input_size=constants.DETECTOR_CAR_INPUT_SIZE)
+            self._detection_service = DetectionService(model)
+
+        self._streams = [Stream(stream_id=index,
+                                program_arguments=program_arguments.stream_arguments(index),
+                                car_model=car_model,
+                                light_model=light_model,
+                                model_registry=self._model_registry,
+                                detection_service=self._detection_service)
+                         for index in range(len(inputs))]
+
+        self._telemetry = Telemetry()
+
+        for stream in self._streams:
+            self._telemetry.register(stream.id, stream.all_blocks)
+
+        self._telemetry_exporter = None
+
+        if program_arguments.telemetry is not None or program_arguments.telemetry_port is not None:
+            self._telemetry_exporter = TelemetryExporter(telemetry=self._telemetry,
+                                                         path=program_arguments.telemetry,
+                                                         port=program_arguments.telemetry_port)
+
+    @property
+    def streams(self):
+        """
+        :return: list of supervised streams
+        """
+
+        return self._streams
+
+    @property
+    def telemetry(self):
+        """
+        :return: telemetry of PipeBlocks of all streams
+        """
+
+        return self._telemetry
+
+    @property
+    def model_registry(self):
+        """
+        :return: registry of detection models shared by all streams
+        """
+
+        return self._model_registry
+
+    def run(self):
+        """
+        Starts all streams and waits until all of them are finished. Video player of single stream runs
+        in current thread.
+        """
+
+        for stream in self._streams:
+            stream.start()
+
+        for stream in self._streams:
+            stream.play()
+
+        for stream in self._streams:
+            stream.join()
+
+        if self._detection_service is not None:
+            self._detection_service.stop()
+
+        if self._telemetry_exporter is not None:
+            self._telemetry_exporter.stop()
@@ -0,0 +1,341 @@
+import json
+import os
+import time
+
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread, Lock, Event
+
+from primitives import constants
+
+
+class LatencyHistogram:
+    """
+    Histogram of durations with fixed upper bounds of buckets (in seconds).
+    """
+
+    def __init__(self, buckets=constants.TELEMETRY_LATENCY_BUCKETS):
+        """
+        :param buckets: sorted upper bounds of buckets in seconds
+        """
+
+        self._buckets = list(buckets)
+        self._counts = [0] * (len(self._buckets) + 1)
+        self._sum = 0
+        self._count = 0
+
+    def observe(self, seconds):
+        """
+        :param seconds: measured duration
+        """
+
+        self._counts[bisect_left(self._buckets, seconds)] += 1
+        self._sum += seconds
+        self._count += 1
+
+    def snapshot(self):
+        """
+        :return: dictionary with cumulative counts of buckets (last one is +Inf), sum and count of durations
+        """
+
+        cumulative = []
+        total = 0
+
+        for count in self._counts:
+            total += count
+            cumulative.append(total)
+
+        bounds = [str(bound) for bound in self._buckets] + ["+Inf"]
+
+        return {"buckets": dict(zip(bounds, cumulative)),
+                "sum": self._sum,
+                "count": self._count}
+
+
+class BlockTelemetry:
+    """
+    Measurements of one PipeBlock: latency of steps, time blocked while receiving and sending envelopes,
+    envelopes dropped because of full input queue and depth of input queues.
+
+    Measurements of PipeBlocks computed in own process stay in that process.
+    """
+
+    def __init__(self, name, pipe_id, inputs):
+        """
+        :param name: name of PipeBlock
+        :param pipe_id: id of PipeBlock
+        :param inputs: input queues of PipeBlock by sender id
+        """
+
+        self._name = name
+        self._id = pipe_id
+        self._inputs = inputs
+
+        self._steps = LatencyHistogram()
+        self._receive_blocked = {}
+        self._send_blocked = {}
+        self._dropped = {}
+        self._lock = Lock()
+
+    @property
+    def name(self):
+        """
+        :return: name of PipeBlock
+        """
+
+        return self._name
+
+    def step(self, seconds):
+        """
+        :param seconds: duration of one step
+        """
+
+        self._steps.observe(seconds)
+
+    def received(self, sender_id, seconds):
+        """
+        :param sender_id: id of sender
+        :param seconds: time blocked while waiting for envelope
+        """
+
+        self._receive_blocked[sender_id] = self._receive_blocked.get(sender_id, 0) + seconds
+
+    def sent(self, receiver_id, seconds):
+        """
+        :param receiver_id: id of receiver
+        :param seconds: time blocked while waiting for free space in input queue of receiver
+        """
+
+        self._send_blocked[receiver_id] = self._send_blocked.get(receiver_id, 0) + seconds
+
+    def dropped(self, sender_id):
+        """
+        Counts envelope which was not delivered because input queue was full. Called by the sender thread.
+
+        :param sender_id: id of sender
+        """
+
+        with self._lock:
+            self._dropped[sender_id] = self._dropped.get(sender_id, 0) + 1
+
+    def queue_depths(self):
+        """
+        :return: number of waiting envelopes in each input queue by sender id
+        """
+
+        depths = {}
+
+        for sender_id, queue in list(self._inputs.items()):
+            try:
+                depths[sender_id] = queue.qsize()
+            except NotImplementedError:
+                continue
+
+        return depths
+
+    def snapshot(self):
+        """
+        :return: dictionary of all measurements
+        """
+
+        with self._lock:
+            dropped = dict(self._dropped)
+
+        return {"block": self._name,
+                "id": self._id,
+                "step_seconds": self._steps.snapshot(),
+                "receive_blocked_seconds": dict(self._receive_blocked),
+                "send_blocked_seconds": dict(self._send_blocked),
+                "dropped_envelopes": dropped,
+                "queue_depths": self.queue_depths()}
+
+
+class Telemetry:
+    """
+    Pull API over telemetry of PipeBlocks of all streams. Measurements are exported as JSON or Prometheus text.
+    """
+
+    def __init__(self):
+        self._blocks = []
+
+    def register(self, stream_id, blocks):
+        """
+        :param stream_id: id of stream the PipeBlocks belong to
+        :param blocks: list of PipeBlocks
+        """
+
+        self._blocks.extend((stream_id, block) for block in blocks)
+
+    def collect(self):
+        """
+        :return: list of snapshots of all registered PipeBlocks, see BlockTelemetry.snapshot()
+        """
+
+        snapshots = []
+
+        for stream_id, block in self._blocks:
+            snapshot = block.telemetry.snapshot()
+            snapshot["stream"] = stream_id
+            snapshots.append(snapshot)
+
+        return snapshots
+
+    def to_json(self):
+        """
+        :return: measurements serialized as JSON
+        """
+
+        return json.dumps({"time": time.time(), "blocks": self.collect()})
+
+    def to_prometheus(self):
+        """
+        :return: measurements in Prometheus text exposition format, samples of each metric form one group
+        """
+
+        snapshots = self.collect()
+        lines = ["# TYPE pipeline_step_seconds histogram"]
+
+        for snapshot in snapshots:
+            labels = self._labels(snapshot)
+            steps = snapshot["step_seconds"]
+
+            for bound, count in steps["buckets"].items():
+                lines.append(f'pipeline_step_seconds_bucket{{{labels},le="{bound}"}} {count}')
+
+            lines.append(f"pipeline_step_seconds_sum{{{labels}}} {steps['sum']}")
+            lines.append(f"pipeline_step_seconds_count{{{labels}}} {steps['count']}")
+
+        for key, metric, metric_type, peer in [
+                ("receive_blocked_seconds", "pipeline_receive_blocked_seconds_total", "counter", "sender"),
+                ("send_blocked_seconds", "pipeline_send_blocked_seconds_total", "counter", "receiver"),
+                ("dropped_envelopes", "pipeline_dropped_envelopes_total", "counter", "sender"),
+                ("queue_depths", "pipeline_queue_depth", "gauge", "sender")]:
+
+            lines.append(f"# TYPE {metric} {metric_type}")
+
+            for snapshot in snapshots:
+                labels = self._labels(snapshot)
+
+                for peer_id, value in snapshot[key].items():
+                    lines.append(f'{metric}{{{labels},{peer}="{peer_id}"}} {value}')
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _labels(snapshot):
+        """
+        :param snapshot: snapshot of PipeBlock
+        :return: Prometheus labels identifying PipeBlock
+        """
+
+        return f'stream="{snapshot["stream"]}",block="{snapshot["block"]}",id="{snapshot["id"]}"'
+
+
+class TelemetryExporter:
+    """
+    Periodically writes telemetry to local file (JSON if the file has .json suffix, Prometheus text otherwise)
+    and/or serves it over HTTP on local port (Prometheus text, JSON on /json path).
+    """
+
+    def __init__(self, telemetry, path=None, port=None, interval=constants.TELEMETRY_INTERVAL):
+        """
+        :param telemetry: instance of Telemetry
+        :param path: path of file telemetry is written to, None if it should not be written
+        :param port: local port telemetry is served on, None if it should not be served
+        :param interval: number of seconds between writes of file
+        """
+
+        self._telemetry = telemetry
+        self._path = path
+        self._interval = interval
+        self._stopped = Event()
+
+        self._server = None
+        self._threads = []
+
+        if path is not None:
+            self._threads.append(Thread(target=self._write_periodically, daemon=True))
+
+        if port is not None:
+            self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+            self._threads.append(Thread(target=self._server.serve_forever, daemon=True))
+
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def port(self):
+        """
+        :return: port telemetry is served on, None if it is not served
+        """
+
+        return self._server.server_address[1] if self._server is not None else None
+
+    def write(self):
+        """
+        Writes current telemetry to file, the file is replaced at once so readers never see partial content.
+        """
+
+        if self._path.endswith(".json"):
+            content = self._telemetry.to_json()
+        else:
+            content = self._telemetry.to_prometheus()
+
+        temporary_path = f"{self._path}.tmp"
+
+        with open(temporary_path, "w") as file:
+            file.write(content)
+
+        os.replace(temporary_path, self._path)
+
+    def stop(self):
+        """
+        Writes final telemetry and stops exporting.
+        """
+
+        self._stopped.set()
+
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+        for thread in self._threads:
+            thread.join()
+
+        if self._path is not None:
+            self.write()
+
+    def _write_periodically(self):
+        """
+        Main loop of writing thread.
+        """
+
+        while not self._stopped.wait(self._interval):
+            self.write()
+
+    def _handler(self):
+        """
+        :return: HTTP request handler class serving telemetry
+        """
+
+        telemetry = self._telemetry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") == "/json":
+                    content, content_type = telemetry.to_json(), "application/json"
+                else:
+                    content, content_type = telemetry.to_prometheus(), "text/plain; version=0.0.4"
+
+                body = content.encode()
+
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
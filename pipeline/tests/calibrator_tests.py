@@ -0,0 +1,71 @@
+import unittest
+import numpy as np
+
+from pipeline.base.pipeline import PipeBlock
+from pipeline.calibrator import Calibrator
+from pipeline.detection_scheduler import DetectionScheduler
+from primitives import constants
+from primitives.enums import Mode
+from video_stream.frame_loader import FrameLoader
+
+
+class CorridorsStub:
+    corridors_found = True
+
+
+class InfoStub:
+    width = 4
+    height = 3
+    calibrated = False
+    corridors_repository = CorridorsStub()
+
+    def __init__(self):
+        self.detection_scheduler = DetectionScheduler()
+
+    def read(self):
+        return np.zeros(shape=(self.height, self.width, 3), dtype=np.uint8)
+
+    def reopen(self):
+        pass
+
+
+class Source(PipeBlock):
+    def __init__(self, pipe_id, output):
+        super().__init__(info=None, pipe_id=pipe_id, output=output)
+
+
+class CalibratorTests(unittest.TestCase):
+    def setUp(self):
+        self.info = InfoStub()
+        self.calibrator = Calibrator(info=self.info, output=[])
+        self.loader = FrameLoader(output=[self.calibrator], info=self.info)
+        self.lights = Source(constants.TRAFFIC_LIGHT_OBSERVER_ID, output=[self.calibrator])
+        self.tracker = Source(constants.TRACKER_ID, output=[self.calibrator])
+
+    def _step(self, seq):
+        self.loader._step(seq)
+
+        if seq % constants.CALIBRATOR_FREQUENCY == 0:
+            for source in [self.lights, self.tracker]:
+                source._mode = self.loader.mode
+                source.send((seq, None, None, None, []) if source is self.tracker else (seq, None),
+                            pipe_id=constants.CALIBRATOR_ID,
+                            block=False)
+
+    def test_frames_released_after_detection(self):
+        self.calibrator.start()
+
+        seq = 0
+        for seq in range(1, 3 * constants.CALIBRATOR_FREQUENCY + 1):
+            self._step(seq)
+
+        self.info.calibrated = True
+
+        for seq in range(seq + 1, seq + 30 * constants.CALIBRATOR_FREQUENCY):
+            self._step(seq)
+
+        self.calibrator.join()
+
+        self.assertEqual(self.loader.mode, Mode.DETECTION)
+        self.assertEqual(self.loader._frame_buffer.free_slots, constants.FRAME_LOADER_BUFFER_SLOTS)
+        self.assertFalse(self.calibrator.deliver((Mode.DETECTION, None), constants.FRAME_LOADER_ID, block=False))
@@ -0,0 +1,79 @@
+import unittest
+import numpy as np
+
+from pipeline.detection_backend import FakeBackend, OpenCVBackend
+
+
+class NetStub:
+    def __init__(self, output):
+        self.output = output
+        self.input = None
+
+    def setInput(self, blob):
+        self.input = blob
+
+    def forward(self):
+        return self.output
+
+
+class FakeBackendTests(unittest.TestCase):
+    def test_empty(self):
+        backend = FakeBackend("cars.pb")
+
+        boxes, scores, classes = backend.run(np.zeros((2, 10, 10, 3), dtype=np.uint8))
+
+        self.assertEqual(boxes.shape, (2, 0, 4))
+        self.assertEqual(scores.shape, (2, 0))
+        self.assertEqual(classes.shape, (2, 0))
+
+    def test_sorted_and_padded(self):
+        def detect(image):
+            if image[0, 0, 0] == 0:
+                return [((0, 0, 0.5, 0.5), 0.3, 3), ((0.5, 0.5, 1, 1), 0.9, 2)]
+
+            return [((0.1, 0.2, 0.3, 0.4), 0.6, 8)]
+
+        images = np.zeros((2, 10, 10, 3), dtype=np.uint8)
+        images[1] = 1
+
+        backend = FakeBackend("cars.pb", detect=detect)
+        boxes, scores, classes = backend.run(images)
+
+        self.assertTrue(np.allclose(scores, [[0.9, 0.3], [0.6, 0]]))
+        self.assertTrue(np.array_equal(classes, [[2, 3], [8, 0]]))
+        self.assertTrue(np.allclose(boxes[0], [[0.5, 0.5, 1, 1], [0, 0, 0.5, 0.5]]))
+        self.assertTrue(np.allclose(boxes[1], [[0.1, 0.2, 0.3, 0.4], [0, 0, 0, 0]]))
+
+    def test_release(self):
+        backend = FakeBackend("cars.pb")
+
+        self.assertFalse(backend.loaded)
+
+        backend.run(np.zeros((1, 10, 10, 3), dtype=np.uint8))
+        self.assertTrue(backend.loaded)
+        self.assertEqual(backend.runs, 1)
+
+        backend.release()
+        self.assertFalse(backend.loaded)
+
+
+class OpenCVBackendTests(unittest.TestCase):
+    def test_config_path(self):
+        self.assertEqual(OpenCVBackend("models/cars.pb")._config_path, "models/cars.pbtxt")
+        self.assertEqual(OpenCVBackend("models/cars.pb", config_path="graph.pbtxt")._config_path, "graph.pbtxt")
+
+    def test_output_conversion(self):
+        output = np.array([[[[0, 3, 0.4, 0.1, 0.2, 0.3, 0.4],
+                             [1, 2, 0.8, -0.1, 0.5, 0.6, 1.2],
+                             [0, 8, 0.7, 0.5, 0.6, 0.7, 0.8]]]], dtype=np.float32)
+
+        backend = OpenCVBackend("cars.pb", input_size=(30, 20))
+        backend._net = NetStub(output)
+
+        boxes, scores, classes = backend.run(np.zeros((2, 10, 10, 3), dtype=np.uint8))
+
+        self.assertEqual(backend._net.input.shape, (2, 3, 20, 30))
+        self.assertTrue(np.allclose(scores, [[0.7, 0.4], [0.8, 0]]))
+        self.assertTrue(np.array_equal(classes, [[8, 3], [2, 0]]))
+        self.assertTrue(np.allclose(boxes[0], [[0.6, 0.5, 0.8, 0.7], [0.2, 0.1, 0.4, 0.3]]))
+        self.assertTrue(np.allclose(boxes[1][0], [0.5, 0, 1, 0.6]))
@@ -0,0 +1,67 @@
+import unittest
+
+from pipeline.detection_scheduler import DetectionScheduler
+from primitives.enums import Color, Mode
+
+
+class DetectionSchedulerTests(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = DetectionScheduler(default_interval=3, min_interval=1, max_interval=6, adaptive=True)
+
+    def scheduled(self, first, last, mode=Mode.DETECTION):
+        return [seq for seq in range(first, last + 1) if self.scheduler.due(seq, mode)]
+
+    def test_calibration_uses_default_interval(self):
+        self.assertEqual(self.scheduled(1, 12, mode=Mode.CALIBRATION_VP), [3, 6, 9, 12])
+
+    def test_empty_scene(self):
+        self.scheduler.report_tracks(distances_to_line=[], velocities=[])
+
+        self.assertEqual(self.scheduler.interval, 6)
+        self.assertEqual(self.scheduled(1, 13), [1, 7, 13])
+
+    def test_moving_traffic(self):
+        self.scheduler.report_tracks(distances_to_line=[200, float("nan")], velocities=[0.1, 3])
+
+        self.assertEqual(self.scheduler.interval, 3)
+        self.assertEqual(self.scheduled(1, 7), [1, 4, 7])
+
+    def test_standing_traffic(self):
+        self.scheduler.report_tracks(distances_to_line=[200, -10], velocities=[0.1, 0.2])
+
+        self.assertEqual(self.scheduler.interval, 6)
+
+    def test_car_near_stop_line(self):
+        self.scheduler.report_tracks(distances_to_line=[200, 10], velocities=[0.1, 0.2])
+
+        self.assertEqual(self.scheduler.interval, 1)
+        self.assertEqual(self.scheduled(1, 3), [1, 2, 3])
+
+    def test_orange_light(self):
+        self.scheduler.report_tracks(distances_to_line=[], velocities=[])
+        self.scheduler.report_light(Color.ORANGE)
+
+        self.assertEqual(self.scheduler.interval, 1)
+
+        self.scheduler.report_light(Color.RED)
+        self.assertEqual(self.scheduler.interval, 6)
+
+    def test_interval_change(self):
+        self.scheduler.report_tracks(distances_to_line=[], velocities=[])
+        self.assertEqual(self.scheduled(1, 4), [1])
+
+        self.scheduler.report_light(Color.ORANGE)
+        self.assertEqual(self.scheduled(5, 6), [5, 6])
+
+    def test_restart(self):
+        self.scheduled(1, 5)
+        self.scheduler.restart()
+
+        self.assertEqual(self.scheduled(1, 1), [1])
+        self.assertEqual(self.scheduler.detections, 2)
+
+    def test_fixed(self):
+        scheduler = DetectionScheduler(default_interval=3, min_interval=1, max_interval=6, adaptive=False)
+        scheduler.report_light(Color.ORANGE)
+
+        self.assertEqual(scheduler.interval, 3)
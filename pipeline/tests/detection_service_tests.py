@@ -0,0 +1,86 @@
+import unittest
+import numpy as np
+
+from threading import Thread
+
+from pipeline.detection_backend import FakeBackend
+from pipeline.detection_service import DetectionService
+
+
+def detect(image):
+    return [((0, 0, 1, 1), image.mean() / 255, int(image[0, 0, 0]))]
+
+
+class FailingBackend(FakeBackend):
+    def _run(self, images):
+        raise RuntimeError("inference failed")
+
+
+class DetectionServiceTests(unittest.TestCase):
+    def setUp(self):
+        self.backend = FakeBackend("cars.pb", detect=detect)
+
+    def run_streams(self, service, images):
+        results = [None] * len(images)
+
+        def request(index):
+            results[index] = service.run(images[index])
+
+        threads = [Thread(target=request, args=(index,)) for index in range(len(images))]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        return results
+
+    def test_streams_batched_together(self):
+        service = DetectionService(self.backend, batch_size=6, batch_timeout=1, input_size=(8, 8))
+
+        images = [np.full(shape=(2, 10 + index, 20, 3), fill_value=index + 1, dtype=np.uint8) for index in range(3)]
+        results = self.run_streams(service, images)
+
+        service.stop()
+
+        self.assertEqual(service.inferences, 1)
+        self.assertEqual(service.images, 6)
+        self.assertEqual(self.backend.runs, 1)
+
+        for index, (boxes, scores, classes) in enumerate(results):
+            self.assertEqual(boxes.shape, (2, 1, 4))
+            self.assertTrue(np.array_equal(classes, [[index + 1], [index + 1]]))
+
+    def test_same_size_only(self):
+        service = DetectionService(self.backend, batch_size=4, batch_timeout=1, input_size=None)
+
+        images = [np.full(shape=(1, 10, 10, 3), fill_value=1, dtype=np.uint8),
+                  np.full(shape=(1, 12, 10, 3), fill_value=2, dtype=np.uint8),
+                  np.full(shape=(2, 10, 10, 3), fill_value=3, dtype=np.uint8)]
+        results = self.run_streams(service, images)
+
+        service.stop()
+
+        self.assertEqual(service.inferences, 2)
+        self.assertEqual([classes[:, 0].tolist() for _, _, classes in results], [[1], [2], [3, 3]])
+
+    def test_error(self):
+        service = DetectionService(FailingBackend("cars.pb"), batch_size=1, batch_timeout=0)
+
+        with self.assertRaises(RuntimeError):
+            service.run(np.zeros(shape=(1, 10, 10, 3), dtype=np.uint8))
+
+        service.stop()
+
+    def test_invalid_request(self):
+        service = DetectionService(self.backend, batch_size=1, batch_timeout=0, input_size=(8, 8))
+
+        with self.assertRaises(Exception):
+            service.run(np.zeros(shape=(1, 0, 0, 3), dtype=np.uint8))
+
+        boxes, scores, classes = service.run(np.full(shape=(1, 10, 10, 3), fill_value=3, dtype=np.uint8))
+
+        self.assertEqual(classes[0][0], 3)
+
+        service.stop()
@@ -0,0 +1,144 @@
+import unittest
+import numpy as np
+
+from pipeline.base.pipeline import PipeBlock
+from pipeline.detection_backend import FakeBackend
+from pipeline.detector import Detector
+from pipeline.model_registry import ModelRegistry
+from primitives import constants
+from primitives.area import Area
+from primitives.coordinates import Coordinates
+from video_stream.frame_buffer import FrameBuffer
+
+
+class CorridorsStub:
+    def __init__(self, bounding_rect=None):
+        self.bounding_rect = bounding_rect
+        self.corridors_found = bounding_rect is not None
+        self.ready = self.corridors_found
+
+
+class InfoStub:
+    width = 640
+    height = 480
+
+    def __init__(self, backend, corridors_rect=None):
+        self.model_registry = ModelRegistry(backend=lambda path: backend)
+        self.corridors_repository = CorridorsStub(corridors_rect)
+        self.update_area = Area(info=self,
+                                top_left=Coordinates(0, self.height / 4),
+                                top_right=Coordinates(self.width, self.height / 4),
+                                bottom_right=Coordinates(self.width, self.height),
+                                bottom_left=Coordinates(0, self.height))
+
+    def restore_calibration(self, data):
+        self.corridors_repository = CorridorsStub(tuple(data["corridors rect"]))
+
+
+class Source(PipeBlock):
+    def __init__(self, output):
+        super().__init__(info=None, pipe_id=constants.FRAME_LOADER_ID, output=output)
+        self.buffer = FrameBuffer(slots=4, height=InfoStub.height, width=InfoStub.width)
+
+    def send_frame(self, seq):
+        frame = self.buffer.write(seq, np.full(shape=(InfoStub.height, InfoStub.width, 3), fill_value=seq,
+                                               dtype=np.uint8))
+        self.send((seq, frame), pipe_id=constants.DETECTOR_CAR_ID)
+
+
+class Sink(PipeBlock):
+    def __init__(self):
+        super().__init__(info=None, pipe_id=constants.TRACKER_ID)
+
+
+class DetectorTests(unittest.TestCase):
+    def setUp(self):
+        self.shapes = []
+
+        def detect(image):
+            self.shapes.append(image.shape)
+            return [((0.5, 0.5, 0.75, 0.75), 0.5 + image[0, 0, 0] / 100, 3)]
+
+        self.backend = FakeBackend("cars.pb", detect=detect)
+
+    def create_detector(self, corridors_rect=None, batch_size=1, batch_timeout=0):
+        sink = Sink()
+        detector = Detector(info=InfoStub(self.backend, corridors_rect), model="cars.pb", output=[sink],
+                            batch_size=batch_size, batch_timeout=batch_timeout)
+
+        return Source(output=[detector]), detector, sink
+
+    def test_region_of_interest(self):
+        margin = constants.DETECTOR_ROI_MARGIN
+
+        _, detector, _ = self.create_detector()
+        self.assertEqual(detector.region_of_interest(), (0, 120 - margin, 640, 360 + margin))
+
+        _, detector, _ = self.create_detector(corridors_rect=(100, 50, 300, 200))
+        self.assertEqual(detector.region_of_interest(), (100 - margin, 120 - margin, 300 + 2 * margin, 130 + 2 * margin))
+
+        _, detector, _ = self.create_detector(corridors_rect=(100, 10, 300, 50))
+        self.assertEqual(detector.region_of_interest(), (0, 0, 640, 480))
+
+    def test_boxes_to_frame(self):
+        _, detector, _ = self.create_detector()
+
+        boxes = np.array([[[0, 0, 1, 1], [0.5, 0.25, 0.75, 0.5]]], dtype=np.float32)
+        frame_boxes = detector.boxes_to_frame(boxes, (160, 120, 320, 240))
+
+        self.assertTrue(np.allclose(frame_boxes, [[[0.25, 0.25, 0.75, 0.75], [0.5, 0.375, 0.625, 0.5]]]))
+
+    def test_detection_on_cropped_frame(self):
+        source, detector, sink = self.create_detector(corridors_rect=(100, 200, 300, 200))
+        x, y, width, height = detector.region_of_interest()
+
+        source.send_frame(1)
+        detector._step(1)
+
+        boxes = sink.receive(constants.DETECTOR_CAR_ID)
+        (center, size, score, class_id), = boxes
+
+        self.assertEqual(self.shapes, [(height, width, 3)])
+        self.assertAlmostEqual(center.x, x + 0.625 * width, places=3)
+        self.assertAlmostEqual(center.y, y + 0.625 * height, places=3)
+        self.assertEqual(class_id, 3)
+
+    def test_batch(self):
+        source, detector, sink = self.create_detector(batch_size=4, batch_timeout=1)
+
+        for seq in range(1, 5):
+            source.send_frame(seq)
+
+        detector._step(1)
+
+        scores = [sink.receive(constants.DETECTOR_CAR_ID)[0][2] for _ in range(4)]
+
+        self.assertEqual(self.backend.runs, 1)
+        self.assertEqual(len(self.shapes), 4)
+        self.assertTrue(np.allclose(scores, [0.51, 0.52, 0.53, 0.54]))
+        self.assertEqual(source.buffer.free_slots, 4)
+
+    def test_end_of_input_in_batch(self):
+        source, detector, sink = self.create_detector(batch_size=4, batch_timeout=1)
+
+        source.send_frame(1)
+        source.send_frame(2)
+        source.send(EOFError, pipe_id=constants.DETECTOR_CAR_ID)
+
+        with self.assertRaises(EOFError):
+            detector._step(1)
+
+        self.assertEqual(self.backend.runs, 0)
+        self.assertEqual(source.buffer.free_slots, 4)
+
+    def test_calibration_received_before_frame(self):
+        source, detector, sink = self.create_detector()
+        source.send({"corridors rect": [100, 200, 300, 200]}, pipe_id=constants.DETECTOR_CAR_ID)
+        source.send_frame(1)
+
+        detector._step(1)
+
+        margin = constants.DETECTOR_ROI_MARGIN
+
+        self.assertEqual(self.shapes, [(200 + 2 * margin, 300 + 2 * margin, 3)])
+        self.assertEqual(len(sink.receive(constants.DETECTOR_CAR_ID)), 1)
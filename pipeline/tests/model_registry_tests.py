@@ -0,0 +1,37 @@
+import unittest
+
+from pipeline.detection_backend import FakeBackend, OpenCVBackend, TensorflowBackend
+from pipeline.model_registry import ModelRegistry
+
+
+class ModelRegistryTests(unittest.TestCase):
+    def setUp(self):
+        self.registry = ModelRegistry()
+
+    def test_model_is_shared(self):
+        model = self.registry.model("cars.pb")
+
+        self.assertIs(self.registry.model("cars.pb"), model)
+        self.assertIsNot(self.registry.model("lights.pb"), model)
+        self.assertEqual(model.path, "cars.pb")
+
+    def test_model_is_lazy(self):
+        model = self.registry.model("cars.pb")
+
+        self.assertFalse(model.loaded)
+
+        self.registry.release("cars.pb")
+        self.registry.release("unknown.pb")
+
+        self.assertFalse(model.loaded)
+
+    def test_backends(self):
+        self.assertIsInstance(self.registry.model("cars.pb"), TensorflowBackend)
+        self.assertIsInstance(ModelRegistry(backend="opencv").model("cars.pb"), OpenCVBackend)
+        self.assertIsInstance(ModelRegistry(backend="fake").model("cars.pb"), FakeBackend)
+
+        backend = FakeBackend("cars.pb")
+        self.assertIs(ModelRegistry(backend=lambda path: backend).model("cars.pb"), backend)
+
+        with self.assertRaises(ValueError):
+            ModelRegistry(backend="unknown")
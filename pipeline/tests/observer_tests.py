@@ -0,0 +1,89 @@
+import unittest
+import numpy as np
+
+from pipeline.observer import BBoxRepository, CarBehaviourMode
+from primitives.enums import Color
+
+
+class CorridorsRepositoryStub:
+    def __init__(self):
+        self.crossed = False
+
+    def line_crossed(self, previous_coordinates, coordinates):
+        return self.crossed
+
+    def line_crossed_many(self, previous_points, points):
+        return np.full(shape=len(points), fill_value=self.crossed, dtype=bool)
+
+
+class InfoStub:
+    def __init__(self):
+        self.corridors_repository = CorridorsRepositoryStub()
+
+
+def serialized(car_id, x, y):
+    return ((x, y), (x + 20, y + 10), (x + 10, y + 5)), None, car_id, 1
+
+
+class BBoxSnapshotTests(unittest.TestCase):
+    def setUp(self):
+        self.info = InfoStub()
+        self.repository = BBoxRepository()
+
+        self.repository.update_all([serialized("1", 10, 10), serialized("2", 100, 10)], Color.GREEN, self.info, 1)
+
+    def test_snapshot_is_not_changed_by_repository(self):
+        snapshot = self.repository.snapshot()
+
+        self.info.corridors_repository.crossed = True
+        self.repository.update_all([serialized("1", 10, 50), serialized("2", 100, 50)], Color.RED, self.info, 2)
+
+        self.assertEqual(snapshot.get_box_by_id("1").top_left, (10, 10))
+        self.assertEqual(snapshot.get_box_by_id("1").behaviour, CarBehaviourMode.NORMAL)
+        self.assertEqual(snapshot.red_drivers_count, 0)
+
+        new_snapshot = self.repository.snapshot()
+
+        self.assertEqual(new_snapshot.get_box_by_id("2").bottom_right, (120, 60))
+        self.assertEqual(new_snapshot.get_box_by_id("2").behaviour, CarBehaviourMode.RED_DRIVER)
+        self.assertEqual(new_snapshot.get_statistics()["red_drivers"], {"1": 2, "2": 2})
+
+    def test_read_only(self):
+        snapshot = self.repository.snapshot()
+
+        with self.assertRaises(ValueError):
+            snapshot.anchors[0][0] = 0
+
+        with self.assertRaises(KeyError):
+            snapshot.get_box_by_id("3")
+
+    def test_draw(self):
+        image = np.zeros(shape=(100, 200, 3), dtype=np.uint8)
+        snapshot = self.repository.snapshot()
+
+        self.assertEqual(snapshot.draw_boxes(image).shape, (100, 200, 3))
+        self.assertEqual(snapshot.draw_trajectories(image).shape, (100, 200, 3))
+        self.assertGreater(image.max(), 0)
+
+    def test_snapshot_shares_logs(self):
+        self.info.corridors_repository.crossed = True
+        self.repository.update_all([serialized("1", 10, 50)], Color.ORANGE, self.info, 2)
+
+        snapshot = self.repository.snapshot()
+        history = self.repository.get_box_by_id("1").history
+
+        self.repository.update_all([serialized("1", 10, 90), serialized("2", 100, 90)], Color.RED, self.info, 3)
+        new_snapshot = self.repository.snapshot()
+
+        self.assertIs(new_snapshot._histories[0][0], history)
+        self.assertEqual((len(history), snapshot._histories[0][1]), (3, 2))
+
+        self.assertEqual((snapshot.orange_riders, snapshot.red_riders), ({"1": 2}, {}))
+        self.assertEqual((snapshot.orange_drivers_count, snapshot.car_count), (1, 1))
+
+        self.assertEqual((new_snapshot.orange_riders, new_snapshot.red_riders), ({}, {"1": 3, "2": 3}))
+        self.assertEqual((new_snapshot.orange_drivers_count, new_snapshot.car_count), (0, 2))
+
+        self.repository.restart()
+
+        self.assertEqual(new_snapshot.get_statistics()["all_drivers"], {"1": 2, "2": 3})
@@ -0,0 +1,91 @@
+import unittest
+import numpy as np
+
+from queue import Queue
+
+from pipeline.base.pipeline import PipeBlock, ThreadedPipeBlock, ProcessPipeBlock
+from primitives import constants
+from video_stream.frame_buffer import FrameBuffer
+
+SOURCE_ID = 100
+WORKER_ID = 101
+SINK_ID = 102
+
+
+class Source(PipeBlock):
+    def __init__(self, output, frames):
+        super().__init__(info=None, pipe_id=SOURCE_ID, output=output)
+        self._buffer = FrameBuffer(slots=2, height=2, width=2, shared=True)
+        self._frames = frames
+
+    def _before(self):
+        pass
+
+    def _step(self, seq):
+        if seq > self._frames:
+            raise EOFError
+
+        frame = self._buffer.write(seq, np.full(shape=(2, 2, 3), fill_value=seq, dtype=np.uint8))
+        self.send((seq, frame), pipe_id=WORKER_ID)
+
+    def _after(self):
+        self.send(EOFError, pipe_id=WORKER_ID)
+
+
+class Worker(ProcessPipeBlock):
+    def __init__(self, output):
+        super().__init__(info=None, pipe_id=WORKER_ID, output=output)
+
+    def _step(self, seq):
+        _, frame = self.receive(pipe_id=SOURCE_ID)
+        self.send(int(frame.image.sum()), pipe_id=SINK_ID)
+        frame.release()
+
+    def _after(self):
+        self.send(EOFError, pipe_id=SINK_ID)
+
+
+class Sink(ThreadedPipeBlock):
+    def __init__(self):
+        super().__init__(info=None, pipe_id=SINK_ID)
+        self.received = []
+
+    def _step(self, seq):
+        self.received.append(self.receive(pipe_id=WORKER_ID))
+
+
+class ProcessPipeBlockTests(unittest.TestCase):
+    def test_queues_capable_of_multiprocessing(self):
+        sink = Sink()
+        worker = Worker(output=[sink])
+        Source(output=[worker], frames=0)
+
+        self.assertTrue(worker.in_process)
+        self.assertFalse(sink.in_process)
+        self.assertNotIsInstance(sink._input[WORKER_ID], Queue)
+        self.assertNotIsInstance(worker._input[SOURCE_ID], Queue)
+
+    def test_frames_transferred_to_process(self):
+        sink = Sink()
+        worker = Worker(output=[sink])
+        source = Source(output=[worker], frames=5)
+
+        sink.start()
+        worker.start()
+        source.start()
+
+        sink.join()
+        worker.join()
+
+        self.assertEqual(sink.received, [seq * 12 for seq in range(1, 6)])
+
+    def test_blocks_updating_info_stay_in_thread(self):
+        class Tracker(ProcessPipeBlock):
+            def __init__(self):
+                super().__init__(info=None, pipe_id=constants.TRACKER_ID)
+
+        self.assertIn(constants.TRACKER_ID, constants.PIPELINE_THREAD_BLOCKS)
+        self.assertIn(constants.TRAFFIC_LIGHT_OBSERVER_ID, constants.PIPELINE_THREAD_BLOCKS)
+
+        with self.assertRaises(ValueError):
+            Tracker()
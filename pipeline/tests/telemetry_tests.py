@@ -0,0 +1,108 @@
+import json
+import os
+import tempfile
+import unittest
+
+from urllib.request import urlopen
+
+from pipeline.base.pipeline import PipeBlock
+from pipeline.telemetry import LatencyHistogram, Telemetry, TelemetryExporter
+
+SENDER_ID = 200
+RECEIVER_ID = 201
+
+
+class Sender(PipeBlock):
+    def __init__(self, output):
+        super().__init__(info=None, pipe_id=SENDER_ID, output=output, queue_size=2)
+
+    def _before(self):
+        pass
+
+    def _step(self, seq):
+        if seq > 3:
+            raise EOFError
+
+        self.send(seq, pipe_id=RECEIVER_ID, block=False)
+
+
+class Receiver(PipeBlock):
+    def __init__(self):
+        super().__init__(info=None, pipe_id=RECEIVER_ID)
+
+
+class LatencyHistogramTests(unittest.TestCase):
+    def test_buckets(self):
+        histogram = LatencyHistogram(buckets=[0.01, 0.1])
+
+        for seconds in [0.005, 0.01, 0.05, 2]:
+            histogram.observe(seconds)
+
+        snapshot = histogram.snapshot()
+
+        self.assertEqual(snapshot["buckets"], {"0.01": 2, "0.1": 3, "+Inf": 4})
+        self.assertEqual(snapshot["count"], 4)
+        self.assertAlmostEqual(snapshot["sum"], 2.065)
+
+
+class TelemetryTests(unittest.TestCase):
+    def setUp(self):
+        self.receiver = Receiver()
+        self.sender = Sender(output=[self.receiver])
+
+        self.sender.start()
+        self.receiver.receive(SENDER_ID)
+
+        self.telemetry = Telemetry()
+        self.telemetry.register(0, [self.sender, self.receiver])
+
+    def test_block_telemetry(self):
+        sender, receiver = self.telemetry.collect()
+
+        self.assertEqual(sender["block"], "Sender")
+        self.assertEqual(sender["step_seconds"]["count"], 3)
+        self.assertIn(RECEIVER_ID, sender["send_blocked_seconds"])
+
+        self.assertEqual(receiver["stream"], 0)
+        self.assertEqual(receiver["dropped_envelopes"], {SENDER_ID: 1})
+        self.assertEqual(receiver["queue_depths"], {SENDER_ID: 1})
+        self.assertIn(SENDER_ID, receiver["receive_blocked_seconds"])
+
+    def test_prometheus(self):
+        text = self.telemetry.to_prometheus()
+
+        self.assertIn('pipeline_step_seconds_count{stream="0",block="Sender",id="200"} 3', text)
+        self.assertIn('pipeline_step_seconds_bucket{stream="0",block="Sender",id="200",le="+Inf"} 3', text)
+        self.assertIn('pipeline_dropped_envelopes_total{stream="0",block="Receiver",id="201",sender="200"} 1', text)
+        self.assertIn('pipeline_queue_depth{stream="0",block="Receiver",id="201",sender="200"} 1', text)
+
+    def test_exporter(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "telemetry.json")
+
+            exporter = TelemetryExporter(self.telemetry, path=path, port=0, interval=60)
+
+            with urlopen(f"http://127.0.0.1:{exporter.port}/metrics") as response:
+                self.assertIn("pipeline_step_seconds_count", response.read().decode())
+
+            with urlopen(f"http://127.0.0.1:{exporter.port}/json") as response:
+                self.assertEqual(len(json.loads(response.read().decode())["blocks"]), 2)
+
+            exporter.stop()
+
+            with open(path) as file:
+                self.assertEqual([block["block"] for block in json.load(file)["blocks"]], ["Sender", "Receiver"])
+
+    def test_prometheus_groups(self):
+        lines = self.telemetry.to_prometheus().splitlines()
+        families = []
+
+        for line in lines:
+            if line.startswith("# TYPE"):
+                families.append(line.split()[2])
+                continue
+
+            name = line.split("{")[0]
+            self.assertTrue(name.startswith(families[-1]), line)
+
+        self.assertEqual(len(families), len(set(families)))
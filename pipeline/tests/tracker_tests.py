@@ -0,0 +1,40 @@
+import unittest
+import numpy as np
+
+from pipeline.tracker import gated_distances, gated_assignment
+
+
+class GatedAssignmentTests(unittest.TestCase):
+    def test_gate(self):
+        centers = np.array([[0, 0], [100, 100]], dtype=np.float64)
+        radii = np.array([10, 10], dtype=np.float64)
+        new_centers = np.array([[3, 4], [100, 120], [105, 100]], dtype=np.float64)
+
+        distances, gate = gated_distances(centers, radii, new_centers)
+
+        self.assertAlmostEqual(distances[0][0], 5)
+        self.assertTrue(np.array_equal(gate, [[True, False, False], [False, False, True]]))
+
+    def test_no_allowed_pairs(self):
+        gate = np.zeros(shape=(2, 3), dtype=bool)
+
+        self.assertEqual(gated_assignment(np.zeros(shape=(2, 3)), gate), [])
+
+    def test_components(self):
+        centers = np.array([[0, 0], [10, 0], [500, 500]], dtype=np.float64)
+        radii = np.array([20, 20, 20], dtype=np.float64)
+        new_centers = np.array([[9, 0], [1, 0], [505, 500], [900, 900]], dtype=np.float64)
+
+        distances, gate = gated_distances(centers, radii, new_centers)
+        pairs = sorted(gated_assignment(distances, gate))
+
+        self.assertEqual(pairs, [(0, 1), (1, 0), (2, 2)])
+
+    def test_more_tracks_than_detections(self):
+        centers = np.array([[0, 0], [4, 0], [8, 0]], dtype=np.float64)
+        radii = np.array([20, 20, 20], dtype=np.float64)
+        new_centers = np.array([[7, 0]], dtype=np.float64)
+
+        distances, gate = gated_distances(centers, radii, new_centers)
+
+        self.assertEqual(gated_assignment(distances, gate), [(2, 0)])
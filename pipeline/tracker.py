@@ -1,19 +1,67 @@
+import numpy as np
 from primitives import constants
 
 from copy import deepcopy
+from scipy.optimize import linear_sum_assignment
+from scipy.sparse import bmat, csr_matrix
+from scipy.sparse.csgraph import connected_components
 from primitives.optical_flow import OpticalFlow
-from munkres import Munkres
 from pipeline.base.pipeline import is_frequency, ThreadedPipeBlock
 from repositories.tracked_object_repository import TrackedObjectsRepository
 
 
-def transpose_matrix(matrix):
+def gated_distances(centers, radii, new_centers) -> (np.ndarray, np.ndarray):
     """
-    :param matrix: matrix to transpose
-    :return: transposed matrix
+    Computes distances between all pairs of tracked and detected centers. Pair is allowed only if detected center
+    is in radius around tracked center.
+
+    :param centers: array of tracked centers (N x 2)
+    :param radii: array of radii around tracked centers (N)
+    :param new_centers: array of detected centers (M x 2)
+    :return: matrix of distances (N x M), boolean matrix of allowed pairs (N x M)
+    """
+
+    differences = centers[:, np.newaxis, :] - new_centers[np.newaxis, :, :]
+    distances = np.sqrt(np.sum(differences * differences, axis=2))
+
+    return distances, distances < radii[:, np.newaxis]
+
+
+def gated_assignment(distances, gate) -> [(int, int)]:
+    """
+    Solves assignment problem for allowed pairs only. Allowed pairs split the problem into independent connected
+    components (groups of tracked and detected objects close to each other), each of them is solved separately.
+
+    :param distances: matrix of distances (N x M)
+    :param gate: boolean matrix of allowed pairs (N x M)
+    :return: list of assigned pairs (tracked index, detected index)
     """
 
-    return list(map(list, zip(*matrix)))
+    rows_count, columns_count = gate.shape
+
+    if not gate.any():
+        return []
+
+    adjacency = csr_matrix(gate)
+    graph = bmat([[None, adjacency], [adjacency.transpose(), None]])
+    _, labels = connected_components(graph, directed=False)
+
+    row_labels = labels[:rows_count]
+    column_labels = labels[rows_count:]
+
+    pairs = []
+    for label in np.unique(row_labels[gate.any(axis=1)]):
+        rows = np.flatnonzero(row_labels == label)
+        columns = np.flatnonzero(column_labels == label)
+
+        component_gate = gate[np.ix_(rows, columns)]
+        component_distances = np.where(component_gate, distances[np.ix_(rows, columns)], constants.TRACKER_DISALLOWED)
+
+        for row, column in zip(*linear_sum_assignment(component_distances)):
+            if component_gate[row, column]:
+                pairs.append((rows[row], columns[column]))
+
+    return pairs
 
 
 class Tracker(ThreadedPipeBlock):
@@ -38,8 +86,6 @@ class Tracker(ThreadedPipeBlock):
         self._tracked_object_repository = TrackedObjectsRepository(info)
         self._optical_flow = OpticalFlow(info, self._tracked_object_repository)
 
-        self._munkres = Munkres()
-
     def _mode_changed(self, new_mode):
         """
         On mode changed clears all tracked objects
@@ -53,22 +99,29 @@ class Tracker(ThreadedPipeBlock):
 
     def _step(self, seq):
         """
-        On every step new detections are read - if possible. Then predicted position is computed on each tracked
-        object instance using Kalman filter. Optical flow is used as secondary mesurement.
-        Detection are assigned to existing instances of tracked object using hungarian algorithm
+        On every step predicted position is computed on each tracked object instance using Kalman filter.
+        Optical flow is used as secondary mesurement. If detection scheduler selected current frame for detection,
+        new detections are read and assigned to existing instances of tracked object using hungarian algorithm.
         New detected instances are added to Tracked object repository.
+        Activity of tracked objects is reported to detection scheduler.
 
         :param seq: current sequence number
         """
 
-        if is_frequency(seq, constants.DETECTOR_CAR_FREQUENCY):
-            self._update_from_detector(seq)
+        _, new_frame, detect = self.receive(pipe_id=constants.FRAME_LOADER_ID)
 
-        else:
-            self._update_from_predictor(seq)
+        self._update_from_predictor(new_frame)
+
+        if detect:
+            self._update_from_detector(self.receive(pipe_id=constants.DETECTOR_CAR_ID))
 
         self._tracked_object_repository.control_boxes(mode=self._mode)
 
+        tracker_points = self._tracked_object_repository.tracker_points
+        self._info.detection_scheduler.report_tracks(
+            distances_to_line=self._info.corridors_repository.stop_line_distances(tracker_points),
+            velocities=self._tracked_object_repository.velocities)
+
         if is_frequency(seq, constants.CALIBRATOR_FREQUENCY):
             self._send_message(target=constants.CALIBRATOR_ID,
                                sequence_number=seq,
@@ -86,6 +139,7 @@ class Tracker(ThreadedPipeBlock):
         """
         Helper method for sending messages to output PipeBlocks
         depending on target receiver it generates certain message and sends it using send() method.
+        Message is not generated at all if the receiver is not connected.
 
         :param target: targeted receiver
         :param sequence_number: current sequence number
@@ -94,6 +148,9 @@ class Tracker(ThreadedPipeBlock):
 
         message = None
 
+        if target not in self._output:
+            return
+
         if target == constants.VIDEO_PLAYER_ID:
             serialized_tracked_objects = self._tracked_object_repository.serialize()
             tracked_object_lifelines = self._tracked_object_repository.lifelines
@@ -101,11 +158,12 @@ class Tracker(ThreadedPipeBlock):
             message = sequence_number, serialized_tracked_objects, tracked_object_lifelines, flows
 
         elif target == constants.CALIBRATOR_ID:
-            outer_masks = self._tracked_object_repository.all_boxes_mask(area_size="outer")
-            outer_masks_no_border = self._tracked_object_repository.all_boxes_mask(area_size="small-outer")
+            centers = self._tracked_object_repository.centers
+            radii = self._tracked_object_repository.areas(area_size="outer")
+            radii_no_border = self._tracked_object_repository.areas(area_size="small-outer")
             lifelines = deepcopy(self._tracked_object_repository.lifelines)
 
-            message = sequence_number, outer_masks, outer_masks_no_border, lifelines
+            message = sequence_number, centers, radii, radii_no_border, lifelines
 
         elif target == constants.OBSERVER_ID:
             serialized_tracked_objects = self._tracked_object_repository.serialize()
@@ -115,41 +173,37 @@ class Tracker(ThreadedPipeBlock):
         if message is not None:
             self.send(message, pipe_id=target, block=block)
 
-    def _update_from_detector(self, sequence_number) -> None:
+    def _update_from_detector(self, detected_objects) -> None:
         """
         Updates position of tracked objects by using detected objects.
         For assigning problem is called hungarian_method(). For unassigned detections are generated new tracked object
         instances.
 
-        :param sequence_number: current sequnce number
+        :param detected_objects: objects detected on current frame
         """
 
-        detected_objects = self.receive(pipe_id=constants.DETECTOR_CAR_ID)
-
-        self._update_from_predictor(sequence_number)
-
         if self._tracked_object_repository.count():
             self._hungarian_method(detected_objects)
 
-        else:
-            for detected_object in detected_objects:
-                coordinates, size, confident_score, class_id = detected_object
+        elif len(detected_objects):
+            centers = [(coordinates.x, coordinates.y) for coordinates, _, _, _ in detected_objects]
 
-                if coordinates in self._info.update_area:
+            for detected_object, in_area in zip(detected_objects, self._info.update_area.contains_many(centers)):
+                if in_area:
                     self._tracked_object_repository.new_tracked_object(*detected_object)
 
-    def _update_from_predictor(self, sequence_number) -> None:
+    def _update_from_predictor(self, new_frame) -> None:
         """
         Updates position by using predictor on each instance of tracked object.
 
-        :param sequence_number: current sequence number
+        :param new_frame: current frame used for optical flow, None if optical flow is not computed on this frame
         """
 
         self._tracked_object_repository.predict()
 
-        if is_frequency(sequence_number, constants.TRACKER_OPTICAL_FLOW_FREQUENCY):
-            _, new_frame = self.receive(pipe_id=constants.FRAME_LOADER_ID)
-            self._optical_flow.update(new_frame)
+        if new_frame is not None:
+            self._optical_flow.update(new_frame.image)
+            new_frame.release()
 
             # image = np.copy(new_frame)
             # cv2.imwrite("optical_flow.png", OpticalFlow.draw(image, self._optical_flow.serialize()))
@@ -159,53 +213,35 @@ class Tracker(ThreadedPipeBlock):
         Solves position assigning problem.
         Modification: doesnt allow to assigne position which are too far away from each other.
         Assigned positions are updated by new detected.
-        Unassigned are generated if some conditions are met.
+        Detections which are not close to any tracked object are generated if some conditions are met.
 
         :param detected_boxes: detect boxes by detector
         """
 
-        matrix = []
-        for old_object in self._tracked_object_repository.list:
-            row = []
-            for new_box in detected_boxes:
-                new_coordinates, new_size, new_score, _ = new_box
-
-                if old_object.in_radius(new_coordinates):
-                    row.append(old_object.center.distance(new_coordinates))
-                else:
-                    row.append(constants.TRACKER_DISALLOWED)
-
-            matrix.append(row)
-
-        indexes = self._munkres.compute(matrix)
-        detected_boxes_copy = detected_boxes[:]
-
-        for index, row in enumerate(transpose_matrix(matrix)):
-            if sum(row) != constants.TRACKER_DISALLOWED * len(row):
-                detected_boxes.remove(detected_boxes_copy[index])
-
-        for old_index, new_index in indexes:
+        tracked_objects = self._tracked_object_repository.list
 
-            value = matrix[old_index][new_index]
+        if not len(detected_boxes):
+            return
 
-            if value < constants.TRACKER_DISALLOWED:
-                old_box = self._tracked_object_repository.list[old_index]
-                new_box = detected_boxes_copy[new_index]
+        new_centers = np.array([(new_box[0].x, new_box[0].y) for new_box in detected_boxes], dtype=np.float64)
 
-                try:
-                    detected_boxes.remove(new_box)
-                except ValueError:
-                    pass
+        distances, gate = gated_distances(centers=self._tracked_object_repository.centers,
+                                          radii=self._tracked_object_repository.radii,
+                                          new_centers=new_centers)
 
-                new_coordinates, size, score, _ = new_box
-                old_box.update_position(size, score, new_coordinates)
+        assigned_objects = []
+        measurements = []
 
-        for new_box in detected_boxes:
-            if new_box[2] > constants.TRACKER_MINIMAL_SCORE:
-                coordinates, size, confident_score, _ = new_box
+        for old_index, new_index in gated_assignment(distances, gate):
+            new_coordinates, size, score, _ = detected_boxes[new_index]
 
-                if coordinates in self._info.update_area:
-                    self._tracked_object_repository.new_tracked_object(*new_box)
+            assigned_objects.append(tracked_objects[old_index])
+            measurements.append((size, score, new_coordinates))
 
+        self._tracked_object_repository.update_positions(assigned_objects, measurements)
 
+        in_area = self._info.update_area.contains_many(new_centers)
 
+        for index, new_box in enumerate(detected_boxes):
+            if not gate[:, index].any() and new_box[2] > constants.TRACKER_MINIMAL_SCORE and in_area[index]:
+                self._tracked_object_repository.new_tracked_object(*new_box)
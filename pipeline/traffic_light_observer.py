@@ -26,6 +26,7 @@ class TrafficLightsObserver(ThreadedPipeBlock):
         self._state_values = [0, 0, 0]
 
         self._previous_frame = np.zeros(shape=(info.height, info.width, 3), dtype=np.uint8)
+        self._previous_shared_frame = None
         self._state_candidate = None
         self._state_candidate_count = 0
 
@@ -54,8 +55,16 @@ class TrafficLightsObserver(ThreadedPipeBlock):
 
         loader_seq, new_frame = self.receive(pipe_id=constants.FRAME_LOADER_ID)
 
-        new_status = self.status(current_frame=new_frame, previous_frame=self._previous_frame)
-        self._previous_frame = new_frame
+        new_status = self.status(current_frame=new_frame.image, previous_frame=self._previous_frame)
+        self._previous_frame = new_frame.image
+
+        # previous frame is kept referenced until it is replaced by the next one
+        if self._previous_shared_frame is not None:
+            self._previous_shared_frame.release()
+
+        self._previous_shared_frame = new_frame
+
+        self._info.detection_scheduler.report_light(new_status)
 
         message = seq, new_status
 
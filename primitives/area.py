@@ -2,7 +2,8 @@ import cv2
 import numpy as np
 from primitives import constants
 
-from primitives.line import Line
+from primitives.coordinates import Coordinates
+from primitives.line import Line, NoIntersectionError
 
 
 class Area:
@@ -34,6 +35,8 @@ class Area:
                                point2=self._bot_right)
 
         self._info = info
+        self._half_planes = None
+        self._bounding_rect = None
 
     @property
     def middle_point(self):
@@ -69,6 +72,54 @@ class Area:
         self.right_line = right_line if right_line is not None else self.right_line
         self.left_line = left_line if left_line is not None else self.left_line
 
+        self._half_planes = None
+        self._bounding_rect = None
+
+    @property
+    def half_planes(self):
+        """
+        Coefficients of general equations of top, bottom, right and left line compiled for fast membership tests.
+        They are compiled only once after each change of area.
+
+        :return: coefficients (4 x 3), None if some boundary line can not be used (area is not defined or top/bottom
+        line is vertical or right/left line is horizontal)
+        """
+
+        if self._half_planes is None:
+            lines = [self.top_line, self.bottom_line, self.right_line, self.left_line]
+            coefficients = np.array([line.general_equation() for line in lines], dtype=np.float64)
+
+            regular = coefficients[0:2, 1].all() and coefficients[2:4, 0].all()
+            self._half_planes = coefficients if regular else False
+
+        return self._half_planes if self._half_planes is not False else None
+
+    @property
+    def bounding_rect(self):
+        """
+        Bounding rectangle of area clipped by image borders. It is computed only once after each change of area.
+
+        :return: x, y, width, height of rectangle, whole image if corners of area can not be found
+        """
+
+        if self._bounding_rect is None:
+            try:
+                corners = np.array([horizontal.intersection(vertical)
+                                    for horizontal in [self.top_line, self.bottom_line]
+                                    for vertical in [self.left_line, self.right_line]])
+
+            except NoIntersectionError:
+                corners = np.array([[0, 0], [self._info.width, self._info.height]])
+
+            image_size = [self._info.width, self._info.height]
+
+            x_min, y_min = np.clip(np.floor(corners.min(axis=0)), 0, image_size)
+            x_max, y_max = np.clip(np.ceil(corners.max(axis=0)), 0, image_size)
+
+            self._bounding_rect = int(x_min), int(y_min), int(x_max - x_min), int(y_max - y_min)
+
+        return self._bounding_rect
+
     def draw(self, image, color=constants.COLOR_AREA):
         """
         Helper function to draw an area
@@ -94,6 +145,53 @@ class Area:
         if not self.defined:
             return False
 
+        half_planes = self.half_planes
+
+        if half_planes is None:
+            return self._contains_by_lines(coordinates)
+
+        x = coordinates.x
+        y = coordinates.y
+
+        (top_a, top_b, top_c), (bot_a, bot_b, bot_c), (right_a, right_b, right_c), (left_a, left_b, left_c) = half_planes
+
+        return ((-top_a) * x - top_c) / top_b <= y <= ((-bot_a) * x - bot_c) / bot_b and \
+               ((-left_b) * y - left_c) / left_a <= x <= ((-right_b) * y - right_c) / right_a
+
+    def contains_many(self, points):
+        """
+        Vectorized version of membership test.
+
+        :param points: array of points (N x 2) in form x, y
+        :return: boolean array (N) if points are inside of area
+        """
+
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+        if not self.defined:
+            return np.zeros(shape=len(points), dtype=bool)
+
+        half_planes = self.half_planes
+
+        if half_planes is None:
+            return np.array([self._contains_by_lines(Coordinates(x, y)) for x, y in points], dtype=bool)
+
+        x = points[:, 0]
+        y = points[:, 1]
+
+        top, bottom, right, left = half_planes
+
+        return ((((-top[0]) * x - top[2]) / top[1] <= y) & (y <= ((-bottom[0]) * x - bottom[2]) / bottom[1]) &
+                (((-left[1]) * y - left[2]) / left[0] <= x) & (x <= ((-right[1]) * y - right[2]) / right[0]))
+
+    def _contains_by_lines(self, coordinates):
+        """
+        Membership test computed directly from boundary lines.
+
+        :param coordinates: selected coordinates
+        :return: if coordinates are inside of area
+        """
+
         if self.top_line.find_coordinate(x=coordinates.x)[1] > coordinates.y:
             return False
 
@@ -21,9 +21,21 @@ TRAFFIC_LIGHT_OBSERVER_ID = 8
 VIDEO_WRITER_ID = 9
 VIOLATION_WRITER_ID = 10
 
+# pipeline
+PIPELINE_PROCESS_BLOCKS = []                # IDs of pipe blocks computed in own process instead of own thread,
+                                            # only DETECTOR_CAR_ID receives calibration found after the fork
+PIPELINE_THREAD_BLOCKS = [FRAME_LOADER_ID,  # IDs of pipe blocks updating shared InputInfo (detection scheduler,
+                          TRACKER_ID,       # vanishing points, corridors), those can not be computed in own process
+                          CALIBRATOR_ID,
+                          OBSERVER_ID,
+                          TRAFFIC_LIGHT_OBSERVER_ID]
+
+# telemetry
+TELEMETRY_LATENCY_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1]  # step latency buckets (s)
+TELEMETRY_INTERVAL = 5                      # seconds between writes of telemetry file
+
 # traffic violation writer
 VIOLATION_WRITER_FREQUENCY = 1
-VIOLATION_WRITER_SEQUENCE_LENGTH = 30
 
 # calibrator
 CALIBRATOR_FREQUENCY = 50                   # calibrator runs on every N frame
@@ -43,11 +55,30 @@ CORRIDORS_STOP_LINE_OFFSET = 20             # offset of stop line - assuming tha
 CORRIDORS_LINE_SELECTOR_THICKNESS = 3       # thickness used for drawing lines while user selection
 
 # detector
-DETECTOR_CAR_FREQUENCY = 3                  # detector runs on every N frame
+DETECTOR_CAR_FREQUENCY = 3                  # detector runs on every N frame (default interval of scheduler)
+DETECTOR_CAR_MIN_INTERVAL = 1               # detector interval when light turns orange or car is close to stop line
+DETECTOR_CAR_MAX_INTERVAL = 6               # detector interval when corridors are empty or traffic stands still
+DETECTOR_CAR_ADAPTIVE = True                # if detector interval adapts to scene activity in detection mode
+DETECTOR_CAR_STOP_LINE_DISTANCE = 60        # pixels in front of stop line where cars are watched closely
+DETECTOR_CAR_STILL_VELOCITY = 0.5           # max optical flow (pixels per frame) of car considered as standing
 DETECTOR_CAR_CLASSES_IDS = [2, 3, 4, 6, 8]  # IDs of classes detected by detector used in this project
 DETECTOR_MINIMAL_SCORE = 0.1                # minimal score of detected class while care detection is done
 DETECTOR_LIGHT_MINIMAL_SCORE = 0.5          # minimal score of traffic light detection
 DETECTOR_IMAGE_WIDTH = 640                  # width of image passed to detector
+DETECTOR_BATCH_SIZE = 1                     # max number of frames passed to detector in one inference, see --detector-batch-size
+DETECTOR_BATCH_TIMEOUT = 0.05               # max seconds to wait for frames to fill the batch
+DETECTOR_ROI_MARGIN = 20                    # pixels added around region of interest cropped before detection
+DETECTOR_SERVICE_BATCH_SIZE = 8             # max number of frames of all streams passed to detector in one inference
+DETECTOR_SERVICE_BATCH_TIMEOUT = 0.02       # max seconds to wait for frames of other streams to fill the batch
+
+DETECTOR_CAR_INPUT_SIZE = (300, 300)        # size of car detector network input used by OpenCV backend
+DETECTOR_LIGHT_INPUT_SIZE = None            # size of light detector network input used by OpenCV backend, None = image
+
+# model registry
+MODEL_BACKEND = "tensorflow"                # engine running detection models, "tensorflow", "opencv" or "fake"
+MODEL_INTRA_OP_THREADS = 0                  # threads used inside one operation by all models, 0 means system default
+MODEL_INTER_OP_THREADS = 0                  # threads used for independent operations by all models, 0 means default
+MODEL_OPENCV_THREADS = 0                    # threads used by OpenCV backend, 0 means system default
 
 # tracker
 TRACKER_OPTICAL_FLOW_FREQUENCY = 1          # tracker runs on every N frame
@@ -66,10 +97,17 @@ VIDEO_PLAYER_SPEED = 10                     # N milliseconds pause between step
 # video writer
 VIDEO_WRITER_FREQUENCY = 1                  # video writer runs on every N frame
 VIDEO_WRITER_HISTORY = 20                   # number of frames before and after violation to be recorded
+VIDEO_WRITER_ENCODER_WORKERS = 2            # number of threads encoding violation clips
+VIDEO_WRITER_ENCODER_QUEUE_SIZE = 64        # maximal number of frames waiting for each encoding thread
+VIDEO_WRITER_ENCODER_POLICY = "drop"        # "drop" drops the frame when encoder queue is full, "block" waits for encoder
 
 # frame loader
 FRAME_LOADER_MAX_WIDTH = 1100               # maximal width of images - used for rescale
 FRAME_LOADER_MAX_FPS = 20                   # maximal FPS for video writer - otherwise is lowered
+FRAME_LOADER_BUFFER_SLOTS = 32              # number of preallocated frames shared by all receivers of frame loader
+FRAME_LOADER_READ_AHEAD = 8                 # number of frames decoded ahead of frame loader
+LIVE_SOURCE_DEFAULT_FPS = 25                # fps of live stream which does not provide it
+FRAME_CACHE_SIZE = 1000                     # maximal number of decoded frames stored in on-disk frame cache
 
 # optical flow
 OPTICAL_FLOW_GRID_DENSITY = 5               # density of dense optical flow grid used for vehicle tracking
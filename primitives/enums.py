@@ -9,6 +9,7 @@ class CalibrationMode(Enum):
     LIGHTS_MANUAL = 1
     CORRIDORS_MANUAL = 2
     MANUAL = 3
+    LOADED = 4
 
     def __str__(self):
         return self.name.lower()
@@ -92,6 +92,15 @@ class Line:
 
         return Line((1, 0), (0, 0))
 
+    @staticmethod
+    def deserialize(data):
+        """
+        :param data: line serialized by serialize()
+        :return: new line
+        """
+
+        return Line(point1=data["origin"], direction=data["direction"])
+
     def __init__(self, point1, point2=None, direction=None):
         """
         Two ways to generate new line: select both points or select first point and direction vector.
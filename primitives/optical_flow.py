@@ -57,11 +57,9 @@ class OpticalFlow:
 
         self._tracked_objects_repository = tracked_objects_repository
         self._info = info
-        self._doter = np.zeros(shape=(info.height, info.width), dtype=np.uint8)
 
-        for x in range(int(info.width / constants.OPTICAL_FLOW_GRID_DENSITY)):
-            for y in range(int(info.height / constants.OPTICAL_FLOW_GRID_DENSITY)):
-                self._doter[y * constants.OPTICAL_FLOW_GRID_DENSITY][x * constants.OPTICAL_FLOW_GRID_DENSITY] = 255
+        self._grid_width = int(info.width / constants.OPTICAL_FLOW_GRID_DENSITY)
+        self._grid_height = int(info.height / constants.OPTICAL_FLOW_GRID_DENSITY)
 
     @property
     def tracked_point_count(self):
@@ -79,17 +77,9 @@ class OpticalFlow:
         """
 
         new_frame_gray = cv2.cvtColor(new_frame, cv2.COLOR_RGB2GRAY)
-        mask_for_detection = np.zeros_like(new_frame_gray)
 
         if self._previous_image is not None:
 
-            for tracked_object in self._tracked_objects_repository.list:
-                cv2.circle(img=mask_for_detection,
-                           center=tracked_object.center.tuple(),
-                           radius=tracked_object.area("outer"),
-                           color=constants.COLOR_WHITE_MONO,
-                           thickness=constants.FILL)
-
             if self.tracked_point_count:
                 moved_grid, st, err = cv2.calcOpticalFlowPyrLK(prevImg=self._previous_image,
                                                                nextImg=new_frame_gray,
@@ -106,20 +96,14 @@ class OpticalFlow:
         self._previous_image = new_frame_gray
         self._features_to_track = np.zeros(shape=(0, 1, 2), dtype=np.float32)
 
-        if self._tracked_objects_repository.count:
-            mask = self._tracked_objects_repository.all_boxes_mask(area_size="inner")
-            out_masked = cv2.bitwise_and(self._doter, mask)
-
-            nonzero = cv2.findNonZero(out_masked)
-
-            self._features_to_track = nonzero
-            for tracked_object in self._tracked_objects_repository.list:
-                tracked_object.update_flow(self._old_positions, self._new_positions)
+        if self._tracked_objects_repository.count():
+            self._features_to_track = self._tracked_objects_repository.grid_points(density=constants.OPTICAL_FLOW_GRID_DENSITY,
+                                                                                   width=self._grid_width,
+                                                                                   height=self._grid_height,
+                                                                                   area_size="inner")
 
-            try:
-                self._features_to_track = np.unique(self._features_to_track, axis=0)
-            except np.AxisError:
-                self._features_to_track = np.zeros(shape=(0, 1, 2), dtype=np.float32)
+            flows = self._tracked_objects_repository.extract_flows(self._old_positions, self._new_positions)
+            self._tracked_objects_repository.update_flows(flows)
 
     def serialize(self) -> ([], []):
         """
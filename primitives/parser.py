@@ -1,5 +1,8 @@
+import copy
 import getopt
 
+from primitives import constants
+
 
 class ParametersError(Exception):
     pass
@@ -16,7 +19,10 @@ class InputParser:
         """
 
         try:
-            opts, args = getopt.getopt(argv, "lc", ["light", "corridors", "input=", "output="])
+            opts, args = getopt.getopt(argv, "lc", ["light", "corridors", "input=", "output=", "encoder-policy=",
+                                                       "frame-cache=", "calibration=", "backend=",
+                                                       "headless", "telemetry=", "telemetry-port=",
+                                                       "detector-batch-size="])
 
         except getopt.GetoptError:
             raise ParametersError
@@ -24,7 +30,17 @@ class InputParser:
         self._light = False
         self._corridors = False
         self._input = None
+        self._inputs = []
         self._output = None
+        self._encoder_policy = constants.VIDEO_WRITER_ENCODER_POLICY
+        self._frame_cache = None
+        self._calibration = None
+        self._calibrations = []
+        self._backend = constants.MODEL_BACKEND
+        self._headless = False
+        self._telemetry = None
+        self._telemetry_port = None
+        self._detector_batch_size = constants.DETECTOR_BATCH_SIZE
 
         for opt, arg in opts:
 
@@ -35,11 +51,49 @@ class InputParser:
                 self._corridors = True
 
             if opt in "--input":
-                self._input = arg
+                self._inputs.append(arg)
+                self._input = self._inputs[0]
 
             if opt in "--output":
                 self._output = arg
 
+            if opt == "--encoder-policy":
+                self._encoder_policy = arg
+
+            if opt == "--frame-cache":
+                self._frame_cache = arg
+
+            if opt == "--calibration":
+                self._calibrations.append(arg)
+                self._calibration = self._calibrations[0]
+
+            if opt == "--backend":
+                self._backend = arg
+
+            if opt == "--headless":
+                self._headless = True
+
+            if opt == "--telemetry":
+                self._telemetry = arg
+
+            if opt == "--telemetry-port":
+                try:
+                    self._telemetry_port = int(arg)
+                except ValueError:
+                    raise ParametersError
+
+                if not 1 <= self._telemetry_port <= 65535:
+                    raise ParametersError
+
+            if opt == "--detector-batch-size":
+                try:
+                    self._detector_batch_size = int(arg)
+                except ValueError:
+                    raise ParametersError
+
+                if self._detector_batch_size < 1:
+                    raise ParametersError
+
     @property
     def insert_light(self):
         """
@@ -64,6 +118,14 @@ class InputParser:
 
         return self._input
 
+    @property
+    def input_videos(self):
+        """
+        :return: paths of all input videos, each of them is examined by own stream
+        """
+
+        return self._inputs
+
     @property
     def output_dir(self):
         """
@@ -71,3 +133,91 @@ class InputParser:
         """
 
         return self._output
+
+    @property
+    def encoder_policy(self):
+        """
+        :return: policy of violation video encoder when it can not keep up, "block" or "drop"
+        """
+
+        return self._encoder_policy
+
+    @property
+    def frame_cache(self):
+        """
+        :return: path of file used for caching of decoded frames, None if frames should not be cached
+        """
+
+        return self._frame_cache
+
+    @property
+    def calibration(self):
+        """
+        :return: path of calibration file written by previous computation, None if scene should be calibrated
+        """
+
+        return self._calibration
+
+    @property
+    def backend(self):
+        """
+        :return: engine running detection models, "tensorflow", "opencv" or "fake"
+        """
+
+        return self._backend
+
+    @property
+    def headless(self):
+        """
+        :return: if computation runs without video player (no window, no drawing), always when more inputs are given
+        """
+
+        return self._headless or len(self._inputs) > 1
+
+    @property
+    def telemetry(self):
+        """
+        :return: path of file telemetry is periodically written to (JSON for .json suffix, Prometheus text otherwise),
+        None if it should not be written
+        """
+
+        return self._telemetry
+
+    @property
+    def telemetry_port(self):
+        """
+        :return: local port telemetry is served on, None if it should not be served
+        """
+
+        return self._telemetry_port
+
+    @property
+    def detector_batch_size(self):
+        """
+        :return: maximal number of frames passed to car detector in one inference
+        """
+
+        return self._detector_batch_size
+
+    def stream_arguments(self, index):
+        """
+        Program arguments of one stream when more input videos are given. Calibration files are assigned to inputs
+        in the same order, frame cache file is suffixed by index of stream and output of stream is written into
+        subdirectory named by index of stream, so inputs with the same file name do not overwrite each other.
+
+        :param index: index of input video
+        :return: copy of program arguments containing only selected input video
+        """
+
+        arguments = copy.copy(self)
+
+        arguments._input = self._inputs[index]
+        arguments._calibration = self._calibrations[index] if index < len(self._calibrations) else None
+
+        if self._frame_cache is not None and len(self._inputs) > 1:
+            arguments._frame_cache = f"{self._frame_cache}.{index}"
+
+        if self._output is not None and len(self._inputs) > 1:
+            arguments._output = f"{self._output}/{index}"
+
+        return arguments
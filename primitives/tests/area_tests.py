@@ -0,0 +1,62 @@
+import unittest
+import numpy as np
+
+from primitives.area import Area
+from primitives.coordinates import Coordinates
+from primitives.line import Line
+
+
+class InfoStub:
+    width = 640
+    height = 480
+
+
+class AreaTests(unittest.TestCase):
+    def setUp(self):
+        self.area = Area(info=InfoStub(),
+                         top_left=Coordinates(0, 120),
+                         top_right=Coordinates(640, 160),
+                         bottom_right=Coordinates(640, 480),
+                         bottom_left=Coordinates(0, 480))
+
+        self.points = [(x, y) for x in range(-20, 661, 17) for y in range(-20, 501, 13)] + [(0, 120), (640, 480)]
+
+    def assert_same_as_lines(self):
+        contains_many = self.area.contains_many(self.points)
+
+        for (x, y), contained in zip(self.points, contains_many):
+            coordinates = Coordinates(x, y)
+            expected = self.area._contains_by_lines(coordinates)
+
+            self.assertEqual(coordinates in self.area, expected)
+            self.assertEqual(contained, expected)
+
+    def test_contains(self):
+        self.assertIn(Coordinates(320, 300), self.area)
+        self.assertNotIn(Coordinates(320, 100), self.area)
+        self.assert_same_as_lines()
+
+    def test_change_area(self):
+        self.area.half_planes
+
+        self.area.change_area(top_line=Line((0, 300), (640, 200)),
+                              right_line=Line((600, 0), (500, 480)))
+
+        self.assertNotIn(Coordinates(320, 200), self.area)
+        self.assert_same_as_lines()
+
+    def test_irregular_area(self):
+        self.area.change_area(top_line=Line((200, 0), (200, 480)))
+
+        self.assertIsNone(self.area.half_planes)
+        self.assertTrue(np.array_equal(self.area.contains_many(np.zeros(shape=(0, 2))), []))
+
+    def test_bounding_rect(self):
+        self.assertEqual(self.area.bounding_rect, (0, 120, 640, 360))
+
+        self.area.change_area(top_line=Line((0, 200), (640, 200)),
+                              right_line=Line((600, 0), (600, 480)))
+        self.assertEqual(self.area.bounding_rect, (0, 200, 600, 280))
+
+        self.area.change_area(top_line=Line((200, 0), (200, 480)))
+        self.assertEqual(self.area.bounding_rect, (0, 0, 640, 480))
@@ -0,0 +1,55 @@
+import unittest
+
+from primitives import constants
+from primitives.parser import InputParser, ParametersError
+
+
+class InputParserTests(unittest.TestCase):
+    def test_single_input(self):
+        arguments = InputParser(["--input=videos/a.mp4", "--output=out", "--calibration=a.json"])
+
+        self.assertEqual((arguments.input_video, arguments.output_dir), ("videos/a.mp4", "out"))
+        self.assertEqual(arguments.input_videos, ["videos/a.mp4"])
+        self.assertEqual(arguments.calibration, "a.json")
+        self.assertFalse(arguments.headless)
+        self.assertEqual(arguments.detector_batch_size, constants.DETECTOR_BATCH_SIZE)
+
+    def test_detector_batch_size(self):
+        arguments = InputParser(["--input=videos/a.mp4", "--detector-batch-size=4"])
+
+        self.assertEqual(arguments.detector_batch_size, 4)
+
+        for batch_size in ["four", "0", "-1"]:
+            with self.assertRaises(ParametersError):
+                InputParser(["--input=videos/a.mp4", f"--detector-batch-size={batch_size}"])
+
+    def test_telemetry_port(self):
+        arguments = InputParser(["--input=videos/a.mp4", "--telemetry-port=9100"])
+
+        self.assertEqual(arguments.telemetry_port, 9100)
+
+        for port in ["http", "0", "65536"]:
+            with self.assertRaises(ParametersError):
+                InputParser(["--input=videos/a.mp4", f"--telemetry-port={port}"])
+
+    def test_stream_arguments(self):
+        arguments = InputParser(["--input=videos/a.mp4", "--input=videos/b.mp4", "--output=out",
+                                 "--calibration=a.json", "--frame-cache=cache.raw"])
+
+        self.assertTrue(arguments.headless)
+
+        first = arguments.stream_arguments(0)
+        second = arguments.stream_arguments(1)
+
+        self.assertEqual((first.input_video, first.calibration, first.frame_cache), ("videos/a.mp4", "a.json", "cache.raw.0"))
+        self.assertEqual((second.input_video, second.calibration, second.frame_cache), ("videos/b.mp4", None, "cache.raw.1"))
+        self.assertEqual((first.output_dir, second.output_dir), ("out/0", "out/1"))
+        self.assertTrue(second.headless)
+        self.assertEqual((arguments.input_video, arguments.output_dir), ("videos/a.mp4", "out"))
+
+    def test_single_stream_arguments(self):
+        arguments = InputParser(["--input=videos/a.mp4", "--output=out", "--frame-cache=cache.raw"])
+
+        stream = arguments.stream_arguments(0)
+
+        self.assertEqual((stream.output_dir, stream.frame_cache), ("out", "cache.raw"))
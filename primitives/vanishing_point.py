@@ -96,6 +96,15 @@ class VanishingPoint:
     def __str__(self):
         return f"Vanishing Point - x: {self._point[0]} y: {self._point[1]}"
 
+    @staticmethod
+    def deserialize(data):
+        """
+        :param data: vanishing point serialized by serialize()
+        :return: new vanishing point
+        """
+
+        return VanishingPoint(point=data["point"], direction=data["direction"])
+
     def serialize(self):
         """
         Serializes vanishing point
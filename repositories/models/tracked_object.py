@@ -48,7 +48,8 @@ KALMAN_MESUREMENT_NOISE_COV = np.array([
 class TrackedObject:
     """
     Represents one tracked object
-    Uses Kalman Filter to predict his position. Two possible mesurement are allowed -> position and velocity.
+    It is a view into arrays of TrackedObjectsRepository, which predicts positions of all tracked objects at once
+    using Kalman Filter. Two possible mesurement are allowed -> position and velocity.
     Stores history of center points to construct trajectories.
     """
 
@@ -91,38 +92,27 @@ class TrackedObject:
 
         return filtered
 
-    def __init__(self, coordinates, size, confident_score, info, object_id):
+    def __init__(self, repository, index, confident_score, info, object_id):
+        """
+        :param repository: TrackedObjectsRepository holding state of this tracked object
+        :param index: index of this tracked object in arrays of repository
+        :param confident_score: how certain we are about this object
+        :param info: instance of InputInfo
+        :param object_id: id of tracked object
+        """
 
         super().__init__()
 
         self._id = object_id
-        self._velocity = 0
-
-        self._reference_object_size = self._current_size = size
-        self._reference_coordinates = coordinates
+        self._repository = repository
+        self.index = index
 
         self.score = confident_score
-
         self._info = info
-        self._kalman = cv2.KalmanFilter(4, 4)
 
         self.lifetime = constants.TRACKER_LIFETIME
 
-        self._kalman.transitionMatrix = KALMAN_TRANSITION_MATRIX
-        self._kalman.measurementMatrix = KALMAN_MESUREMENT_POSITION_MATRIX
-        self._kalman.processNoiseCov = KALMAN_PROCESS_NOISE_COV
-
-        self._kalman.measurementNoiseCov = KALMAN_MESUREMENT_NOISE_COV
-
-        self._kalman.statePost = np.array([
-            [np.float32(coordinates.x)],  # x-coord
-            [np.float32(coordinates.y)],  # y-coord
-            [np.float32(0)],  # dx
-            [np.float32(0)],  # dy
-        ])
-
         self._history = [self.center.tuple()]
-        self._flow = None
 
     @property
     def flow(self):
@@ -130,7 +120,9 @@ class TrackedObject:
         :return: pixel flow of tracked object from last mesurement
         """
 
-        return self.center.tuple(), self._kalman.statePost[2][0], self._kalman.statePost[3][0]
+        state = self._repository.states[self.index]
+
+        return self.center.tuple(), state[2], state[3]
 
     @property
     def history(self):
@@ -169,7 +161,9 @@ class TrackedObject:
         :return: center Coordinates of trakced object
         """
 
-        return Coordinates(int(self._kalman.statePost[0][0]), int(self._kalman.statePost[1][0]))
+        state = self._repository.states[self.index]
+
+        return Coordinates(int(state[0]), int(state[1]))
 
     @property
     def size(self) -> (int, int):
@@ -177,7 +171,7 @@ class TrackedObject:
         :return: size of tracked object
         """
 
-        return self._current_size
+        return ObjectSize(*self._repository.sizes[self.index])
 
     @property
     def velocity(self) -> int:
@@ -185,7 +179,7 @@ class TrackedObject:
         :return: velocity of tracked object rounded to nearest integer
         """
 
-        return int(self._velocity)
+        return int(self._repository.velocities[self.index])
 
     @property
     def left_top_anchor(self):
@@ -256,41 +250,6 @@ class TrackedObject:
         if np.abs(self.center.y - self._history[-1][1]) > constants.TRACKER_HISTORY_DIFFERENCE:
             self._history.append(self.center.tuple())
 
-    def overlap(self, overlapping_object):
-        """
-        Checks if this tracked objects overlaps with selected object.
-
-        :param overlapping_object: tracked object to compare
-        :return: percentage of overlap
-        """
-
-        x_min = np.max((self.left_top_anchor.x, overlapping_object.left_top_anchor.x))
-        y_min = np.max((self.left_top_anchor.y, overlapping_object.left_top_anchor.y))
-        x_max = np.min((self.right_bot_anchor.x, overlapping_object.right_bot_anchor.x))
-        y_max = np.min((self.right_bot_anchor.y, overlapping_object.right_bot_anchor.y))
-
-        image = np.zeros(shape=(self._info.height, self._info.width))
-
-        cv2.rectangle(image, (x_min, y_min), (x_max, y_max), 200, 2)
-
-        x_size = (x_max - x_min)
-        y_size = (y_max - y_min)
-
-        # no overlapping
-        if x_size < 0 or y_size < 0:
-            return 0
-
-        overlapped_square_size = x_size * y_size
-
-        return overlapped_square_size / self.square_size()
-
-    def square_size(self):
-        """
-        :return: square size of tracked object
-        """
-
-        return self.size.width * self.size.height
-
     def area(self, area_size) -> int:
         """
         Defining multiple areas around object.
@@ -318,152 +277,6 @@ class TrackedObject:
 
         return self.left_top_anchor.tuple(), self.right_bot_anchor.tuple(), self.center.tuple()
 
-    def predict(self) -> ((float, float), (float, float)) or None:
-        """
-        Predicts new position of tracked object using Kalman Filter.
-        Adjusts size of object depending on distance to vanishing point.
-        """
-
-        self._kalman.predict()
-
-        if self._info.vp1 is not None:
-            vp1 = self._info.vanishing_points[0]
-            dist_diff = self.center.distance(vp1.coordinates) / self._reference_coordinates.distance(vp1.coordinates)
-
-            current_width = self._reference_object_size.width * dist_diff
-            current_height = self._reference_object_size.height * dist_diff
-
-            self._current_size = ObjectSize(current_width, current_height)
-
-        else:
-            self._current_size = self._reference_object_size
-
-    def update_position(self, size, score, new_coordinates):
-        """
-        Updates Kalman filter by mesurement of new position of tracked object.
-
-        :param size: measured object size
-        :param score: measured object score
-        :param new_coordinates: coordinates of measured object
-        :param mode: current mode
-        :return:
-        """
-
-        if not self._info.corridors_repository.behind_line(new_coordinates):
-            mesurement = np.array([
-                [np.float32(new_coordinates.x)],
-                [np.float32(new_coordinates.y)],
-                [np.float32(0)],
-                [np.float32(0)]
-            ])
-
-            self._kalman.measurementMatrix = KALMAN_MESUREMENT_POSITION_MATRIX
-            self._kalman.correct(mesurement)
-
-            self.score = score
-
-            self._reference_object_size = size
-            self._reference_coordinates = new_coordinates
-
-    def update_flow(self, old_positions, new_positions) -> None:
-        """
-        Updates Kalman filter by mesurement of optical flow in scene.
-        Tracked object position difference is extracted from complete optical flow of the scene using selected
-        area around this tracked object.
-
-        :param old_positions: old positions
-        :param new_positions: new positions
-        """
-
-        x_flow, y_flow = self.extract_flow(old_positions, new_positions)
-
-        mesurement = np.array([
-            [np.float32(0)],
-            [np.float32(0)],
-            [np.float32(x_flow / constants.TRACKER_OPTICAL_FLOW_FREQUENCY)],
-            [np.float32(y_flow / constants.TRACKER_OPTICAL_FLOW_FREQUENCY)]
-        ])
-
-        self._velocity = np.sqrt(x_flow ** 2 + y_flow ** 2)
-        self._kalman.measurementMatrix = KALMAN_MESUREMENT_FLOW_MATRIX
-        self._kalman.correct(mesurement)
-        self._flow = x_flow, y_flow
-
-    def in_area(self, new_coordinates):
-        """
-        :param new_coordinates: selected coordinates coordinates
-        :return: checks if selected coordinates are in area of tracked object
-        """
-
-        return self.left_top_anchor.x < new_coordinates.x < self.right_bot_anchor.x and self.left_top_anchor.y < new_coordinates.y < self.right_bot_anchor.y
-
-    def in_radius(self, new_coordinates) -> int:
-        """
-        :param new_coordinates: selected coordinates
-        :return: checks if selected coordinates are in certain radius around center of tracked object
-        """
-
-        width = self.size.width
-        height = self.size.height
-
-        diagonal = np.sqrt(width * width + height * height)
-
-        max_pixels = diagonal / 2
-
-        return self.center.distance(new_coordinates) < max_pixels
-
-    def extract_flow(self, old_positions, new_positions) -> (float, float):
-        """
-        Extracts optical flow for this tracked object. Optical flow is selected using an area around center point of
-        this tracked object.
-
-        :return: extracted flow corresponding to this tracked object
-        """
-
-        global_dx = 0
-        global_dy = 0
-
-        number_of_flows = 0
-        for flow in zip(new_positions, old_positions):
-            new_pos, old_pos = flow
-
-            if self.in_area(Coordinates(*new_pos)):
-
-                new_x, new_y = new_pos
-                old_x, old_y = old_pos
-                dx = new_x - old_x
-                dy = new_y - old_y
-
-                global_dx += dx
-                global_dy += dy
-
-                number_of_flows += 1
-
-        if number_of_flows:
-            return global_dx/number_of_flows, global_dy/number_of_flows
-        else:
-            return 0, 0
-
-    def mask(self, width, height, area_size="inner", color=constants.COLOR_WHITE_MONO) -> np.ndarray:
-        """
-        Creates (binary) mask of circle area around this tracked object in scene
-
-        :param width: width of image
-        :param height: height of image
-        :param area_size: size of selected area
-        :param color: color of mask
-        :return: generated mask
-        """
-
-        mask = np.zeros(shape=(height, width), dtype=np.uint8)
-        cv2.circle(img=mask,
-                   center=self.center.tuple(),
-                   radius=self.area(area_size),
-                   color=color,
-                   thickness=constants.FILL)
-
-        return mask
-
     def serialize(self):
         """
         :return: serialized tracked object: anchors, area, car info and velocity
@@ -0,0 +1,130 @@
+import unittest
+import cv2
+import numpy as np
+
+from primitives.coordinates import Coordinates
+from primitives.size import ObjectSize
+from repositories.models.tracked_object import KALMAN_TRANSITION_MATRIX, KALMAN_PROCESS_NOISE_COV, \
+    KALMAN_MESUREMENT_NOISE_COV, KALMAN_MESUREMENT_POSITION_MATRIX, KALMAN_MESUREMENT_FLOW_MATRIX
+from repositories.tracked_object_repository import TrackedObjectsRepository
+
+
+class CorridorsRepositoryStub:
+    def behind_line(self, coordinates):
+        return False
+
+    def behind_line_many(self, points):
+        return np.zeros(shape=len(points), dtype=bool)
+
+
+class InfoStub:
+    width = 640
+    height = 480
+    vp1 = None
+    corridors_repository = CorridorsRepositoryStub()
+
+
+def opencv_kalman(x, y):
+    kalman = cv2.KalmanFilter(4, 4)
+    kalman.transitionMatrix = KALMAN_TRANSITION_MATRIX
+    kalman.processNoiseCov = KALMAN_PROCESS_NOISE_COV
+    kalman.measurementNoiseCov = KALMAN_MESUREMENT_NOISE_COV
+    kalman.statePost = np.array([[x], [y], [0], [0]], dtype=np.float32)
+
+    return kalman
+
+
+class TrackedObjectsRepositoryTests(unittest.TestCase):
+    def setUp(self):
+        self.repository = TrackedObjectsRepository(InfoStub())
+        self.repository.new_tracked_object(Coordinates(100, 100), ObjectSize(20, 10), 0.9, None)
+        self.repository.new_tracked_object(Coordinates(300, 200), ObjectSize(40, 30), 0.9, None)
+
+    def test_batched_kalman_matches_opencv(self):
+        kalman_filters = [opencv_kalman(100, 100), opencv_kalman(300, 200)]
+        first, second = self.repository.list
+
+        for step in range(5):
+            self.repository.predict()
+            for kalman in kalman_filters:
+                kalman.predict()
+
+            self.repository.update_positions([second], [(ObjectSize(40, 30), 0.8, Coordinates(303 + step, 202))])
+            kalman_filters[1].measurementMatrix = KALMAN_MESUREMENT_POSITION_MATRIX
+            kalman_filters[1].correct(np.array([[303 + step], [202], [0], [0]], dtype=np.float32))
+
+            old_positions = np.array([[100, 100], [110, 100]], dtype=np.float32)
+            new_positions = old_positions + [2, 1]
+
+            flows = self.repository.extract_flows(old_positions, new_positions)
+
+            for kalman, (dx, dy) in zip(kalman_filters, flows):
+                kalman.measurementMatrix = KALMAN_MESUREMENT_FLOW_MATRIX
+                kalman.correct(np.array([[0], [0], [dx], [dy]], dtype=np.float32))
+
+            self.repository.update_flows(flows)
+
+        for kalman, state in zip(kalman_filters, self.repository.states):
+            self.assertTrue(np.allclose(kalman.statePost.ravel(), state, atol=1e-3))
+
+        self.assertEqual(first.velocity, 2)
+        self.assertAlmostEqual(second.score, 0.8)
+
+    def test_collision_keeps_id(self):
+        self.repository.new_tracked_object(Coordinates(102, 100), ObjectSize(20, 10), 0.9, None)
+
+        self.assertEqual(self.repository.count(), 2)
+        self.assertEqual(self.repository.list[0].id, 0)
+        self.assertEqual(self.repository.list[0].center.tuple(), (102, 100))
+        self.assertEqual(len(self.repository.states), 2)
+
+    def test_remove_reindexes(self):
+        first, second = self.repository.list
+        self.repository.remove(first)
+
+        self.assertEqual(second.index, 0)
+        self.assertEqual(second.center.tuple(), (300, 200))
+        self.assertEqual(self.repository.sizes.shape, (1, 2))
+
+    def test_overlaps(self):
+        boxes = np.array([[105, 100, 125, 110], [305, 175, 335, 205], [0, 0, 10, 10]])
+        overlaps = self.repository.overlaps(boxes)
+
+        self.assertTrue(np.allclose(overlaps, [[0.125, 0, 0], [0, 0.25, 0]]))
+        self.assertTrue(np.allclose(self.repository.overlaps(self.repository.anchors), np.eye(2)))
+
+    def test_intersection_over_union(self):
+        boxes = np.array([[90, 95, 110, 105], [0, 0, 10, 10]])
+        ious = self.repository.intersections_over_union(boxes)
+
+        self.assertAlmostEqual(ious[0][0], 1)
+        self.assertAlmostEqual(ious[0][1], 0)
+
+    def test_extract_flows(self):
+        self.repository.new_tracked_object(Coordinates(500, 400), ObjectSize(20, 20), 0.9, None)
+
+        old_positions = np.array([[95, 98], [100, 104], [290, 200], [310, 190], [10, 10]], dtype=np.float32)
+        new_positions = old_positions + [[1, 2], [3, 0], [-2, 1], [0, 5], [4, 4]]
+
+        flows = self.repository.extract_flows(old_positions, new_positions)
+
+        self.assertTrue(np.allclose(flows, [[2, 1], [-1, 3], [0, 0]]))
+
+        self.assertTrue(np.array_equal(self.repository.extract_flows([], []), np.zeros(shape=(3, 2))))
+
+    def test_grid_points_match_masked_grid(self):
+        self.repository.new_tracked_object(Coordinates(3, 477), ObjectSize(40, 30), 0.9, None)
+
+        density = 5
+        grid = np.zeros(shape=(480, 640), dtype=np.uint8)
+        grid[:480 - 480 % density:density, :640 - 640 % density:density] = 255
+
+        for area_size in ["inner", "outer"]:
+            expected = cv2.findNonZero(cv2.bitwise_and(grid, self.repository.all_boxes_mask(area_size)))
+            points = self.repository.grid_points(density=density, width=128, height=96, area_size=area_size)
+
+            self.assertEqual(set(map(tuple, points.reshape(-1, 2))), set(map(tuple, expected.reshape(-1, 2))))
+
+    def test_tracker_points(self):
+        for point, tracked_object in zip(self.repository.tracker_points, self.repository.list):
+            self.assertEqual(tuple(point), tracked_object.tracker_point.tuple())
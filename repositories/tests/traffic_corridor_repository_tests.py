@@ -0,0 +1,104 @@
+import json
+import unittest
+import cv2
+import numpy as np
+
+from primitives.area import Area
+from primitives.coordinates import Coordinates
+from primitives.line import Line
+from repositories.traffic_corridor_repository import TrafficCorridorRepository
+
+
+class InfoStub:
+    width = 640
+    height = 480
+
+    def __init__(self):
+        self.update_area = Area(info=self,
+                                top_left=Coordinates(0, self.height / 4),
+                                top_right=Coordinates(self.width, self.height / 4),
+                                bottom_right=Coordinates(self.width, self.height),
+                                bottom_left=Coordinates(0, self.height))
+
+
+class TrafficCorridorRepositoryTests(unittest.TestCase):
+    def setUp(self):
+        self.repository = TrafficCorridorRepository(InfoStub())
+        self.repository.create_new_corridor(left_line=Line((100, 0), (0, 479)),
+                                            right_line=Line((300, 0), (400, 479)))
+        self.repository.stopline = Line((0, 300), (639, 350))
+
+        self.repository._corridors_found = True
+        self.repository._stopline_found = True
+
+        self.points = [(x, y) for x in np.arange(-10, 660, 23.5) for y in range(250, 400, 7)]
+
+    def test_behind_line(self):
+        behind_line = self.repository.behind_line_many(self.points)
+
+        for (x, y), behind in zip(self.points, behind_line):
+            expected = self.repository.stopline.find_coordinate(x=x)[1] > y
+
+            self.assertEqual(self.repository.behind_line(Coordinates(x, y)), expected)
+            self.assertEqual(behind, expected)
+
+    def test_line_crossed(self):
+        previous_points = [(x, y + 20) for x, y in self.points]
+        line_crossed = self.repository.line_crossed_many(previous_points, self.points)
+
+        for previous, point, crossed in zip(previous_points, self.points, line_crossed):
+            expected = self.repository.line_crossed(Coordinates(*previous), Coordinates(*point))
+            self.assertEqual(crossed, expected)
+
+        self.assertTrue(line_crossed.any())
+
+    def test_get_corridors(self):
+        points = [(200, 240), (10, 400), (-5, 240), (600, 479)]
+
+        corridors = self.repository.get_corridors(points)
+
+        for (x, y), corridor in zip(points, corridors):
+            self.assertEqual(corridor, self.repository.get_corridor(Coordinates(x, y)))
+
+        self.assertTrue(np.array_equal(self.repository.contains_many(points), [True, False, False, False]))
+
+    def test_deserialize(self):
+        data = json.loads(json.dumps(self.repository.serialize()))
+
+        info = InfoStub()
+        expected_mask = cv2.bitwise_and(self.repository.corridor_mask, self.repository.corridor_mask,
+                                        mask=info.update_area.mask())
+
+        repository = TrafficCorridorRepository(info)
+        repository.deserialize(data)
+
+        self.assertTrue(repository.ready)
+        self.assertEqual(repository.count, 1)
+        self.assertTrue(np.array_equal(repository.corridor_mask, expected_mask))
+        self.assertEqual(repository.stopline.general_equation(), self.repository.stopline.general_equation())
+        self.assertTrue(np.array_equal(repository.behind_line_many(self.points), self.repository.behind_line_many(self.points)))
+        self.assertEqual(info.update_area.top_line.general_equation(), self.repository._info.update_area.top_line.general_equation())
+
+    def test_bounding_rect(self):
+        x, y, width, height = self.repository.bounding_rect
+        ys, xs = np.nonzero(self.repository.corridor_mask)
+
+        self.assertEqual((x, y, x + width - 1, y + height - 1), (xs.min(), ys.min(), xs.max(), ys.max()))
+        self.assertIsNone(TrafficCorridorRepository(InfoStub()).bounding_rect)
+
+    def test_stop_line_distances(self):
+        distances = self.repository.stop_line_distances(self.points)
+
+        for (x, y), distance in zip(self.points, distances):
+            self.assertEqual(distance < 0, self.repository.behind_line(Coordinates(x, y)))
+
+        self.assertTrue(np.isnan(TrafficCorridorRepository(InfoStub()).stop_line_distances(self.points)).all())
+
+    def test_stop_line_table(self):
+        xs = np.array([-10, 0, 12.7, 320.5, 639, 700])
+        columns = np.array([0, 0, 12, 320, 639, 639])
+
+        expected = np.array([self.repository.stopline.find_coordinate(x=x)[1] for x in columns])
+
+        self.assertTrue(np.allclose(self.repository._stop_line_ys(xs), expected))
+        self.assertTrue(np.allclose([self.repository._stop_line_y(x) for x in xs], expected))
@@ -1,14 +1,81 @@
+import cv2
 import numpy as np
 
 from primitives import constants
-from repositories.models.tracked_object import TrackedObject
+from repositories.models.tracked_object import TrackedObject, KALMAN_TRANSITION_MATRIX, KALMAN_PROCESS_NOISE_COV, \
+    KALMAN_MESUREMENT_NOISE_COV, KALMAN_MESUREMENT_POSITION_MATRIX, KALMAN_MESUREMENT_FLOW_MATRIX
 from primitives.enums import Mode
 
 
+def intersections(boxes, other_boxes) -> np.ndarray:
+    """
+    Computes intersection square sizes of all pairs of boxes.
+
+    :param boxes: boxes defined by anchors x_min, y_min, x_max, y_max (N x 4)
+    :param other_boxes: boxes defined by anchors x_min, y_min, x_max, y_max (M x 4)
+    :return: matrix of intersection square sizes (N x M)
+    """
+
+    boxes = boxes[:, np.newaxis, :]
+    other_boxes = other_boxes[np.newaxis, :, :]
+
+    x_sizes = np.minimum(boxes[..., 2], other_boxes[..., 2]) - np.maximum(boxes[..., 0], other_boxes[..., 0])
+    y_sizes = np.minimum(boxes[..., 3], other_boxes[..., 3]) - np.maximum(boxes[..., 1], other_boxes[..., 1])
+
+    return np.clip(x_sizes, 0, None) * np.clip(y_sizes, 0, None)
+
+
+def draw_circles(mask, centers, radii) -> np.ndarray:
+    """
+    Clears given mask and draws filled circles into it, used for masks of areas around tracked objects.
+
+    :param mask: mono mask to draw into
+    :param centers: centers of circles (N x 2)
+    :param radii: radii of circles (N), negative radius is drawn as zero
+    :return: the same mask
+    """
+
+    mask.fill(0)
+
+    for center, radius in zip(centers, radii):
+        cv2.circle(img=mask,
+                   center=(int(center[0]), int(center[1])),
+                   radius=int(max(radius, 0)),
+                   color=constants.COLOR_WHITE_MONO,
+                   thickness=constants.FILL)
+
+    return mask
+
+
+def kalman_correct(states, covariances, measurements, measurement_matrix):
+    """
+    Corrects multiple Kalman filters sharing the same measurement matrix at once.
+    Same as OpenCV the correction is computed from predicted state, so the last correction after prediction is used.
+
+    :param states: stacked predicted states (N x 4)
+    :param covariances: stacked predicted error covariances (N x 4 x 4)
+    :param measurements: stacked measurements (N x 4)
+    :param measurement_matrix: measurement matrix (4 x 4)
+    :return: corrected states, corrected error covariances
+    """
+
+    projected_covariances = measurement_matrix @ covariances @ measurement_matrix.T + KALMAN_MESUREMENT_NOISE_COV
+    gains = covariances @ measurement_matrix.T @ np.linalg.inv(projected_covariances)
+
+    residuals = measurements - states @ measurement_matrix.T
+    states = states + np.einsum("nij,nj->ni", gains, residuals)
+    covariances = covariances - gains @ measurement_matrix @ covariances
+
+    return states, covariances
+
+
 class TrackedObjectsRepository:
     """
     Repository for tracked object. Allows to create, update and remove tracked objects.
     Removes tracked objects if their position is outside specified area.
+
+    States of all tracked objects are stored in stacked arrays, so prediction and correction of Kalman filter is done
+    for all tracked objects at once. TrackedObject instances are just views into these arrays.
     """
 
     def __init__(self, info):
@@ -21,6 +88,9 @@ class TrackedObjectsRepository:
         self._collected_lifelines_id = []
         self._tracked_objects = []
         self._info = info
+        self._mask = None
+
+        self._clear_states()
 
     @property
     def list(self):
@@ -42,6 +112,67 @@ class TrackedObjectsRepository:
     def flows(self):
         return [tracked_object.flow for tracked_object in self._tracked_objects]
 
+    @property
+    def states(self):
+        """
+        :return: Kalman filter states of all tracked objects (N x 4) - x, y, dx, dy
+        """
+
+        return self._states
+
+    @property
+    def centers(self):
+        """
+        :return: center points of all tracked objects (N x 2) truncated to integer pixels
+        """
+
+        return self._states[:, :2].astype(np.int32)
+
+    @property
+    def sizes(self):
+        """
+        :return: current width and height of all tracked objects (N x 2)
+        """
+
+        return self._sizes
+
+    @property
+    def radii(self):
+        """
+        :return: radius around all tracked objects specified by half of diagonal (N)
+        """
+
+        return np.sqrt(np.sum(self._sizes * self._sizes, axis=1)) / 2
+
+    @property
+    def anchors(self):
+        """
+        :return: boxes of all tracked objects defined by anchors x_min, y_min, x_max, y_max (N x 4)
+        """
+
+        centers = self.centers
+        half_sizes = self._sizes / 2
+
+        return np.trunc(np.concatenate((centers - half_sizes, centers + half_sizes), axis=1))
+
+    @property
+    def tracker_points(self):
+        """
+        :return: middle points on bottom edge of all tracked objects (N x 2), same as TrackedObject.tracker_point
+        """
+
+        centers = self.centers
+
+        return np.stack((centers[:, 0], np.trunc(centers[:, 1] + self._sizes[:, 1] / 2)), axis=1)
+
+    @property
+    def velocities(self):
+        """
+        :return: velocities of all tracked objects measured by optical flow (N)
+        """
+
+        return self._velocities
+
     def new_tracked_object(self, coordinates, size, confident_score, _):
         """
         Creates new tracked object. If it found collision with existing tracked object these objects are marget
@@ -53,24 +184,103 @@ class TrackedObjectsRepository:
         :param _: ANY
         """
 
-        new_object = TrackedObject(coordinates=coordinates,
-                                   size=size,
+        self._append_state(coordinates, size)
+
+        new_object = TrackedObject(repository=self,
+                                   index=len(self._states) - 1,
                                    confident_score=confident_score,
                                    info=self._info,
                                    object_id=self._id_counter)
 
-        collision = False
-        for index, tracked_object in enumerate(self._tracked_objects[:]):
-            if tracked_object.overlap(new_object) > constants.TRACKER_MAX_OVERLAP:
-                new_object.id = tracked_object.id
-                self._tracked_objects[index] = new_object
-                collision = True
-                break
+        overlaps = self.overlaps(self.anchors[new_object.index:])[:new_object.index, 0]
+        collisions = np.flatnonzero(overlaps > constants.TRACKER_MAX_OVERLAP)
+
+        if len(collisions):
+            index = int(collisions[0])
+
+            self._move_state(source=new_object.index, destination=index)
+            self._delete_states([new_object.index])
 
-        if not collision:
+            new_object.id = self._tracked_objects[index].id
+            new_object.index = index
+            self._tracked_objects[index] = new_object
+
+        else:
             self._tracked_objects.append(new_object)
             self._id_counter += 1
 
+    def _clear_states(self):
+        """
+        Creates empty arrays of states
+        """
+
+        self._states = np.zeros(shape=(0, 4))
+        self._covariances = np.zeros(shape=(0, 4, 4))
+        self._predicted_states = np.zeros(shape=(0, 4))
+        self._predicted_covariances = np.zeros(shape=(0, 4, 4))
+        self._sizes = np.zeros(shape=(0, 2))
+        self._reference_sizes = np.zeros(shape=(0, 2))
+        self._reference_centers = np.zeros(shape=(0, 2))
+        self._velocities = np.zeros(shape=(0,))
+
+    def _append_state(self, coordinates, size):
+        """
+        Appends arrays by state of new tracked object, new object is not moving.
+
+        :param coordinates: coordinates of new object
+        :param size: size of new object
+        """
+
+        self._states = np.concatenate((self._states, [(coordinates.x, coordinates.y, 0, 0)]))
+        self._covariances = np.concatenate((self._covariances, np.zeros(shape=(1, 4, 4))))
+        self._predicted_states = np.concatenate((self._predicted_states, self._states[-1:]))
+        self._predicted_covariances = np.concatenate((self._predicted_covariances, np.zeros(shape=(1, 4, 4))))
+        self._sizes = np.concatenate((self._sizes, [(size.width, size.height)]))
+        self._reference_sizes = np.concatenate((self._reference_sizes, [(size.width, size.height)]))
+        self._reference_centers = np.concatenate((self._reference_centers, [(coordinates.x, coordinates.y)]))
+        self._velocities = np.concatenate((self._velocities, [0]))
+
+    def _move_state(self, source, destination):
+        """
+        Copies state of one tracked object to another row of arrays
+
+        :param source: index of source row
+        :param destination: index of destination row
+        """
+
+        for array in [self._states, self._covariances, self._predicted_states, self._predicted_covariances, self._sizes,
+                      self._reference_sizes, self._reference_centers, self._velocities]:
+            array[destination] = array[source]
+
+    def _delete_states(self, indexes):
+        """
+        Removes selected rows from arrays
+
+        :param indexes: indexes of removed rows
+        """
+
+        self._states = np.delete(self._states, indexes, axis=0)
+        self._covariances = np.delete(self._covariances, indexes, axis=0)
+        self._predicted_states = np.delete(self._predicted_states, indexes, axis=0)
+        self._predicted_covariances = np.delete(self._predicted_covariances, indexes, axis=0)
+        self._sizes = np.delete(self._sizes, indexes, axis=0)
+        self._reference_sizes = np.delete(self._reference_sizes, indexes, axis=0)
+        self._reference_centers = np.delete(self._reference_centers, indexes, axis=0)
+        self._velocities = np.delete(self._velocities, indexes, axis=0)
+
+    def remove(self, tracked_object):
+        """
+        Removes selected tracked object from repository
+
+        :param tracked_object: tracked object to remove
+        """
+
+        self._delete_states([tracked_object.index])
+        self._tracked_objects.remove(tracked_object)
+
+        for index, remaining_object in enumerate(self._tracked_objects):
+            remaining_object.index = index
+
     def count(self) -> int:
         """
         :return: count of currently tracked objects
@@ -80,30 +290,176 @@ class TrackedObjectsRepository:
 
     def all_boxes_mask(self, area_size="inner"):
         """
+        All circle areas around tracked objects are drawn into single mask.
+        Mask buffer is reused, so returned mask is valid until the next call.
+
         :param area_size: specified area of boxes.
         :return: created mask
         """
 
-        height = self._info.height
-        width = self._info.width
-        global_mask = np.zeros(shape=(height, width),
-                               dtype=np.uint8)
+        if self._mask is None:
+            self._mask = np.zeros(shape=(self._info.height, self._info.width), dtype=np.uint8)
 
-        for index, tracked_object in enumerate(self._tracked_objects[::-1]):
-            global_mask = np.maximum(global_mask, tracked_object.mask(width=width,
-                                                                      height=height,
-                                                                      area_size=area_size,
-                                                                      color=constants.COLOR_WHITE_MONO))
+        return draw_circles(self._mask, self.centers, self.areas(area_size))
 
-        return global_mask
+    def areas(self, area_size="inner"):
+        """
+        Radii of selected area around all tracked objects, same as TrackedObject.area()
+
+        :param area_size: size of selected area
+        :return: array of radii (N)
+        """
+
+        radii = np.trunc(self.radii)
+
+        if area_size == "inner":
+            return np.minimum(radii, 10)
+
+        if area_size == "outer":
+            return radii
+
+        if area_size == "small-outer":
+            return radii - 3
+
+        else:
+            return np.zeros_like(radii)
+
+    def grid_points(self, density, width, height, area_size="inner"):
+        """
+        Selects points of regular grid, which are inside of selected area around any of tracked object.
+        Only grid points near each tracked object are tested, so no mask of whole frame is needed.
+
+        :param density: distance between neighbour grid points
+        :param width: number of grid columns
+        :param height: number of grid rows
+        :param area_size: size of selected area
+        :return: unique selected grid points (K x 1 x 2) in form of cv2.findNonZero()
+        """
+
+        selected = [np.zeros(shape=(0, 2), dtype=np.int32)]
+
+        for center, radius in zip(self.centers, self.areas(area_size)):
+            if radius < 0:
+                continue
+
+            x_indexes = np.arange(max(0, int(np.ceil((center[0] - radius) / density))),
+                                  min(width - 1, int(np.floor((center[0] + radius) / density))) + 1)
+            y_indexes = np.arange(max(0, int(np.ceil((center[1] - radius) / density))),
+                                  min(height - 1, int(np.floor((center[1] + radius) / density))) + 1)
+
+            xs, ys = np.meshgrid(x_indexes * density, y_indexes * density)
+            inside = (xs - center[0]) ** 2 + (ys - center[1]) ** 2 <= radius ** 2
+
+            selected.append(np.stack((xs[inside], ys[inside]), axis=1).astype(np.int32))
+
+        points = np.concatenate(selected)
+
+        if len(points):
+            points = np.unique(points, axis=0)
+
+        return points.reshape(-1, 1, 2)
 
     def predict(self) -> None:
         """
-        Predicts positions on all tracked objects
+        Predicts positions on all tracked objects using Kalman Filter.
+        Adjusts size of objects depending on distance to vanishing point.
+        """
+
+        self._predicted_states = self._states @ KALMAN_TRANSITION_MATRIX.T
+        self._predicted_covariances = KALMAN_TRANSITION_MATRIX @ self._covariances @ KALMAN_TRANSITION_MATRIX.T + KALMAN_PROCESS_NOISE_COV
+
+        self._states = self._predicted_states.copy()
+        self._covariances = self._predicted_covariances.copy()
+
+        if self._info.vp1 is not None:
+            vp1 = np.array(self._info.vanishing_points[0].point)
+
+            distances = np.linalg.norm(self.centers - vp1, axis=1)
+            reference_distances = np.linalg.norm(self._reference_centers - vp1, axis=1)
+
+            self._sizes = self._reference_sizes * (distances / reference_distances)[:, np.newaxis]
+
+        else:
+            self._sizes = self._reference_sizes.copy()
+
+    def update_positions(self, tracked_objects, measurements) -> None:
         """
+        Updates Kalman filters of selected tracked objects by mesurement of their new position.
+        Measurements behind stop line are ignored.
+
+        :param tracked_objects: list of tracked objects
+        :param measurements: list of measurements (size, score, coordinates) for each of tracked objects
+        """
+
+        indexes = []
+        positions = []
 
-        for tracked_object in self._tracked_objects:
-            tracked_object.predict()
+        behind_line = self._info.corridors_repository.behind_line_many([(coordinates.x, coordinates.y) for _, _, coordinates in measurements])
+
+        for tracked_object, measurement, behind in zip(tracked_objects, measurements, behind_line):
+            size, score, new_coordinates = measurement
+
+            if not behind:
+                indexes.append(tracked_object.index)
+                positions.append((new_coordinates.x, new_coordinates.y, 0, 0))
+
+                tracked_object.score = score
+
+                self._reference_sizes[tracked_object.index] = size.width, size.height
+                self._reference_centers[tracked_object.index] = new_coordinates.x, new_coordinates.y
+
+        if not indexes:
+            return
+
+        self._states[indexes], self._covariances[indexes] = kalman_correct(states=self._predicted_states[indexes],
+                                                                           covariances=self._predicted_covariances[indexes],
+                                                                           measurements=np.array(positions),
+                                                                           measurement_matrix=KALMAN_MESUREMENT_POSITION_MATRIX)
+
+    def extract_flows(self, old_positions, new_positions):
+        """
+        Extracts optical flow of all tracked objects at once.
+        Flow of each tracked object is mean displacement of all points which ended inside of its box.
+
+        :param old_positions: old positions of tracked points
+        :param new_positions: new positions of tracked points
+        :return: mean displacement (dx, dy) of each tracked object (N x 2)
+        """
+
+        old_positions = np.asarray(old_positions, dtype=np.float64).reshape(-1, 2)
+        new_positions = np.asarray(new_positions, dtype=np.float64).reshape(-1, 2)
+
+        anchors = self.anchors
+        xs = new_positions[:, 0]
+        ys = new_positions[:, 1]
+
+        inside = (anchors[:, 0:1] < xs) & (xs < anchors[:, 2:3]) & (anchors[:, 1:2] < ys) & (ys < anchors[:, 3:4])
+
+        counts = inside.sum(axis=1)
+        sums = inside.astype(np.float64) @ (new_positions - old_positions)
+
+        return sums / np.maximum(counts, 1)[:, np.newaxis]
+
+    def update_flows(self, flows) -> None:
+        """
+        Updates Kalman filters of all tracked objects by mesurement of optical flow in scene.
+
+        :param flows: optical flow of each tracked object (N x 2), see extract_flows()
+        """
+
+        if not self.count():
+            return
+
+        flows = np.asarray(flows, dtype=np.float64)
+
+        measurements = np.zeros(shape=(self.count(), 4))
+        measurements[:, 2:] = flows / constants.TRACKER_OPTICAL_FLOW_FREQUENCY
+
+        self._velocities = np.sqrt(np.sum(flows * flows, axis=1))
+        self._states, self._covariances = kalman_correct(states=self._predicted_states,
+                                                         covariances=self._predicted_covariances,
+                                                         measurements=measurements,
+                                                         measurement_matrix=KALMAN_MESUREMENT_FLOW_MATRIX)
 
     def control_boxes(self, mode) -> None:
         """
@@ -113,25 +469,37 @@ class TrackedObjectsRepository:
         :param mode: current work mode
         """
 
-        for tracked_object in self._tracked_objects:
+        tracker_points = self.tracker_points
+        centers = self.centers
+
+        corridors_repository = self._info.corridors_repository
+        update_area = self._info.update_area
+
+        tracker_points_in_area = update_area.contains_many(tracker_points)
+        centers_in_area = update_area.contains_many(centers)
+        tracker_points_in_corridors = corridors_repository.contains_many(tracker_points)
+        centers_in_corridors = corridors_repository.contains_many(centers)
+        tracker_points_behind_line = corridors_repository.behind_line_many(tracker_points)
+
+        for index, tracked_object in enumerate(list(self._tracked_objects)):
             if tracked_object.id not in self._collected_lifelines_id:
-                if tracked_object.tracker_point not in self._info.update_area or (mode == Mode.CALIBRATION_VP and tracked_object.center not in self._info.update_area):
+                if not tracker_points_in_area[index] or (mode == Mode.CALIBRATION_VP and not centers_in_area[index]):
                     self.lifelines.append(tracked_object.history)
                     self._collected_lifelines_id.append(tracked_object.id)
                 else:
                     tracked_object.update_history()
 
-            if tracked_object.tracker_point not in self._info.corridors_repository:
-                if tracked_object.center not in self._info.corridors_repository:
-                    self._tracked_objects.remove(tracked_object)
+            if not tracker_points_in_corridors[index]:
+                if not centers_in_corridors[index]:
+                    self.remove(tracked_object)
 
-            elif tracked_object.tracker_point not in self._info.update_area:
-                self._tracked_objects.remove(tracked_object)
+            elif not tracker_points_in_area[index]:
+                self.remove(tracked_object)
 
-            elif self._info.corridors_repository.behind_line(tracked_object.tracker_point):
+            elif tracker_points_behind_line[index]:
                 tracked_object.lifetime -= 1
                 if tracked_object.lifetime <= 0:
-                    self._tracked_objects.remove(tracked_object)
+                    self.remove(tracked_object)
 
     def serialize(self):
         """
@@ -149,3 +517,34 @@ class TrackedObjectsRepository:
         self._id_counter = 0
         self._lifelines = []
         self._tracked_objects = []
+
+        self._clear_states()
+
+    def overlaps(self, boxes):
+        """
+        Computes overlap of every tracked object with every given box, overlap is relative to the square size of
+        tracked object.
+
+        :param boxes: boxes defined by anchors x_min, y_min, x_max, y_max (M x 4)
+        :return: matrix of overlaps (N x M)
+        """
+
+        square_sizes = np.prod(self._sizes, axis=1)
+
+        return intersections(self.anchors, boxes) / square_sizes[:, np.newaxis]
+
+    def intersections_over_union(self, boxes):
+        """
+        Computes intersection over union of every tracked object with every given box.
+
+        :param boxes: boxes defined by anchors x_min, y_min, x_max, y_max (M x 4)
+        :return: matrix of intersections over union (N x M)
+        """
+
+        anchors = self.anchors
+        overlapped = intersections(anchors, boxes)
+
+        square_sizes = np.prod(anchors[:, 2:] - anchors[:, :2], axis=1)
+        box_square_sizes = np.prod(boxes[:, 2:] - boxes[:, :2], axis=1)
+
+        return overlapped / (square_sizes[:, np.newaxis] + box_square_sizes[np.newaxis, :] - overlapped)
@@ -25,7 +25,9 @@ class TrafficCorridorRepository:
         self._corridors = {}
         self._corridors_count = 0
         self._corridor_mask = np.zeros(shape=(info.height, info.width), dtype=np.uint8)
+        self._bounding_rect = None
         self._stop_line = None
+        self._stop_line_thresholds = None
 
         self._stop_places = []
 
@@ -75,13 +77,21 @@ class TrafficCorridorRepository:
         Sets the stopline with specified offset, assuming that first vanishing point is in the top part of frame
         """
 
-        self._stop_line = value
+        left_edge_point = value.edge_points(info=self._info)[0]
+        right_edge_point = value.edge_points(info=self._info)[1]
 
-        left_edge_point = self.stopline.edge_points(info=self._info)[0]
-        right_edge_point = self.stopline.edge_points(info=self._info)[1]
+        self._set_stopline(Line(point1=(left_edge_point[0], left_edge_point[1] - constants.CORRIDORS_STOP_LINE_OFFSET),
+                                point2=(right_edge_point[0], right_edge_point[1] - constants.CORRIDORS_STOP_LINE_OFFSET)))
+
+    def _set_stopline(self, line):
+        """
+        Sets the stopline without any offset. Top line of update area is moved according to the stopline and
+        stopline position in every column of frame is precomputed.
+
+        :param line: new stopline
+        """
 
-        self._stop_line = Line(point1=(left_edge_point[0], left_edge_point[1] - constants.CORRIDORS_STOP_LINE_OFFSET),
-                               point2=(right_edge_point[0], right_edge_point[1] - constants.CORRIDORS_STOP_LINE_OFFSET))
+        self._stop_line = line
 
         left_edge_point = self.stopline.edge_points(info=self._info)[0]
         right_edge_point = self.stopline.edge_points(info=self._info)[1]
@@ -91,6 +101,13 @@ class TrafficCorridorRepository:
 
         self._info.update_area.change_area(top_line=top_line)
 
+        a, b, c = self._stop_line.general_equation()
+
+        if b == 0:
+            self._stop_line_thresholds = None
+        else:
+            self._stop_line_thresholds = ((-a) * np.arange(self._info.width, dtype=np.float64) - c) / b
+
     @property
     def ready(self):
         """
@@ -107,6 +124,30 @@ class TrafficCorridorRepository:
 
         return self._corridor_mask
 
+    @property
+    def bounding_rect(self):
+        """
+        Bounding rectangle of all corridors. It is computed only once after each change of corridors.
+
+        :return: x, y, width, height of rectangle, None if there is no corridor in mask
+        """
+
+        if self._bounding_rect is None:
+            self._bounding_rect = cv2.boundingRect(self._corridor_mask)
+
+        x, y, width, height = self._bounding_rect
+
+        return self._bounding_rect if width > 0 and height > 0 else None
+
+    def _clip_mask(self):
+        """
+        Clips corridor mask by update area.
+        """
+
+        self._corridor_mask = cv2.bitwise_and(self._corridor_mask, self._corridor_mask,
+                                              mask=self._info.update_area.mask())
+        self._bounding_rect = None
+
     def select_manually(self, image):
         """
         Allows user to select corridors and stop line manually
@@ -129,8 +170,7 @@ class TrafficCorridorRepository:
             self.create_new_corridor(left_line=line1,
                                      right_line=line2)
 
-        self._corridor_mask = cv2.bitwise_and(self._corridor_mask, self._corridor_mask,
-                                              mask=self._info.update_area.mask())
+        self._clip_mask()
 
         most_left_selection = selected_corridors[0]
         most_right_selection = selected_corridors[-1]
@@ -152,8 +192,25 @@ class TrafficCorridorRepository:
         if not self.ready:
             return False
 
-        red_line_point = self.stopline.find_coordinate(x=coordinates.x)
-        return previous_coordinates.y >= red_line_point[1] > coordinates.y
+        return previous_coordinates.y >= self._stop_line_y(coordinates.x) > coordinates.y
+
+    def line_crossed_many(self, previous_points, points) -> np.ndarray:
+        """
+        Vectorized version of line_crossed().
+
+        :param previous_points: previous positions of objects (N x 2) in form x, y
+        :param points: new positions of objects (N x 2) in form x, y
+        :return: boolean array (N) if line is between previous and new position of each object
+        """
+
+        previous_points = np.asarray(previous_points, dtype=np.float64).reshape(-1, 2)
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+        if not self.ready:
+            return np.zeros(shape=len(points), dtype=bool)
+
+        thresholds = self._stop_line_ys(points[:, 0])
+        return (previous_points[:, 1] >= thresholds) & (thresholds > points[:, 1])
 
     def behind_line(self, coordinates):
         """
@@ -164,8 +221,63 @@ class TrafficCorridorRepository:
         if not self.ready:
             return False
 
-        red_line_point = self.stopline.find_coordinate(x=coordinates.x)
-        return red_line_point[1] > coordinates.y
+        return self._stop_line_y(coordinates.x) > coordinates.y
+
+    def behind_line_many(self, points) -> np.ndarray:
+        """
+        Vectorized version of behind_line().
+
+        :param points: array of points (N x 2) in form x, y
+        :return: boolean array (N) if points are behind stop line
+        """
+
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+        if not self.ready:
+            return np.zeros(shape=len(points), dtype=bool)
+
+        return self._stop_line_ys(points[:, 0]) > points[:, 1]
+
+    def stop_line_distances(self, points) -> np.ndarray:
+        """
+        :param points: array of points (N x 2) in form x, y
+        :return: vertical distances of points in front of stop line (N), negative behind the line,
+        nan if stop line is not found
+        """
+
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+        if not self.ready:
+            return np.full(shape=len(points), fill_value=np.nan)
+
+        return points[:, 1] - self._stop_line_ys(points[:, 0])
+
+    def _stop_line_y(self, x):
+        """
+        Y coordinate of stop line in selected column, looked up in precomputed table. Coordinates outside of frame
+        are clipped to the nearest column. Line is solved only if there is no table (vertical stop line).
+
+        :param x: x coordinate
+        :return: y coordinate of stop line
+        """
+
+        if self._stop_line_thresholds is None:
+            return self.stopline.find_coordinate(x=x)[1]
+
+        return self._stop_line_thresholds[min(max(int(x), 0), self._info.width - 1)]
+
+    def _stop_line_ys(self, xs):
+        """
+        Vectorized version of _stop_line_y(), whole batch is looked up in precomputed table at once.
+
+        :param xs: array of x coordinates (N)
+        :return: y coordinates of stop line (N)
+        """
+
+        if self._stop_line_thresholds is None:
+            return np.array([self.stopline.find_coordinate(x=x)[1] for x in xs], dtype=np.float64)
+
+        return self._stop_line_thresholds[np.clip(xs.astype(int), 0, self._info.width - 1)]
 
     def __contains__(self, coordinates):
         return self.get_corridor(coordinates) > 0 or not self._corridors_found
@@ -184,6 +296,41 @@ class TrafficCorridorRepository:
         else:
             return -1
 
+    def get_corridors(self, points) -> np.ndarray:
+        """
+        Vectorized version of get_corridor(), corridor IDs are looked up in corridor mask.
+
+        :param points: array of points (N x 2) in form x, y
+        :return: corridor IDs (N) where these points belong to. -1 if no corridors were found, 0 when outside corridors
+        """
+
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        corridors = np.full(shape=len(points), fill_value=-1, dtype=np.int32)
+
+        if not self._corridors_found:
+            return corridors
+
+        x = points[:, 0]
+        y = points[:, 1]
+        inside = (0 < x) & (x < self._info.width) & (0 < y) & (y < self._info.height)
+
+        corridors[inside] = self._corridor_mask[y[inside].astype(np.int32), x[inside].astype(np.int32)]
+
+        return corridors
+
+    def contains_many(self, points) -> np.ndarray:
+        """
+        Vectorized version of membership test.
+
+        :param points: array of points (N x 2) in form x, y
+        :return: boolean array (N) if points are inside of any corridor
+        """
+
+        if not self._corridors_found:
+            return np.ones(shape=len(np.asarray(points).reshape(-1, 2)), dtype=bool)
+
+        return self.get_corridors(points) > 0
+
     def get_mask(self, fill) -> np.ndarray:
         """
         :param fill: if mask should be filled
@@ -251,6 +398,8 @@ class TrafficCorridorRepository:
                                    info=self._info,
                                    color=self._corridors_count)
 
+        self._bounding_rect = None
+
     def find_corridors(self, lifelines_mask, vp1):
         """
         Finds corridors on frame using first positions of cars and detected first vanishing point to construct
@@ -319,8 +468,7 @@ class TrafficCorridorRepository:
 
         # cv2.imwrite("mask.jpg", self.get_mask())
 
-        self._corridor_mask = cv2.bitwise_and(self._corridor_mask, self._corridor_mask,
-                                              mask=self._info.update_area.mask())
+        self._clip_mask()
         self._corridors_found = True
 
     def add_stop_point(self, coordinates):
@@ -385,4 +533,25 @@ class TrafficCorridorRepository:
         :return: dictionary of serialized corridors
         """
 
-        return {"corridors": [corridor.serialize() for _, corridor in self._corridors.items()]}
+        stopline = self.stopline.serialize() if self._stopline_found else None
+
+        return {"corridors": [corridor.serialize() for _, corridor in self._corridors.items()],
+                "stopline": stopline}
+
+    def deserialize(self, data):
+        """
+        Restores corridors and stop line serialized by serialize().
+
+        :param data: dictionary of serialized corridors
+        """
+
+        for corridor in data["corridors"]:
+            self.create_new_corridor(left_line=Line.deserialize(corridor["left_line"]),
+                                     right_line=Line.deserialize(corridor["right_line"]))
+
+        self._clip_mask()
+        self._corridors_found = len(data["corridors"]) > 0
+
+        if data.get("stopline") is not None:
+            self._set_stopline(Line.deserialize(data["stopline"]))
+            self._stopline_found = True
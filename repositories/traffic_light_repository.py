@@ -1,5 +1,4 @@
 import cv2
-import tensorflow as tf
 import numpy as np
 
 from primitives import constants
@@ -12,6 +11,7 @@ class TrafficLightsRepository:
     Repository for storing detected lights (only one light supported for this moment)
     Allows creating and storing these lights.
     Allows detection of traffic light using given model of neural network capable of object detection.
+    Model is loaded only when automatic detection is needed and it is released right after.
     """
 
     def __init__(self, model, info):
@@ -24,23 +24,6 @@ class TrafficLightsRepository:
         self._info = info
         self._traffic_lights = []
 
-        self.detection_graph = tf.Graph()
-
-        with self.detection_graph.as_default():
-            od_graph_def = tf.GraphDef()
-
-            with tf.gfile.GFile(model, 'rb') as fid:
-                serialized_graph = fid.read()
-                od_graph_def.ParseFromString(serialized_graph)
-                tf.import_graph_def(od_graph_def, name='')
-
-            self.image_tensor = self.detection_graph.get_tensor_by_name('image_tensor:0')
-            self.d_boxes = self.detection_graph.get_tensor_by_name('detection_boxes:0')
-            self.d_scores = self.detection_graph.get_tensor_by_name('detection_scores:0')
-            self.d_classes = self.detection_graph.get_tensor_by_name('detection_classes:0')
-
-        self.sess = tf.Session(graph=self.detection_graph)
-
     @property
     def ready(self) -> bool:
         """
@@ -113,16 +96,16 @@ class TrafficLightsRepository:
         """
         Uses neural net for finding traffic light on given image.
         Only the best traffic light detection is added to storage.
-        Code inspired by: https://medium.com/@WuStangDan/step-by-step-tensorflow-object-detection-api-tutorial-part-5-saving-and-deploying-a-model-8d51f56dbcf1
+        Model is released after detection, it is not needed anymore.
 
         :param image: selected image
         """
 
         img_expanded = np.expand_dims(image, axis=0)
 
-        (boxes, scores, classes) = self.sess.run(
-            [self.d_boxes, self.d_scores, self.d_classes],
-            feed_dict={self.image_tensor: img_expanded})
+        model = self._info.model_registry.model(self._model, input_size=constants.DETECTOR_LIGHT_INPUT_SIZE)
+        boxes, scores, classes = model.run(img_expanded)
+        self._info.model_registry.release(self._model)
 
         for box, score, class_id in list(zip(boxes[0], scores[0], classes[0])):
 
@@ -151,3 +134,13 @@ class TrafficLightsRepository:
 
     def serialize(self):
         return {"traffic light": self._traffic_lights[0].serialize()}
+
+    def deserialize(self, data):
+        """
+        Restores traffic light serialized by serialize().
+
+        :param data: dictionary of serialized traffic light
+        """
+
+        self.add_traffic_light(top_left=Coordinates(*data["traffic light"]["top left"]),
+                               bottom_right=Coordinates(*data["traffic light"]["bottom right"]))
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+"""
+End-to-end benchmark of the pipeline on synthetic intersection videos
+"""
+
+__author__ = "Miroslav Karpisek"
+__email__ = "xkarpi05@stud.fit.vutbr.cz"
+__date__ = "14.5.2019"
+
+import getopt
+import json
+import os
+import sys
+import tempfile
+
+from benchmark.pipeline_benchmark import PipelineBenchmark
+from primitives.parser import ParametersError
+
+DEFAULT_RESOLUTIONS = "640x360,1280x720"
+DEFAULT_DENSITIES = "0.5,1,2"
+
+
+def main(argv):
+    """
+    Runs benchmark for every combination of given resolutions and car densities and writes JSON report.
+    Reports of different builds computed with the same parameters can be compared by diff.
+
+    Usage: run_benchmark.py [--output=report.json] [--resolutions=640x360,1280x720] [--densities=0.5,1,2]
+                            [--frames=500] [--seed=0] [--work-dir=DIR]
+
+    :param argv: program arguments
+    """
+
+    try:
+        opts, args = getopt.getopt(argv, "", ["output=", "resolutions=", "densities=", "frames=", "seed=",
+                                              "work-dir="])
+
+    except getopt.GetoptError:
+        raise ParametersError
+
+    output = None
+    resolutions = DEFAULT_RESOLUTIONS
+    densities = DEFAULT_DENSITIES
+    frames = 500
+    seed = 0
+    work_dir = None
+
+    for opt, arg in opts:
+
+        if opt == "--output":
+            output = arg
+
+        if opt == "--resolutions":
+            resolutions = arg
+
+        if opt == "--densities":
+            densities = arg
+
+        if opt == "--frames":
+            frames = int(arg)
+
+        if opt == "--seed":
+            seed = int(arg)
+
+        if opt == "--work-dir":
+            work_dir = arg
+
+    resolutions = [tuple(int(size) for size in resolution.split("x")) for resolution in resolutions.split(",")]
+    densities = [float(density) for density in densities.split(",")]
+
+    with tempfile.TemporaryDirectory() as temporary_dir:
+        if work_dir is None:
+            work_dir = temporary_dir
+        else:
+            os.makedirs(work_dir, exist_ok=True)
+
+        benchmark = PipelineBenchmark(work_dir=work_dir, frames=frames, seed=seed)
+        report = json.dumps(benchmark.run(resolutions, densities), indent=2, sort_keys=True)
+
+    if output is None:
+        print(report)
+    else:
+        with open(output, "w") as file:
+            file.write(report + "\n")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,174 @@
+"""
+EncoderPool class definition
+"""
+
+__author__ = "Miroslav Karpisek"
+__email__ = "xkarpi05@stud.fit.vutbr.cz"
+__date__ = "14.5.2019"
+
+import cv2
+
+from queue import Queue, Full
+from threading import Thread, Lock
+
+from primitives import constants
+
+POLICY_BLOCK = "block"
+POLICY_DROP = "drop"
+
+
+class EncoderPool:
+    """
+    Bounded pool of background threads encoding violation clips, so encoding does not stall the pipeline.
+    Every clip is assigned to one worker, which keeps order of its frames. Each worker has bounded queue of frames.
+    When the queue is full, submitting thread either waits (block policy) or the frame is dropped (drop policy).
+
+    Frames are not copied, the same frame can be submitted to many clips. Reference to the frame is held until
+    the frame is written by all workers.
+    """
+
+    def __init__(self, workers=constants.VIDEO_WRITER_ENCODER_WORKERS, queue_size=constants.VIDEO_WRITER_ENCODER_QUEUE_SIZE,
+                 policy=constants.VIDEO_WRITER_ENCODER_POLICY):
+        """
+        :param workers: number of encoding threads
+        :param queue_size: maximal number of waiting frames of each worker
+        :param policy: "block" or "drop", what to do with new frame if the queue is full
+        """
+
+        if policy not in [POLICY_BLOCK, POLICY_DROP]:
+            raise ValueError(f"unknown encoder policy: {policy}")
+
+        self._policy = policy
+        self._queues = [Queue(maxsize=queue_size) for _ in range(workers)]
+        self._threads = [Thread(target=self._work, args=(queue,), daemon=True) for queue in self._queues]
+
+        self._routes = {}
+        self._next_worker = 0
+        self._dropped = 0
+        self._lock = Lock()
+
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def queue_depth(self):
+        """
+        :return: number of frames waiting for encoding in all workers
+        """
+
+        return sum(queue.qsize() for queue in self._queues)
+
+    @property
+    def queue_depths(self):
+        """
+        :return: number of frames waiting for encoding in each worker
+        """
+
+        return [queue.qsize() for queue in self._queues]
+
+    @property
+    def dropped(self):
+        """
+        :return: number of frames dropped because of full queue
+        """
+
+        return self._dropped
+
+    def open(self, clip_id, path, fps, size):
+        """
+        Opens new clip and assigns it to the next worker.
+
+        :param clip_id: unique id of clip
+        :param path: path of output video file
+        :param fps: fps of output video
+        :param size: (width, height) of output video
+        """
+
+        with self._lock:
+            self._routes[clip_id] = self._next_worker
+            self._next_worker = (self._next_worker + 1) % len(self._queues)
+
+        self._queues[self._routes[clip_id]].put(("open", clip_id, (path, fps, size)))
+
+    def write(self, clip_id, frame) -> bool:
+        """
+        Submits frame to the worker of selected clip. Reference to the frame is added and it is released after
+        the frame is written or dropped.
+
+        :param clip_id: id of opened clip
+        :param frame: frame to be written with image, retain() and release(), e.g. HistoryFrame
+        :return: if the frame was accepted, False if it was dropped
+        """
+
+        task = "write", clip_id, frame
+        queue = self._queues[self._routes[clip_id]]
+
+        frame.retain()
+
+        if self._policy == POLICY_BLOCK:
+            queue.put(task)
+            return True
+
+        try:
+            queue.put_nowait(task)
+            return True
+
+        except Full:
+            frame.release()
+
+            with self._lock:
+                self._dropped += 1
+
+            return False
+
+    def close_clip(self, clip_id):
+        """
+        Closes clip after all its submitted frames are written.
+
+        :param clip_id: id of opened clip
+        """
+
+        self._queues[self._routes.pop(clip_id)].put(("close", clip_id, None))
+
+    def close(self):
+        """
+        Waits until all submitted frames are written and stops all workers.
+        """
+
+        for queue in self._queues:
+            queue.put(None)
+
+        for thread in self._threads:
+            thread.join()
+
+    @staticmethod
+    def _work(queue):
+        """
+        Main loop of worker, writes frames of assigned clips until stop sentinel is received.
+
+        :param queue: queue of tasks of this worker
+        """
+
+        outputs = {}
+
+        while True:
+            task = queue.get()
+
+            if task is None:
+                break
+
+            action, clip_id, data = task
+
+            if action == "open":
+                path, fps, size = data
+                outputs[clip_id] = cv2.VideoWriter(path, cv2.VideoWriter_fourcc('M', 'J', 'P', 'G'), fps, size)
+
+            elif action == "write":
+                outputs[clip_id].write(data.image)
+                data.release()
+
+            elif action == "close":
+                outputs.pop(clip_id).release()
+
+        for output in outputs.values():
+            output.release()
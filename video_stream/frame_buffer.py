@@ -0,0 +1,267 @@
+"""
+FrameBuffer class definition
+"""
+
+__author__ = "Miroslav Karpisek"
+__email__ = "xkarpi05@stud.fit.vutbr.cz"
+__date__ = "14.5.2019"
+
+import ctypes
+import multiprocessing
+import numpy as np
+
+from threading import Lock
+
+
+def _attach_frame(buffer_id, slot, seq):
+    """
+    Recreates handle of frame stored in shared FrameBuffer after it was transferred into another process.
+
+    :param buffer_id: id of shared FrameBuffer
+    :param slot: index of slot in buffer
+    :param seq: sequence number of the frame
+    :return: handle of the frame
+    """
+
+    return FrameBuffer.shared_buffers[buffer_id].frame(slot, seq)
+
+
+def _standalone_frame(seq, image):
+    """
+    Recreates handle of frame which is not stored in any FrameBuffer slot.
+
+    :param seq: sequence number of the frame
+    :param image: transferred image
+    :return: handle of the frame
+    """
+
+    image.flags.writeable = False
+    return SharedFrame(buffer=None, slot=None, seq=seq, image=image)
+
+
+class SharedFrame:
+    """
+    Handle of one frame stored in FrameBuffer. Gives read-only view of the frame together with its sequence number.
+    Every receiver of the handle has to call release() when it does not need the frame anymore, after then
+    the slot may be overwritten by a newer frame.
+    """
+
+    def __init__(self, buffer, slot, seq, image):
+        """
+        :param buffer: FrameBuffer owning this frame
+        :param slot: index of slot in buffer, None if the frame is not stored in preallocated slot
+        :param seq: sequence number of the frame
+        :param image: read-only view of the frame
+        """
+
+        self._buffer = buffer
+        self._slot = slot
+        self._seq = seq
+        self._image = image
+
+    @property
+    def seq(self):
+        """
+        :return: sequence number of frame
+        """
+
+        return self._seq
+
+    @property
+    def slot(self):
+        """
+        :return: slot index inside of FrameBuffer
+        """
+
+        return self._slot
+
+    @property
+    def image(self):
+        """
+        :return: read-only view of the frame
+        """
+
+        return self._image
+
+    def retain(self):
+        """
+        Adds new reference to the frame, used before the frame is passed to another receiver.
+        """
+
+        if self._buffer is not None:
+            self._buffer.retain(self._slot)
+
+    def release(self):
+        """
+        Removes reference to the frame. When all references are removed the slot is recycled.
+        """
+
+        if self._buffer is not None:
+            self._buffer.release(self._slot)
+
+    def __reduce__(self):
+        """
+        Frames stored in shared buffer are transferred between processes only by slot index,
+        other frames are transferred with their data.
+        """
+
+        if self._slot is not None and self._buffer.shared:
+            return _attach_frame, (self._buffer.id, self._slot, self._seq)
+
+        return _standalone_frame, (self._seq, np.array(self._image))
+
+
+class FrameBuffer:
+    """
+    Ring of preallocated frame slots shared by all receivers of FrameLoader. Each slot is reference counted
+    and it is recycled after every receiver releases it, so a decoded frame is copied only once and all
+    receivers read the same memory.
+    If no slot is free, a new standalone frame is allocated instead, so the producer is never blocked by a slow or
+    stopped receiver.
+
+    Shared buffer is allocated in shared memory, so receivers computed in another process (forked after
+    the buffer was created) read frames without copying them.
+    """
+
+    shared_buffers = {}
+
+    def __init__(self, slots, height, width, channels=3, shared=False):
+        """
+        :param slots: number of preallocated slots
+        :param height: height of stored frames
+        :param width: width of stored frames
+        :param channels: number of channels of stored frames
+        :param shared: if the buffer should be accessible from forked processes
+        """
+
+        shape = (slots, height, width, channels)
+
+        if shared:
+            context = multiprocessing.get_context("fork")
+
+            memory = context.RawArray(ctypes.c_uint8, int(np.prod(shape)))
+            self._frames = np.frombuffer(memory, dtype=np.uint8).reshape(shape)
+            self._references = context.RawArray(ctypes.c_int, slots)
+            self._lock = context.Lock()
+
+            self._id = len(FrameBuffer.shared_buffers)
+            FrameBuffer.shared_buffers[self._id] = self
+
+        else:
+            self._frames = np.zeros(shape=shape, dtype=np.uint8)
+            self._references = [0] * slots
+            self._lock = Lock()
+            self._id = None
+
+        self._shared = shared
+        self._cursor = 0
+        self._overflow = 0
+
+    @property
+    def id(self):
+        """
+        :return: id of shared buffer, None if the buffer is not shared
+        """
+
+        return self._id
+
+    @property
+    def shared(self):
+        """
+        :return: if the buffer is allocated in shared memory
+        """
+
+        return self._shared
+
+    @property
+    def size(self):
+        """
+        :return: number of preallocated slots
+        """
+
+        return len(self._references)
+
+    @property
+    def free_slots(self):
+        """
+        :return: number of slots which are not referenced by anyone
+        """
+
+        with self._lock:
+            return sum(1 for references in self._references if references == 0)
+
+    @property
+    def overflow(self):
+        """
+        :return: number of frames which had to be allocated outside of preallocated slots
+        """
+
+        return self._overflow
+
+    def frame(self, slot, seq) -> SharedFrame:
+        """
+        :param slot: selected slot
+        :param seq: sequence number of frame stored in slot
+        :return: handle of frame stored in selected slot
+        """
+
+        view = self._frames[slot].view()
+        view.flags.writeable = False
+
+        return SharedFrame(buffer=self, slot=slot, seq=seq, image=view)
+
+    def write(self, seq, image) -> SharedFrame:
+        """
+        Copies given image into next free slot. Returned frame holds one reference owned by the caller.
+
+        :param seq: sequence number of the frame
+        :param image: image to store
+        :return: handle of stored frame
+        """
+
+        slot = None
+
+        if image.shape == self._frames.shape[1:]:
+            with self._lock:
+                for offset in range(self.size):
+                    candidate = (self._cursor + offset) % self.size
+
+                    if self._references[candidate] == 0:
+                        self._references[candidate] = 1
+                        self._cursor = (candidate + 1) % self.size
+                        slot = candidate
+                        break
+
+        if slot is None:
+            self._overflow += 1
+            return _standalone_frame(seq, np.copy(image))
+
+        np.copyto(self._frames[slot], image)
+
+        return self.frame(slot, seq)
+
+    def retain(self, slot):
+        """
+        Adds reference to selected slot.
+
+        :param slot: selected slot
+        """
+
+        if slot is None:
+            return
+
+        with self._lock:
+            self._references[slot] += 1
+
+    def release(self, slot):
+        """
+        Removes reference from selected slot, if no reference is left the slot is free to be overwritten.
+
+        :param slot: selected slot
+        """
+
+        if slot is None:
+            return
+
+        with self._lock:
+            self._references[slot] -= 1
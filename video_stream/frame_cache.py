@@ -0,0 +1,102 @@
+"""
+FrameCache class definition
+"""
+
+__author__ = "Miroslav Karpisek"
+__email__ = "xkarpi05@stud.fit.vutbr.cz"
+__date__ = "14.5.2019"
+
+import numpy as np
+
+from collections import OrderedDict
+
+
+class FrameCache:
+    """
+    On-disk cache of decoded (and downscaled) frames stored in memory mapped raw array. Frames are keyed
+    by their sequence number in input video, so repeated passes through video do not have to decode it again.
+    When the cache is full, least recently used frame is replaced.
+    """
+
+    def __init__(self, path, capacity, height, width, channels=3):
+        """
+        :param path: path of file used for storing frames, it is overwritten
+        :param capacity: maximal number of cached frames
+        :param height: height of cached frames
+        :param width: width of cached frames
+        :param channels: number of channels of cached frames
+        """
+
+        self._frames = np.memmap(path, dtype=np.uint8, mode="w+", shape=(capacity, height, width, channels))
+        self._slots = OrderedDict()
+        self._free_slots = list(range(capacity))[::-1]
+
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def capacity(self):
+        """
+        :return: maximal number of cached frames
+        """
+
+        return len(self._frames)
+
+    @property
+    def hits(self):
+        """
+        :return: number of frames found in cache
+        """
+
+        return self._hits
+
+    @property
+    def misses(self):
+        """
+        :return: number of frames not found in cache
+        """
+
+        return self._misses
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, seq):
+        return seq in self._slots
+
+    def get(self, seq):
+        """
+        :param seq: sequence number of frame in input video
+        :return: copy of cached frame, None if frame is not cached
+        """
+
+        slot = self._slots.get(seq)
+
+        if slot is None:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        self._slots.move_to_end(seq)
+
+        return np.array(self._frames[slot])
+
+    def put(self, seq, frame):
+        """
+        Stores frame into cache, least recently used frame is replaced if cache is full.
+        Frames of different shape are not cached.
+
+        :param seq: sequence number of frame in input video
+        :param frame: decoded frame
+        """
+
+        if seq in self._slots or frame.shape != self._frames.shape[1:]:
+            return
+
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            _, slot = self._slots.popitem(last=False)
+
+        self._frames[slot] = frame
+        self._slots[seq] = slot
@@ -0,0 +1,148 @@
+"""
+FrameHistory class definition
+"""
+
+__author__ = "Miroslav Karpisek"
+__email__ = "xkarpi05@stud.fit.vutbr.cz"
+__date__ = "14.5.2019"
+
+import numpy as np
+
+from threading import Lock
+
+
+class HistoryFrame:
+    """
+    Frame stored in one slot of FrameHistory. Gives read-only view of the frame. Holder of a reference (e.g. encoder
+    which has not written the frame yet) calls retain() and release(), referenced frame is never overwritten.
+    """
+
+    def __init__(self, height, width, channels):
+        """
+        :param height: height of frame
+        :param width: width of frame
+        :param channels: number of channels of frame
+        """
+
+        self._buffer = np.zeros(shape=(height, width, channels), dtype=np.uint8)
+        self._image = self._buffer.view()
+        self._image.flags.writeable = False
+        self._references = 0
+        self._lock = Lock()
+
+    @property
+    def image(self):
+        """
+        :return: read-only view of the frame
+        """
+
+        return self._image
+
+    @property
+    def referenced(self):
+        """
+        :return: if any holder still uses the frame
+        """
+
+        return self._references > 0
+
+    def retain(self):
+        """
+        Adds new reference to the frame.
+        """
+
+        with self._lock:
+            self._references += 1
+
+    def release(self):
+        """
+        Removes reference to the frame.
+        """
+
+        with self._lock:
+            self._references -= 1
+
+    def write(self, image):
+        """
+        :param image: new content of the frame
+        """
+
+        np.copyto(self._buffer, image)
+
+
+class FrameHistory:
+    """
+    Preallocated circular history of last frames indexed by sequence number. Together with each frame
+    a compact annotation (snapshot of bounding boxes and light state) is stored.
+
+    Readers get read-only HistoryFrames, so ranges of history can be shared without copying.
+    Frame is valid until the same slot is overwritten by frame with sequence number greater by length of history.
+    Frame retained at that moment is kept and the slot gets new buffer instead.
+    """
+
+    def __init__(self, length, height, width, channels=3):
+        """
+        :param length: number of stored frames
+        :param height: height of stored frames
+        :param width: width of stored frames
+        :param channels: number of channels of stored frames
+        """
+
+        self._frames = [HistoryFrame(height, width, channels) for _ in range(length)]
+        self._seqs = np.full(shape=length, fill_value=-1, dtype=np.int64)
+        self._annotations = [None] * length
+
+    @property
+    def length(self):
+        """
+        :return: maximal number of stored frames
+        """
+
+        return len(self._seqs)
+
+    def append(self, seq, image, boxes_repository, lights_state):
+        """
+        Copies frame into slot selected by its sequence number, oldest frame is overwritten unless it is retained.
+
+        :param seq: sequence number of frame
+        :param image: frame
+        :param boxes_repository: snapshot of bounding boxes on the frame
+        :param lights_state: light state on the frame
+        """
+
+        slot = seq % self.length
+
+        frame = self._frames[slot]
+
+        if frame.referenced:
+            frame = self._frames[slot] = HistoryFrame(*frame.image.shape)
+
+        frame.write(image)
+        self._seqs[slot] = seq
+        self._annotations[slot] = boxes_repository, lights_state
+
+    def __contains__(self, seq):
+        return seq >= 0 and self._seqs[seq % self.length] == seq
+
+    def package(self, seq):
+        """
+        :param seq: sequence number of frame
+        :raise KeyError if frame is not stored in history anymore
+        :return: package of HistoryFrame, snapshot of bounding boxes and light state
+        """
+
+        if seq not in self:
+            raise KeyError(seq)
+
+        boxes_repository, lights_state = self._annotations[seq % self.length]
+
+        return self._frames[seq % self.length], boxes_repository, lights_state
+
+    def packages(self, first_seq, last_seq):
+        """
+        :param first_seq: first sequence number of range
+        :param last_seq: last sequence number of range (included)
+        :return: packages of all frames from selected range which are stored in history
+        """
+
+        return [self.package(seq) for seq in range(first_seq, last_seq + 1) if seq in self]
@@ -1,16 +1,16 @@
 """
 FrameLoader class definition
 """
-from primitives.enums import Mode
+from primitives.enums import CalibrationMode, Mode
 
 __author__ = "Miroslav Karpisek"
 __email__ = "xkarpi05@stud.fit.vutbr.cz"
 __date__ = "14.5.2019"
 
-import numpy as np
 from primitives import constants
 
 from pipeline.base.pipeline import is_frequency, ThreadedPipeBlock
+from video_stream.frame_buffer import FrameBuffer
 
 
 class FrameLoader(ThreadedPipeBlock):
@@ -27,13 +27,25 @@ class FrameLoader(ThreadedPipeBlock):
         """
         super().__init__(info=info, pipe_id=constants.FRAME_LOADER_ID, output=output)
 
+        shared = self.in_process or any(pipe.in_process for pipe in self._output.values())
+
+        self._frame_buffer = FrameBuffer(slots=constants.FRAME_LOADER_BUFFER_SLOTS,
+                                         height=info.height,
+                                         width=info.width,
+                                         shared=shared)
+
     def _before(self):
         """
         Before computation is done, where no traffic light is selected by user. T
         he first 200th frame is take and calls traffic lights repository for automatic
         detection of traffic light on that frame.
+
+        If calibration was loaded from file, computation starts directly in detection mode.
         """
 
+        if self._info.calibration_mode == CalibrationMode.LOADED and self._info.calibrated:
+            self._update_mode(Mode.DETECTION)
+
         if not self._info.traffic_lights_repository.ready:
 
             for _ in range(200):
@@ -46,21 +58,33 @@ class FrameLoader(ThreadedPipeBlock):
 
     def _mode_changed(self, new_mode):
         """
-        Reopens video file when mode is changed
+        Reopens video file when mode is changed.
+        When detection starts, car detector computed in own process receives found calibration, because its copy
+        of InputInfo was taken before calibration.
 
         :param new_mode: new mode
         """
 
         super()._mode_changed(new_mode)
 
+        self._info.detection_scheduler.restart()
+
         if new_mode in [Mode.DETECTION, Mode.CALIBRATION_CORRIDORS]:
             self._info.reopen()
 
+        detector = self._output.get(constants.DETECTOR_CAR_ID)
+
+        if new_mode == Mode.DETECTION and detector is not None and detector.in_process:
+            self.send(self._info.get_calibration(), pipe_id=constants.DETECTOR_CAR_ID)
+
     def _step(self, seq):
         """
         Reads new image from input video.
-        Creates copies of it and sends them to all outputs if current sequence number satisfies desired frequency
-        for certain receiver.
+        Stores it into shared frame buffer and sends handle of the stored frame to all outputs if current sequence
+        number satisfies desired frequency for certain receiver. Each receiver is responsible for releasing
+        received frame.
+        Frames for car detection are selected by detection scheduler. Tracker receives message on every frame
+        with decision of scheduler, so it knows when to wait for detections.
 
         :param seq: current sequence number
         """
@@ -71,35 +95,62 @@ class FrameLoader(ThreadedPipeBlock):
         if self._mode == Mode.CALIBRATION_CORRIDORS and self._info.calibrated:
             self._update_mode(Mode.DETECTION)
 
-        image = self._info.read()
+        frame = self._frame_buffer.write(seq, self._info.read())
 
         if is_frequency(seq, constants.VIDEO_PLAYER_FREQUENCY):
-            message = (seq, np.copy(image))
-            self.send(message, pipe_id=constants.VIDEO_PLAYER_ID)
+            self._send_frame(frame, pipe_id=constants.VIDEO_PLAYER_ID)
 
         if is_frequency(seq, constants.TRAFFIC_LIGHT_OBSERVER_FREQUENCY):
-            message = (seq, np.copy(image))
-            self.send(message, pipe_id=constants.TRAFFIC_LIGHT_OBSERVER_ID)
+            self._send_frame(frame, pipe_id=constants.TRAFFIC_LIGHT_OBSERVER_ID)
 
         if is_frequency(seq, constants.CALIBRATOR_FREQUENCY):
-            message = (seq, np.copy(image))
-            self.send(message, pipe_id=constants.CALIBRATOR_ID, block=False)
+            self._send_frame(frame, pipe_id=constants.CALIBRATOR_ID, block=False)
 
-        if is_frequency(seq, constants.TRACKER_OPTICAL_FLOW_FREQUENCY):
-            message = (seq, np.copy(image))
-            self.send(message, pipe_id=constants.TRACKER_ID)
+        detect = self._info.detection_scheduler.due(seq, self._mode)
 
-        if is_frequency(seq, constants.DETECTOR_CAR_FREQUENCY):
-            message = (seq, np.copy(image))
-            self.send(message, pipe_id=constants.DETECTOR_CAR_ID)
+        if detect:
+            self._send_frame(frame, pipe_id=constants.DETECTOR_CAR_ID)
+
+        tracker_frame = frame if is_frequency(seq, constants.TRACKER_OPTICAL_FLOW_FREQUENCY) else None
+        self._send_frame(tracker_frame, pipe_id=constants.TRACKER_ID, message=(seq, tracker_frame, detect))
 
         if is_frequency(seq, constants.VIOLATION_WRITER_FREQUENCY):
-            message = (seq, np.copy(image))
-            self.send(message, pipe_id=constants.VIOLATION_WRITER_ID)
+            self._send_frame(frame, pipe_id=constants.VIOLATION_WRITER_ID)
+
+        frame.release()
+
+    def _send_frame(self, frame, pipe_id, block=True, message=None):
+        """
+        Sends handle of shared frame to selected receiver. Reference is added for the receiver and it is removed
+        again if the message was not delivered. Nothing is done if the receiver is not connected.
+
+        :param frame: shared frame to send, None if message does not contain any frame
+        :param pipe_id: id of receiver
+        :param block: if sending message should wait until receiver could receive
+        :param message: message containing the frame, (sequence number, frame) if None
+        """
+
+        if pipe_id not in self._output:
+            return
+
+        if message is None:
+            message = (frame.seq, frame)
+
+        if frame is not None:
+            frame.retain()
+
+        if not self.send(message, pipe_id=pipe_id, block=block) and frame is not None:
+            frame.release()
 
     def _after(self):
         """
         Delegates message containing EOFError class used for signalization for the end of input video.
+        Without VideoPlayer (headless mode) the end of input is delegated directly to ViolationWriter.
         """
 
-        self.send(EOFError, pipe_id=constants.VIDEO_PLAYER_ID)
+        if constants.VIDEO_PLAYER_ID in self._output:
+            self.send(EOFError, pipe_id=constants.VIDEO_PLAYER_ID)
+
+        else:
+            self._update_mode(Mode.SIGNAL)
+            self.send(EOFError, pipe_id=constants.VIOLATION_WRITER_ID)
@@ -0,0 +1,123 @@
+"""
+FramePrefetcher class definition
+"""
+
+__author__ = "Miroslav Karpisek"
+__email__ = "xkarpi05@stud.fit.vutbr.cz"
+__date__ = "14.5.2019"
+
+import cv2
+
+from queue import Queue, Empty, Full
+from threading import Thread, Event
+
+
+class FramePrefetcher:
+    """
+    Decodes frames of opened video in own thread ahead of their use. Frames which are thrown away because of
+    high fps of video are only grabbed and never decoded. Frames are resized into preallocated rotating buffers.
+
+    Decoding thread holds up to read_ahead frames in queue and one frame being decoded, so the pool has
+    2 * read_ahead + 2 buffers and a buffer is reused only after the reader has taken another read_ahead + 1
+    frames. Returned frame stays valid until then.
+    """
+
+    def __init__(self, capture, skip, size, read_ahead):
+        """
+        :param capture: opened cv2.VideoCapture, it must not be used by anyone else until the prefetcher is stopped
+        :param skip: number of frames thrown away before each returned frame
+        :param size: (width, height) of returned frames, None if frames should not be resized
+        :param read_ahead: maximal number of decoded frames waiting for reader
+        """
+
+        self._capture = capture
+        self._skip = skip
+        self._size = size
+
+        self._queue = Queue(maxsize=read_ahead)
+        self._buffers = [None] * (2 * read_ahead + 2)
+        self._stopped = Event()
+        self._eof = False
+
+        self._thread = Thread(target=self._decode, daemon=True)
+        self._thread.start()
+
+    def read(self):
+        """
+        :raise EOFError when end of input
+        :return: next frame
+        """
+
+        if self._eof:
+            raise EOFError
+
+        frame = self._queue.get()
+
+        if frame is EOFError:
+            self._eof = True
+            raise EOFError
+
+        return frame
+
+    def stop(self):
+        """
+        Stops decoding thread, after then the capture can be used by anyone else.
+        """
+
+        self._stopped.set()
+
+        try:
+            while True:
+                self._queue.get_nowait()
+        except Empty:
+            pass
+
+        self._thread.join()
+
+    def _put(self, item):
+        """
+        Waits for free space in queue while the prefetcher is not stopped.
+
+        :param item: item to put to queue
+        :return: if item was put to queue
+        """
+
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+
+        return False
+
+    def _decode(self):
+        """
+        Main loop of decoding thread.
+        """
+
+        decoded = None
+        index = 0
+
+        while not self._stopped.is_set():
+            for _ in range(self._skip):
+                self._capture.grab()
+
+            # queue is bounded, so the reader has taken at least read_ahead + 1 frames after the overwritten one
+            if self._size is None:
+                status, frame = self._capture.read(self._buffers[index])
+            else:
+                status, decoded = self._capture.read(decoded)
+
+                if status:
+                    frame = cv2.resize(decoded, self._size, dst=self._buffers[index])
+
+            if not status:
+                self._put(EOFError)
+                return
+
+            self._buffers[index] = frame
+            index = (index + 1) % len(self._buffers)
+
+            if not self._put(frame):
+                return
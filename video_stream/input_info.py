@@ -1,9 +1,12 @@
 """
 InputInfo class definition
 """
+from pipeline.detection_scheduler import DetectionScheduler
+from pipeline.model_registry import ModelRegistry
 from primitives.area import Area
 from primitives.coordinates import Coordinates
 from primitives.enums import CalibrationMode, Color
+from primitives.vanishing_point import VanishingPoint
 from video_stream.video_info import VideoInfo
 
 __author__ = "Miroslav Karpisek"
@@ -11,6 +14,7 @@ __email__ = "xkarpi05@stud.fit.vutbr.cz"
 __date__ = "14.5.2019"
 
 import cv2
+import json
 import numpy as np
 from primitives import constants
 
@@ -26,16 +30,23 @@ class Info(VideoInfo):
     This class holds informations for example about detected vanishing points, corridors etc.
     """
 
-    def __init__(self, video_path, light_detection_model, program_arguments):
+    def __init__(self, video_path, light_detection_model, program_arguments, model_registry=None):
         """
         :param video_path: input video path
         :param light_detection_model: path to the light detection model
         :param program_arguments: instance of Parser class containing program arguments
+        :param model_registry: registry of detection models shared with other streams, new one is created if None
         """
 
-        super().__init__(video_path)
+        super().__init__(video_path, frame_cache_path=program_arguments.frame_cache)
 
         self._vanishing_points = []
+
+        if model_registry is None:
+            model_registry = ModelRegistry(backend=program_arguments.backend)
+
+        self._model_registry = model_registry
+        self._detection_scheduler = DetectionScheduler()
         self._traffic_lights_repository = TrafficLightsRepository(model=light_detection_model, info=self)
         self._corridors_repository = TrafficCorridorRepository(self)
 
@@ -55,7 +66,10 @@ class Info(VideoInfo):
                                          bottom_left=Coordinates(0, self.height))
 
         # solve given program arguments
-        self._solve_program_arguments(program_arguments)
+        if program_arguments.calibration is not None:
+            self.load_calibration(program_arguments.calibration)
+        else:
+            self._solve_program_arguments(program_arguments)
 
         print(f"INFO: fps: {self.fps}, height: {self.height}, width: {self.width}, frame count: {self.frame_count}")
 
@@ -89,6 +103,22 @@ class Info(VideoInfo):
         else:
             return self.vanishing_points[1]
 
+    @property
+    def model_registry(self):
+        """
+        :return: registry of lazily loaded detection models
+        """
+
+        return self._model_registry
+
+    @property
+    def detection_scheduler(self):
+        """
+        :return: scheduler deciding on which frames cars are detected
+        """
+
+        return self._detection_scheduler
+
     @property
     def traffic_lights_repository(self):
         """
@@ -307,6 +337,33 @@ class Info(VideoInfo):
 
         return data
 
+    def load_calibration(self, path):
+        """
+        Restores vanishing points, corridors, stop line and traffic lights from calibration file written
+        after previous computation, so the detection can start without calibration.
+
+        :param path: path of calibration file
+        """
+
+        with open(path, "r") as file:
+            data = json.load(file)
+
+        self.restore_calibration(data)
+
+        self._calibration_mode = CalibrationMode.LOADED
+
+    def restore_calibration(self, data):
+        """
+        Restores vanishing points, corridors, stop line and traffic lights serialized by get_calibration().
+        Used by PipeBlocks computed in own process to receive calibration found after their process was forked.
+
+        :param data: dictionary of serialized data
+        """
+
+        self._vanishing_points = [VanishingPoint.deserialize(vp) for vp in data["vanishing points"]]
+        self._traffic_lights_repository.deserialize(data)
+        self._corridors_repository.deserialize(data)
+
 
 
 
@@ -0,0 +1,184 @@
+"""
+LiveSource class definition
+"""
+
+__author__ = "Miroslav Karpisek"
+__email__ = "xkarpi05@stud.fit.vutbr.cz"
+__date__ = "14.5.2019"
+
+import re
+import cv2
+import numpy as np
+
+from threading import Thread, Condition
+
+LIVE_PREFIXES = ("rtsp://", "rtmp://", "http://", "https://", "raw:")
+RAW_PATTERN = re.compile(r"^raw:(?P<width>\d+)x(?P<height>\d+)(@(?P<fps>\d+))?:(?P<path>.+)$")
+
+
+def is_live(video_path):
+    """
+    :param video_path: path of input video stream
+    :return: if the input is live stream (network stream or raw frames on pipe), which can not be rewound
+    """
+
+    return video_path.lower().startswith(LIVE_PREFIXES)
+
+
+def parse_raw(video_path):
+    """
+    Raw frames are specified as raw:WIDTHxHEIGHT[@FPS]:PATH, where PATH is named pipe or file, "-" for stdin.
+    Frames are expected in BGR order, 3 bytes per pixel.
+
+    :param video_path: path of input video stream
+    :return: width, height, fps (None if not given) and path of raw input, None if input is not raw
+    """
+
+    match = RAW_PATTERN.match(video_path)
+
+    if match is None:
+        return None
+
+    fps = int(match.group("fps")) if match.group("fps") is not None else None
+
+    return int(match.group("width")), int(match.group("height")), fps, match.group("path")
+
+
+class RawFrameReader:
+    """
+    Reads raw BGR frames of fixed size from binary stream. Provides the same read() as cv2.VideoCapture.
+    """
+
+    def __init__(self, stream, width, height):
+        """
+        :param stream: binary stream (opened pipe, file or stdin buffer)
+        :param width: width of frames
+        :param height: height of frames
+        """
+
+        self._stream = stream
+        self._shape = (height, width, 3)
+
+    def read(self):
+        """
+        :return: status, frame - status is False when stream ends, incomplete frame at the end is thrown away
+        """
+
+        frame = np.empty(shape=self._shape, dtype=np.uint8)
+        buffer = memoryview(frame).cast("B")
+        received = 0
+
+        while received < len(buffer):
+            count = self._stream.readinto(buffer[received:])
+
+            if not count:
+                return False, None
+
+            received += count
+
+        return True, frame
+
+    def release(self):
+        """
+        Closes the stream.
+        """
+
+        self._stream.close()
+
+
+class LiveSource:
+    """
+    Receives frames of live stream in own thread and keeps only the latest one (latest frame wins).
+    When the reader falls behind, stale frames are dropped, so latency between the source and the reader
+    is bounded by one frame.
+    """
+
+    def __init__(self, capture, size=None):
+        """
+        :param capture: opened cv2.VideoCapture or RawFrameReader, it must not be used by anyone else
+        :param size: (width, height) of returned frames, None if frames should not be resized
+        """
+
+        self._capture = capture
+        self._size = size
+
+        self._condition = Condition()
+        self._frame = None
+        self._eof = False
+        self._stopped = False
+
+        self._received = 0
+        self._dropped = 0
+
+        self._thread = Thread(target=self._receive, daemon=True)
+        self._thread.start()
+
+    @property
+    def received(self):
+        """
+        :return: number of frames received from source
+        """
+
+        return self._received
+
+    @property
+    def dropped(self):
+        """
+        :return: number of frames replaced by newer frame before they were read
+        """
+
+        return self._dropped
+
+    def read(self):
+        """
+        Waits for frame which was not read yet.
+
+        :raise EOFError when the stream ends
+        :return: the latest frame
+        """
+
+        with self._condition:
+            while self._frame is None and not self._eof:
+                self._condition.wait()
+
+            if self._frame is None:
+                raise EOFError
+
+            frame, self._frame = self._frame, None
+
+        return frame
+
+    def stop(self):
+        """
+        Stops receiving thread after the frame it is waiting for. Thread is not joined, reading from live source
+        may block for unlimited time.
+        """
+
+        self._stopped = True
+
+    def _receive(self):
+        """
+        Main loop of receiving thread.
+        """
+
+        while not self._stopped:
+            status, frame = self._capture.read()
+
+            if status and self._size is not None:
+                frame = cv2.resize(frame, self._size)
+
+            with self._condition:
+                if not status:
+                    self._eof = True
+
+                else:
+                    if self._frame is not None:
+                        self._dropped += 1
+
+                    self._frame = frame
+                    self._received += 1
+
+                self._condition.notify_all()
+
+            if not status:
+                return
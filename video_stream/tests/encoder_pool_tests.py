@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+import cv2
+import numpy as np
+
+from threading import Event
+
+from video_stream.encoder_pool import EncoderPool
+
+
+class Frame:
+    def __init__(self, image):
+        self.image = image
+        self.references = 0
+
+    def retain(self):
+        self.references += 1
+
+    def release(self):
+        self.references -= 1
+
+
+class StalledEncoderPool(EncoderPool):
+    resume = Event()
+
+    @staticmethod
+    def _work(queue):
+        StalledEncoderPool.resume.wait()
+        EncoderPool._work(queue)
+
+
+class EncoderPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.frame = Frame(np.zeros(shape=(48, 64, 3), dtype=np.uint8))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def frame_count(self, clip_id):
+        capture = cv2.VideoCapture(os.path.join(self.directory.name, f"{clip_id}.avi"))
+        count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        capture.release()
+
+        return count
+
+    def test_clips_written(self):
+        pool = EncoderPool(workers=2, queue_size=4, policy="block")
+
+        for clip_id in ["1", "2", "3"]:
+            pool.open(clip_id, os.path.join(self.directory.name, f"{clip_id}.avi"), 10, (64, 48))
+
+        frames = [Frame(self.frame.image + index) for index in range(10)]
+
+        for frame in frames:
+            for clip_id in ["1", "2", "3"]:
+                self.assertTrue(pool.write(clip_id, frame))
+
+        for clip_id in ["1", "2", "3"]:
+            pool.close_clip(clip_id)
+
+        pool.close()
+
+        self.assertEqual(pool.queue_depth, 0)
+        self.assertEqual([frame.references for frame in frames], [0] * 10)
+        self.assertEqual([self.frame_count(clip_id) for clip_id in ["1", "2", "3"]], [10, 10, 10])
+
+    def test_drop_policy(self):
+        pool = StalledEncoderPool(workers=1, queue_size=3, policy="drop")
+        pool.open("1", os.path.join(self.directory.name, "1.avi"), 10, (64, 48))
+
+        accepted = [pool.write("1", self.frame) for _ in range(5)]
+
+        self.assertEqual(accepted, [True, True, False, False, False])
+        self.assertEqual(pool.dropped, 3)
+        self.assertEqual(pool.queue_depths, [3])
+        self.assertEqual(self.frame.references, 2)
+
+        StalledEncoderPool.resume.set()
+        pool.close_clip("1")
+        pool.close()
+
+        self.assertEqual(self.frame_count("1"), 2)
+        self.assertEqual(self.frame.references, 0)
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            EncoderPool(workers=1, policy="wait")
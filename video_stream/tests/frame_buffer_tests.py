@@ -0,0 +1,52 @@
+import unittest
+import numpy as np
+
+from video_stream.frame_buffer import FrameBuffer
+
+
+class FrameBufferTests(unittest.TestCase):
+    def test_read_only_view(self):
+        buffer = FrameBuffer(slots=2, height=4, width=6)
+        image = np.full(shape=(4, 6, 3), fill_value=7, dtype=np.uint8)
+
+        frame = buffer.write(1, image)
+
+        self.assertEqual(frame.seq, 1)
+        self.assertTrue(np.array_equal(frame.image, image))
+        with self.assertRaises(ValueError):
+            frame.image[0][0][0] = 0
+
+    def test_recycle_after_release(self):
+        buffer = FrameBuffer(slots=1, height=4, width=6)
+        image = np.zeros(shape=(4, 6, 3), dtype=np.uint8)
+
+        frame = buffer.write(1, image)
+        frame.retain()
+        frame.release()
+        self.assertEqual(buffer.free_slots, 0)
+
+        frame.release()
+        self.assertEqual(buffer.free_slots, 1)
+
+    def test_overflow(self):
+        buffer = FrameBuffer(slots=1, height=4, width=6)
+        image = np.zeros(shape=(4, 6, 3), dtype=np.uint8)
+
+        first = buffer.write(1, image)
+        second = buffer.write(2, image + 1)
+
+        self.assertIsNone(second.slot)
+        self.assertEqual(buffer.overflow, 1)
+        self.assertEqual(first.image.max(), 0)
+        self.assertEqual(second.image.max(), 1)
+
+        second.release()
+        first.release()
+        self.assertEqual(buffer.free_slots, 1)
+
+    def test_different_shape(self):
+        buffer = FrameBuffer(slots=1, height=4, width=6)
+        frame = buffer.write(1, np.zeros(shape=(2, 2, 3), dtype=np.uint8))
+
+        self.assertIsNone(frame.slot)
+        self.assertEqual(buffer.free_slots, 1)
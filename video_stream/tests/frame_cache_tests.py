@@ -0,0 +1,41 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from video_stream.frame_cache import FrameCache
+
+
+class FrameCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = FrameCache(path=os.path.join(self.directory.name, "cache.raw"), capacity=2, height=2, width=3)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def frame(self, value):
+        return np.full(shape=(2, 3, 3), fill_value=value, dtype=np.uint8)
+
+    def test_get(self):
+        self.cache.put(4, self.frame(4))
+
+        self.assertTrue(np.array_equal(self.cache.get(4), self.frame(4)))
+        self.assertIsNone(self.cache.get(5))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_least_recently_used_replaced(self):
+        self.cache.put(1, self.frame(1))
+        self.cache.put(2, self.frame(2))
+        self.cache.get(1)
+        self.cache.put(3, self.frame(3))
+
+        self.assertIn(1, self.cache)
+        self.assertNotIn(2, self.cache)
+        self.assertTrue(np.array_equal(self.cache.get(3), self.frame(3)))
+        self.assertEqual(len(self.cache), 2)
+
+    def test_different_shape(self):
+        self.cache.put(1, np.zeros(shape=(4, 4, 3), dtype=np.uint8))
+
+        self.assertNotIn(1, self.cache)
@@ -0,0 +1,46 @@
+import unittest
+import numpy as np
+
+from video_stream.frame_history import FrameHistory
+
+
+class FrameHistoryTests(unittest.TestCase):
+    def setUp(self):
+        self.history = FrameHistory(length=3, height=2, width=2)
+
+        for seq in range(1, 6):
+            self.history.append(seq, np.full(shape=(2, 2, 3), fill_value=seq, dtype=np.uint8), f"boxes {seq}", seq)
+
+    def test_oldest_overwritten(self):
+        self.assertNotIn(2, self.history)
+        self.assertIn(3, self.history)
+
+        with self.assertRaises(KeyError):
+            self.history.package(2)
+
+    def test_range(self):
+        packages = self.history.packages(0, 4)
+
+        self.assertEqual([package[1] for package in packages], ["boxes 3", "boxes 4"])
+        self.assertEqual(packages[0][0].image.max(), 3)
+
+    def test_read_only_view(self):
+        frame, _, _ = self.history.package(5)
+
+        with self.assertRaises(ValueError):
+            frame.image[0][0][0] = 0
+
+        self.history.append(8, np.zeros(shape=(2, 2, 3), dtype=np.uint8), None, None)
+        self.assertEqual(frame.image.max(), 0)
+
+    def test_retained_frame_kept(self):
+        frame, _, _ = self.history.package(5)
+        frame.retain()
+
+        self.history.append(8, np.zeros(shape=(2, 2, 3), dtype=np.uint8), None, None)
+
+        self.assertEqual(frame.image.max(), 5)
+        self.assertEqual(self.history.package(8)[0].image.max(), 0)
+
+        frame.release()
+        self.assertFalse(frame.referenced)
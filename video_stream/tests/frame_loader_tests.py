@@ -0,0 +1,94 @@
+import unittest
+import numpy as np
+
+from pipeline.base.pipeline import PipeBlock
+from pipeline.detection_scheduler import DetectionScheduler
+from primitives import constants
+from primitives.enums import Mode
+from video_stream.frame_loader import FrameLoader
+
+
+class CorridorsStub:
+    corridors_found = False
+
+
+class InfoStub:
+    width = 4
+    height = 3
+    calibrated = False
+    corridors_repository = CorridorsStub()
+
+    def __init__(self):
+        self.detection_scheduler = DetectionScheduler()
+        self.frames = 0
+
+    def reopen(self):
+        pass
+
+    def get_calibration(self):
+        return {"corridors": [], "stopline": None}
+
+    def read(self):
+        self.frames += 1
+        return np.full(shape=(self.height, self.width, 3), fill_value=self.frames, dtype=np.uint8)
+
+
+class Receiver(PipeBlock):
+    def __init__(self, pipe_id, work_modes=None):
+        super().__init__(info=None, pipe_id=pipe_id, work_modes=work_modes)
+
+    def envelope(self):
+        return self._input[constants.FRAME_LOADER_ID].get_nowait()
+
+
+class ProcessReceiver(Receiver):
+    @property
+    def in_process(self):
+        return True
+
+    def envelope(self):
+        return self._input[constants.FRAME_LOADER_ID].get(timeout=1)
+
+
+class FrameLoaderTests(unittest.TestCase):
+    def setUp(self):
+        self.info = InfoStub()
+        self.tracker = Receiver(constants.TRACKER_ID)
+        self.writer = Receiver(constants.VIOLATION_WRITER_ID, work_modes=[Mode.DETECTION])
+
+    def test_headless_end_of_input(self):
+        loader = FrameLoader(output=[self.tracker, self.writer], info=self.info)
+
+        loader._after()
+
+        self.assertEqual(self.writer.envelope(), (Mode.SIGNAL, EOFError))
+
+    def test_end_of_input_with_player(self):
+        player = Receiver(constants.VIDEO_PLAYER_ID)
+        loader = FrameLoader(output=[self.tracker, self.writer, player], info=self.info)
+
+        loader._after()
+
+        self.assertEqual(player.envelope(), (Mode.CALIBRATION_VP, EOFError))
+        self.assertTrue(self.writer._input[constants.FRAME_LOADER_ID].empty())
+
+    def test_tracker_message(self):
+        loader = FrameLoader(output=[self.tracker, self.writer], info=self.info)
+
+        for seq in range(1, 4):
+            loader._step(seq)
+
+        messages = [self.tracker.envelope()[1] for _ in range(3)]
+
+        self.assertEqual([seq for seq, _, _ in messages], [1, 2, 3])
+        self.assertEqual([detect for _, _, detect in messages], [False, False, True])
+        self.assertEqual([int(frame.image[0, 0, 0]) for _, frame, _ in messages], [1, 2, 3])
+
+    def test_calibration_sent_to_detector_in_process(self):
+        detector = ProcessReceiver(constants.DETECTOR_CAR_ID)
+        loader = FrameLoader(output=[self.tracker, detector], info=self.info)
+
+        loader._update_mode(Mode.CALIBRATION_CORRIDORS)
+        loader._update_mode(Mode.DETECTION)
+
+        self.assertEqual(detector.envelope(), (Mode.DETECTION, {"corridors": [], "stopline": None}))
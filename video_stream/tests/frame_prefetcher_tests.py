@@ -0,0 +1,57 @@
+import time
+import unittest
+import numpy as np
+
+from collections import deque
+
+from video_stream.frame_prefetcher import FramePrefetcher
+
+READ_AHEAD = 2
+
+
+class Capture:
+    def __init__(self, frames):
+        self._frames = frames
+        self._index = 0
+
+    def grab(self):
+        self._index += 1
+
+    def read(self, image=None):
+        if self._index >= self._frames:
+            return False, None
+
+        if image is None:
+            image = np.empty(shape=(2, 2, 3), dtype=np.uint8)
+
+        image[:] = self._index
+        self._index += 1
+
+        return True, image
+
+
+class FramePrefetcherTests(unittest.TestCase):
+    def test_frames(self):
+        prefetcher = FramePrefetcher(capture=Capture(frames=5), skip=1, size=None, read_ahead=READ_AHEAD)
+
+        self.assertEqual([prefetcher.read()[0, 0, 0] for _ in range(2)], [1, 3])
+
+        with self.assertRaises(EOFError):
+            prefetcher.read()
+
+        prefetcher.stop()
+
+    def test_frame_held_across_reads(self):
+        prefetcher = FramePrefetcher(capture=Capture(frames=50), skip=0, size=None, read_ahead=READ_AHEAD)
+        held = deque(maxlen=READ_AHEAD + 1)
+
+        for seq in range(40):
+            held.append((seq, prefetcher.read()))
+
+            # let decoding thread run ahead as far as it can
+            time.sleep(0.005)
+
+            for held_seq, frame in held:
+                self.assertTrue(np.all(frame == held_seq))
+
+        prefetcher.stop()
@@ -0,0 +1,69 @@
+import json
+import os
+import tempfile
+import unittest
+import cv2
+import numpy as np
+
+from primitives.enums import CalibrationMode
+from primitives.line import Line
+from primitives.parser import InputParser
+from video_stream.input_info import Info
+
+WIDTH = 64
+HEIGHT = 48
+
+
+def serialized(data):
+    return json.loads(json.dumps(data))
+
+
+class InfoTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.video_path = os.path.join(self.directory.name, "video.avi")
+
+        writer = cv2.VideoWriter(self.video_path, cv2.VideoWriter_fourcc('M', 'J', 'P', 'G'), 10, (WIDTH, HEIGHT))
+
+        for index in range(5):
+            writer.write(np.full(shape=(HEIGHT, WIDTH, 3), fill_value=index * 40, dtype=np.uint8))
+
+        writer.release()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def info(self, calibration):
+        path = os.path.join(self.directory.name, "calibration.json")
+
+        with open(path, "w") as file:
+            json.dump(calibration, file)
+
+        program_arguments = InputParser([f"--input={self.video_path}", f"--calibration={path}", "--headless"])
+
+        return Info(self.video_path, light_detection_model=None, program_arguments=program_arguments)
+
+    def test_save_and_load_calibration(self):
+        vanishing_point = (WIDTH // 2, -HEIGHT // 2)
+        corridors = [{"left_line": Line(point1=(left, HEIGHT - 1), point2=vanishing_point).serialize(),
+                      "right_line": Line(point1=(right, HEIGHT - 1), point2=vanishing_point).serialize()}
+                     for left, right in [(10, 30), (30, 50)]]
+
+        info = self.info({"vanishing points": [{"point": list(vanishing_point), "direction": None}],
+                          "traffic light": {"top left": [2, 2], "bottom right": [8, 20]},
+                          "corridors": corridors,
+                          "stopline": Line(point1=(0, 30), point2=(WIDTH - 1, 30)).serialize()})
+
+        calibration = serialized(info.get_calibration())
+        loaded = self.info(calibration)
+
+        self.assertTrue(loaded.calibrated)
+        self.assertEqual(loaded.calibration_mode, CalibrationMode.LOADED)
+        self.assertEqual(serialized(loaded.get_calibration()), calibration)
+
+        self.assertEqual(len(loaded.vanishing_points), 1)
+        self.assertEqual(tuple(loaded.vp1.point), vanishing_point)
+        self.assertEqual(calibration["traffic light"], {"top left": [2, 2], "bottom right": [8, 20]})
+        self.assertEqual(calibration["corridors"], serialized(corridors))
+        self.assertEqual(loaded.corridors_repository.stopline.serialize(),
+                         Line(point1=(0, 30), point2=(WIDTH - 1, 30)).serialize())
@@ -0,0 +1,124 @@
+import io
+import os
+import tempfile
+import time
+import unittest
+import numpy as np
+
+from threading import Thread
+
+from video_stream.live_source import LiveSource, RawFrameReader, is_live, parse_raw
+from video_stream.video_info import VideoInfo
+
+WIDTH = 8
+HEIGHT = 6
+
+
+def raw_frames(count):
+    return b"".join(np.full(shape=(HEIGHT, WIDTH, 3), fill_value=index, dtype=np.uint8).tobytes()
+                    for index in range(count))
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+
+    while not condition() and time.time() < deadline:
+        time.sleep(0.001)
+
+
+class LiveSourceTests(unittest.TestCase):
+    def test_parse(self):
+        self.assertTrue(is_live("rtsp://camera/stream"))
+        self.assertTrue(is_live("raw:8x6:-"))
+        self.assertFalse(is_live("videos/video.mp4"))
+
+        self.assertEqual(parse_raw("raw:640x480@25:/tmp/pipe"), (640, 480, 25, "/tmp/pipe"))
+        self.assertEqual(parse_raw("raw:640x480:-"), (640, 480, None, "-"))
+        self.assertIsNone(parse_raw("rtsp://camera/stream"))
+
+    def test_raw_frame_reader(self):
+        reader = RawFrameReader(io.BytesIO(raw_frames(2) + b"\x00" * 10), WIDTH, HEIGHT)
+
+        for index in range(2):
+            status, frame = reader.read()
+
+            self.assertTrue(status)
+            self.assertEqual(frame.shape, (HEIGHT, WIDTH, 3))
+            self.assertTrue((frame == index).all())
+
+        self.assertEqual(reader.read(), (False, None))
+
+    def test_latest_frame_wins(self):
+        source = LiveSource(RawFrameReader(io.BytesIO(raw_frames(5)), WIDTH, HEIGHT))
+
+        wait_for(lambda: source.received == 5)
+
+        self.assertTrue((source.read() == 4).all())
+        self.assertEqual(source.dropped, 4)
+
+        with self.assertRaises(EOFError):
+            source.read()
+
+    def test_resize(self):
+        source = LiveSource(RawFrameReader(io.BytesIO(raw_frames(1)), WIDTH, HEIGHT), size=(4, 3))
+
+        self.assertEqual(source.read().shape, (3, 4, 3))
+
+
+class LiveVideoInfoTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "camera")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_all(self, video_info):
+        frames = []
+
+        try:
+            while True:
+                frames.append(int(video_info.read()[0, 0, 0]))
+        except EOFError:
+            return frames
+
+    def test_file_backed_stream(self):
+        with open(self.path, "wb") as file:
+            file.write(raw_frames(20))
+
+        video_info = VideoInfo(f"raw:{WIDTH}x{HEIGHT}@10:{self.path}")
+
+        self.assertTrue(video_info.live)
+        self.assertEqual((video_info.width, video_info.height, video_info.fps), (WIDTH, HEIGHT, 10))
+        self.assertEqual(video_info.frame_count, 0)
+        self.assertEqual(video_info.filename, "camera")
+
+        first = int(video_info.read()[0, 0, 0])
+        video_info.reopen()
+        frames = [first] + self.read_all(video_info)
+
+        self.assertEqual(frames, sorted(set(frames)))
+        self.assertEqual(frames[-1], 19)
+        self.assertEqual(len(frames) + video_info.dropped_frames, 20)
+
+    @unittest.skipUnless(hasattr(os, "mkfifo"), "named pipes are not supported")
+    def test_pipe(self):
+        os.mkfifo(self.path)
+
+        def serve():
+            with open(self.path, "wb") as pipe:
+                for index in range(10):
+                    pipe.write(np.full(shape=(HEIGHT, WIDTH, 3), fill_value=index, dtype=np.uint8).tobytes())
+                    pipe.flush()
+                    time.sleep(0.005)
+
+        server = Thread(target=serve)
+        server.start()
+
+        video_info = VideoInfo(f"raw:{WIDTH}x{HEIGHT}:{self.path}")
+        frames = self.read_all(video_info)
+
+        server.join()
+
+        self.assertEqual(frames, sorted(set(frames)))
+        self.assertEqual(frames[-1], 9)
@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+import cv2
+import numpy as np
+
+from primitives import constants
+from video_stream.video_info import VideoInfo
+
+
+def reference_frames(path, skip, size):
+    capture = cv2.VideoCapture(path)
+    frames = []
+
+    while True:
+        status, frame = capture.read()
+
+        for _ in range(skip):
+            status, frame = capture.read()
+
+        if not status:
+            break
+
+        frames.append(cv2.resize(frame, size))
+
+    return frames
+
+
+class VideoInfoTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "video.avi")
+
+        writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc('M', 'J', 'P', 'G'), 60, (1280, 720))
+        for index in range(30):
+            writer.write(np.full(shape=(720, 1280, 3), fill_value=index * 8, dtype=np.uint8))
+        writer.release()
+
+        self.video_info = VideoInfo(self.path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_all(self):
+        frames = []
+
+        try:
+            while True:
+                frames.append(np.copy(self.video_info.read()))
+        except EOFError:
+            return frames
+
+    def test_skipped_frames(self):
+        skip = int(60 / constants.FRAME_LOADER_MAX_FPS)
+        expected = reference_frames(self.path, skip, (self.video_info.width, self.video_info.height))
+
+        frames = self.read_all()
+
+        self.assertEqual(len(frames), len(expected))
+        for frame, expected_frame in zip(frames, expected):
+            self.assertTrue(np.array_equal(frame, expected_frame))
+
+        with self.assertRaises(EOFError):
+            self.video_info.read()
+
+    def test_reopen(self):
+        first = self.video_info.read()
+        kept = np.copy(first)
+
+        self.video_info.read()
+        self.video_info.reopen()
+
+        self.assertTrue(np.array_equal(self.read_all()[0], kept))
+        self.assertTrue(np.array_equal(first, kept))
+
+    def test_frame_cache(self):
+        expected = self.read_all()
+
+        video_info = VideoInfo(self.path, frame_cache_path=os.path.join(self.directory.name, "cache.raw"))
+
+        for _ in range(3):
+            video_info.read()
+
+        video_info.reopen()
+        frames = []
+
+        try:
+            while True:
+                frames.append(np.copy(video_info.read()))
+        except EOFError:
+            pass
+
+        self.assertEqual(len(frames), len(expected))
+        for frame, expected_frame in zip(frames, expected):
+            self.assertTrue(np.array_equal(frame, expected_frame))
+
+        self.assertEqual(video_info._frame_cache.hits, 3)
@@ -1,30 +1,65 @@
 """
 VideoInfo class definition
 """
+import os
+import sys
 import cv2
 from primitives import constants
 
+from video_stream.frame_cache import FrameCache
+from video_stream.frame_prefetcher import FramePrefetcher
+from video_stream.live_source import LiveSource, RawFrameReader, is_live, parse_raw
+
 
 class VideoInfo:
     """
     Class handles operations on opened file. It encapsulates API around opened video-stream.
+
+    Live streams (rtsp, http or raw frames on pipe, see live_source) can not be rewound and their length is not known.
+    Their frames are received by LiveSource, which drops stale frames when computation falls behind.
     """
 
-    def __init__(self, video_path):
+    def __init__(self, video_path, frame_cache_path=None):
         """
         :param video_path: path of input video stream
+        :param frame_cache_path: path of file used for caching of decoded frames, None if frames should not be cached
         """
 
-        self._input = cv2.VideoCapture(video_path)
-        filename_with_extension = video_path.rsplit('/', 1)[1]
-        self._file_name = filename_with_extension.rsplit('.', 1)[0]
+        self._live = is_live(video_path)
+        self._live_source = None
+
+        raw = parse_raw(video_path)
+
+        if raw is not None:
+            width, height, fps, path = raw
+
+            self._input = RawFrameReader(stream=sys.stdin.buffer if path == "-" else open(path, "rb"),
+                                         width=width,
+                                         height=height)
+            self._file_name = "stdin" if path == "-" else self._stream_name(path)
+
+            self._fps = fps if fps is not None else constants.LIVE_SOURCE_DEFAULT_FPS
+            self._height = height
+            self._width = width
+
+        else:
+            self._input = cv2.VideoCapture(video_path)
+            self._file_name = self._stream_name(video_path)
+
+            if self._live:
+                self._input.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+            self._fps = self._input.get(cv2.CAP_PROP_FPS) or constants.LIVE_SOURCE_DEFAULT_FPS
+            self._height = self._input.get(cv2.CAP_PROP_FRAME_HEIGHT)
+            self._width = self._input.get(cv2.CAP_PROP_FRAME_WIDTH)
 
-        self._fps = self._input.get(cv2.CAP_PROP_FPS)
-        self._height = self._input.get(cv2.CAP_PROP_FRAME_HEIGHT)
-        self._width = self._input.get(cv2.CAP_PROP_FRAME_WIDTH)
         self._resize = False
 
-        self._frame_count = int(self._input.get(cv2.CAP_PROP_FRAME_COUNT) / (int(self._fps / constants.FRAME_LOADER_MAX_FPS) + 1))
+        if self._live:
+            self._frame_count = 0
+        else:
+            self._frame_count = int(self._input.get(cv2.CAP_PROP_FRAME_COUNT) / (int(self._fps / constants.FRAME_LOADER_MAX_FPS) + 1))
+
         self._ratio = self._height / self._width
 
         if self._width > constants.FRAME_LOADER_MAX_WIDTH:
@@ -32,6 +67,18 @@ class VideoInfo:
             self._height = int(constants.FRAME_LOADER_MAX_WIDTH * self._ratio)
             self._resize = True
 
+        self._prefetcher = None
+        self._prefetcher_position = 0
+        self._position = 0
+
+        self._frame_cache = None
+
+        if frame_cache_path is not None and not self._live:
+            self._frame_cache = FrameCache(path=frame_cache_path,
+                                           capacity=constants.FRAME_CACHE_SIZE,
+                                           height=self.height,
+                                           width=self.width)
+
     @property
     def filename(self):
         """
@@ -40,6 +87,22 @@ class VideoInfo:
 
         return self._file_name
 
+    @property
+    def live(self):
+        """
+        :return: if input is live stream
+        """
+
+        return self._live
+
+    @property
+    def dropped_frames(self):
+        """
+        :return: number of frames of live stream dropped because computation did not keep up, 0 for video files
+        """
+
+        return self._live_source.dropped if self._live_source is not None else 0
+
     @property
     def ratio(self):
         """
@@ -50,7 +113,7 @@ class VideoInfo:
     @property
     def frame_count(self):
         """
-        :return: frame count of opened video
+        :return: frame count of opened video, 0 if it is not known (live stream)
         """
 
         return self._frame_count
@@ -81,35 +144,95 @@ class VideoInfo:
 
     def read(self, width=None):
         """
-        Reads new frame from opened video.
+        Reads new frame from opened video. Frames are decoded ahead by FramePrefetcher.
         If number of frames per second of video is higher then
         specified by constant, it throws a number of them away.
 
+        If frame cache is used, frames read again after reopen are taken from the cache and decoder
+        seeks only to the first frame which is not cached.
+
+        Frame decoded by prefetcher stays valid until another FRAME_LOADER_READ_AHEAD + 1 frames are read, then its
+        buffer may be reused by prefetcher. Reopened video is decoded into new buffers.
+
+        Live stream returns the latest received frame, older frames which were not read are dropped.
+
         :raise EOFError when end of input
         :return: new frame
         """
 
-        status, frame = self._input.read()
+        frame = None
+
+        if self._live:
+            if self._live_source is None:
+                self._live_source = LiveSource(capture=self._input,
+                                               size=(self._width, self._height) if self._resize else None)
+
+            frame = self._live_source.read()
 
-        for _ in range(int(self.fps / constants.FRAME_LOADER_MAX_FPS)):
-            status, frame = self._input.read()
+        elif self._frame_cache is not None:
+            frame = self._frame_cache.get(self._position)
 
-        if not status:
-            raise EOFError
+        if frame is None:
+            if self._prefetcher is None or self._prefetcher_position != self._position:
+                self._seek(self._position)
+
+            frame = self._prefetcher.read()
+            self._prefetcher_position += 1
+
+            if self._frame_cache is not None:
+                self._frame_cache.put(self._position, frame)
+
+        self._position += 1
 
         if width is not None:
             return cv2.resize(frame, (width, int(width * self.ratio)))
-        elif self._resize:
-            return cv2.resize(frame, (self._width, self._height))
         else:
             return frame
 
     def reopen(self):
         """
-        Sets the recording head to the first frame in input video
+        Sets the recording head to the first frame in input video.
+        Live stream can not be rewound, so computation continues with the next received frames.
         """
 
-        self._input.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        if self._live:
+            return
+
+        if self._prefetcher is not None:
+            self._prefetcher.stop()
+            self._prefetcher = None
+
+        self._position = 0
+
+    @staticmethod
+    def _stream_name(video_path):
+        """
+        :param video_path: path or url of input video stream
+        :return: name of input without directory and extension, "stream" if no name is found
+        """
+
+        name = os.path.basename(video_path.rstrip("/")).rsplit('.', 1)[0]
+
+        return name if name else "stream"
+
+    def _seek(self, position):
+        """
+        Restarts prefetching from selected frame.
+
+        :param position: sequence number of frame (counted after thrown away frames are skipped)
+        """
+
+        if self._prefetcher is not None:
+            self._prefetcher.stop()
+
+        skip = int(self.fps / constants.FRAME_LOADER_MAX_FPS)
+        self._input.set(cv2.CAP_PROP_POS_FRAMES, position * (skip + 1))
+
+        self._prefetcher = FramePrefetcher(capture=self._input,
+                                           skip=skip,
+                                           size=(self._width, self._height) if self._resize else None,
+                                           read_ahead=constants.FRAME_LOADER_READ_AHEAD)
+        self._prefetcher_position = position
 
     def resize(self, width, height):
         """
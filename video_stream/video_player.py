@@ -9,6 +9,7 @@ __email__ = "xkarpi05@stud.fit.vutbr.cz"
 __date__ = "14.5.2019"
 
 import cv2
+import numpy as np
 from primitives import constants
 
 from pipeline.base.pipeline import PipeBlock
@@ -61,7 +62,10 @@ class VideoPlayer(PipeBlock):
         :param seq: current sequence number
         """
 
-        loader_seq, image = self.receive(pipe_id=constants.FRAME_LOADER_ID)
+        loader_seq, frame = self.receive(pipe_id=constants.FRAME_LOADER_ID)
+        image = np.copy(frame.image)
+        frame.release()
+
         observer_seq, boxes_repository, lights_state = self.receive(pipe_id=constants.OBSERVER_ID)
         sequence_number, serialized_tracked_objects, tracked_object_lifelines, flows = self.receive(pipe_id=constants.TRACKER_ID)
 
@@ -144,7 +148,7 @@ class VideoPlayer(PipeBlock):
         inside flags can be set by user interaction.
 
         :param image: selected image
-        :param boxes_repository: instance of repository of car bounding boxes
+        :param boxes_repository: snapshot of repository of car bounding boxes
         :param lights_state: current light state
         :return: updated image
         """
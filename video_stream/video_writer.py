@@ -7,7 +7,6 @@ __email__ = "xkarpi05@stud.fit.vutbr.cz"
 __date__ = "14.5.2019"
 
 import json
-import cv2
 
 
 class VideoWriter:
@@ -16,19 +15,23 @@ class VideoWriter:
     Each VideoWriter is being identified by ID of examined car
     """
 
-    def __init__(self, info, car_id, history, path):
+    def __init__(self, info, car_id, history, path, encoder_pool):
         """
         :param info: instance of InputInfo containing all information about examined scene.
         :param car_id: id of current car for searching in history
-        :param history: history of frames and another saved information
+        :param history: packages of previous frames, frames are shared with encoder pool without copying
         :param path: path of directory where should output be put
+        :param encoder_pool: instance of EncoderPool encoding the video
         """
 
         self._path = f"{path}/{car_id}"
         self._car_id = car_id
         self._info = info
-        self._output = cv2.VideoWriter(self._path + ".avi", cv2.VideoWriter_fourcc('M', 'J', 'P', 'G'), self._info.fps,
-                                       (self._info.width, self._info.height))
+        self._encoder_pool = encoder_pool
+        self._encoder_pool.open(clip_id=car_id,
+                                path=self._path + ".avi",
+                                fps=self._info.fps,
+                                size=(self._info.width, self._info.height))
         self._lifetime = 2 * len(history)
         self._annotation_output = {"top_left": [],
                                    "bottom_right": [],
@@ -55,12 +58,17 @@ class VideoWriter:
 
     def add_package(self, package):
         """
-        Writes new information to files from given package
+        Submits new frame to encoder and stores annotation from given package.
+        If the frame is dropped by encoder its annotation is dropped as well.
 
         :param package: package with mew frame and information about object on it.
         """
 
-        image, boxes_repository, lights_state = package
+        frame, boxes_repository, lights_state = package
+        self._lifetime -= 1
+
+        if not self._encoder_pool.write(self.car_id, frame):
+            return
 
         try:
             car_box = boxes_repository.get_box_by_id(self.car_id)
@@ -73,14 +81,11 @@ class VideoWriter:
             self._annotation_output["bottom_right"].append(None)
             self._annotation_output["behaviour"].append(None)
 
-        self._output.write(image)
-        self._lifetime -= 1
-
     def close(self):
         """
-        Releases video output file and writes annotation to .json file
+        Closes video output file after all submitted frames are encoded and writes annotation to .json file
         """
 
-        self._output.release()
+        self._encoder_pool.close_clip(self.car_id)
         with open(self._path + ".json", "w") as file:
             json.dump(self._annotation_output, file)
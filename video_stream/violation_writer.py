@@ -1,12 +1,12 @@
 import json
 import os
 import shutil
-from collections import deque
-from copy import deepcopy
 
 from primitives import constants
 from primitives.enums import Color, Mode
 from pipeline.base.pipeline import ThreadedPipeBlock
+from video_stream.encoder_pool import EncoderPool
+from video_stream.frame_history import FrameHistory
 from video_stream.video_writer import VideoWriter
 
 
@@ -20,7 +20,7 @@ class ViolationWriter(ThreadedPipeBlock):
     After computation is done, statistics about examined scene are saved as well. New folder is generated for all
     files about examined video. Containing video files, annotation files and statistic file.
 
-    Holds history of frames for new VideoWrite to start on.
+    Holds history of frames for new VideoWrite to start on. Videos are encoded by background EncoderPool.
     """
 
     def _mode_changed(self, new_mode):
@@ -44,7 +44,10 @@ class ViolationWriter(ThreadedPipeBlock):
         self._current_light_state = None
         self._last_boxes_repository = None
         self._path = f"{program_arguments.output_dir}/{self._info.filename}"
-        self._history = deque(maxlen=constants.VIOLATION_WRITER_SEQUENCE_LENGTH)
+        self._encoder_pool = EncoderPool(policy=program_arguments.encoder_policy)
+        self._history = FrameHistory(length=constants.VIDEO_WRITER_HISTORY + 1,
+                                     height=self._info.height,
+                                     width=self._info.width)
 
     def _before(self):
         """
@@ -59,6 +62,7 @@ class ViolationWriter(ThreadedPipeBlock):
     def _step(self, seq):
         """
         Receives new message from video player - just for check there is no user interaction closing the program.
+        In headless mode there is no video player to wait for.
         Gets new frame from FrameLoader and all information about objects in scene from Observer
 
         Delegates information about violations to VideoWriter instances for each of violation car.
@@ -68,11 +72,17 @@ class ViolationWriter(ThreadedPipeBlock):
         :param seq: current sequence number
         """
 
-        self.receive(pipe_id=constants.VIDEO_PLAYER_ID)
+        if constants.VIDEO_PLAYER_ID in self._input:
+            self.receive(pipe_id=constants.VIDEO_PLAYER_ID)
 
-        loader_seq, image = self.receive(pipe_id=constants.FRAME_LOADER_ID)
+        loader_seq, frame = self.receive(pipe_id=constants.FRAME_LOADER_ID)
         observer_seq, boxes_repository, lights_state = self.receive(pipe_id=constants.OBSERVER_ID)
-        package = image, boxes_repository, lights_state
+
+        self._history.append(seq, frame.image, boxes_repository, lights_state)
+        frame.release()
+
+        package = self._history.package(seq)
+        history = self._history.packages(seq - constants.VIDEO_WRITER_HISTORY, seq - 1)
 
         self._save_light_state(lights_state, seq)
 
@@ -80,16 +90,18 @@ class ViolationWriter(ThreadedPipeBlock):
             if car_id not in self._captured_ids:
                 self._video_writers[car_id] = VideoWriter(info=self._info,
                                                           car_id=car_id,
-                                                          history=deepcopy(self._history),
-                                                          path=self._path)
+                                                          history=history,
+                                                          path=self._path,
+                                                          encoder_pool=self._encoder_pool)
                 self._captured_ids.append(car_id)
 
         for car_id in boxes_repository.orange_riders.keys():
             if car_id not in self._captured_ids:
                 self._video_writers[car_id] = VideoWriter(info=self._info,
                                                           car_id=car_id,
-                                                          history=deepcopy(self._history),
-                                                          path=self._path)
+                                                          history=history,
+                                                          path=self._path,
+                                                          encoder_pool=self._encoder_pool)
                 self._captured_ids.append(car_id)
 
         for _, writer in list(self._video_writers.items()):
@@ -99,7 +111,6 @@ class ViolationWriter(ThreadedPipeBlock):
                 writer.close()
                 del self._video_writers[writer.car_id]
 
-        self._append_to_history(package)
         self._last_boxes_repository = boxes_repository
 
     def _after(self):
@@ -115,16 +126,10 @@ class ViolationWriter(ThreadedPipeBlock):
             writer.close()
             del self._video_writers[writer.car_id]
 
-    def _append_to_history(self, package):
-        """
-        Appends new package to history. Only last x frames are saved
-        :param package: package which should be added to history
-        """
-
-        if len(self._history) == constants.VIDEO_WRITER_HISTORY:
-            self._history.popleft()
+        self._encoder_pool.close()
 
-        self._history.append(package)
+        if self._encoder_pool.dropped:
+            print(f"WARNING: {self._encoder_pool.dropped} frames of violation videos were dropped by encoder")
 
     def _write_statistics(self):
         """